@@ -1,14 +1,24 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from utils.config import database_url
+from utils.config import database_url, async_database_url
 
 DATABASE_URL = database_url
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for handlers that overlap DB waits with GeoServer HTTP waits
+ASYNC_DATABASE_URL = async_database_url
+async_engine = create_async_engine(ASYNC_DATABASE_URL, pool_size=20, max_overflow=20)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
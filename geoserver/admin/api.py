@@ -1,259 +1,242 @@
-import os
-import sys
+import asyncio
 import logging
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException
+from typing import List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+from geoserver.admin.async_dao import AsyncGeoServerAdminDAO
 from geoserver.admin.dao import GeoServerAdminDAO
 from geoserver.admin.model import UpdateRequest
 from geoserver.admin.service import GeoServerAdminService
-from geoserver.dao import GeoServerDAO
 from geoserver.model import CreateLayerRequest
-from geoserver.service import GeoServerService
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'utils'))
-from utils.config import *  # noqa: E402, F403
+from utils.cache import rest_cache, invalidate_rest_cache
+from utils.config import (
+    geoserver_catalog_cache_ttl,
+    geoserver_host,
+    geoserver_port,
+    geoserver_username,
+    geoserver_password,
+)
+from utils.tasks import task_store
 
 logger = logging.getLogger(__name__)
 
 # Initialize router
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Initialize DAO and Service with configuration
-geo_admin_dao = GeoServerAdminDAO(
-    base_url=f"http://{geoserver_host}:{geoserver_port}/geoserver/rest",
-    username=geoserver_username,
-    password=geoserver_password
-)
-geo_admin_service = GeoServerAdminService(geo_admin_dao)
 
-# Initialize main GeoServer service for helper functions
-geo_dao = GeoServerDAO(
-    base_url=f"http://{geoserver_host}:{geoserver_port}/geoserver/rest",
-    username=geoserver_username,
-    password=geoserver_password
-)
-geo_service = GeoServerService(geo_dao)
+def create_geo_admin_service() -> GeoServerAdminService:
+    """
+    Build the GeoServer admin service for one app instance. Called from the
+    lifespan in main.py, which opens/closes the async connection pool and
+    keeps the service on app.state.
+    """
+    base_url = f"http://{geoserver_host}:{geoserver_port}/geoserver/rest"
+    return GeoServerAdminService(
+        GeoServerAdminDAO(base_url=base_url, username=geoserver_username, password=geoserver_password),
+        AsyncGeoServerAdminDAO(base_url=base_url, username=geoserver_username, password=geoserver_password),
+    )
+
 
+def get_geo_admin_service(request: Request) -> GeoServerAdminService:
+    """Dependency returning the app-wide GeoServerAdminService."""
+    return request.app.state.geo_admin_service
 
-def get_layer_bbox(layer_name: str) -> Optional[List[List[float]]]:
+async def _run_delete_task(task_id: str, description: str, delete_fn, *args, invalidate=()):
     """
-    Helper function to extract bounding box from layer details.
-    Returns bbox in format [[minx, miny], [maxx, maxy]] or None if not available.
+    Run a blocking GeoServer DELETE off the event loop and record its outcome.
     """
+    await task_store.update(task_id, status="running")
     try:
-        response = geo_service.get_layer_details(layer_name)
-        if response.status_code != 200:
-            return None
-        
-        layer_json = response.json() or {}
-        layer_data = layer_json.get("layer", {})
-        resource = layer_data.get("resource", {})
-        
-        # Try to get bounding box from resource
-        # GeoServer typically has nativeBoundingBox or latLonBoundingBox
-        bbox_data = resource.get("latLonBoundingBox") or resource.get("nativeBoundingBox")
-        
-        if bbox_data:
-            minx = bbox_data.get("minx")
-            miny = bbox_data.get("miny")
-            maxx = bbox_data.get("maxx")
-            maxy = bbox_data.get("maxy")
-            
-            if all(v is not None for v in [minx, miny, maxx, maxy]):
-                return [[float(minx), float(miny)], [float(maxx), float(maxy)]]
-        
-        # If bbox not in resource, try to get from featureType
-        resource_href = resource.get("href")
-        if resource_href:
-            if not resource_href.endswith(".json"):
-                resource_href = resource_href + ".json"
-            
-            ft_response = geo_service.dao.get_url(resource_href)
-            if ft_response.status_code == 200:
-                ft_json = ft_response.json() or {}
-                feature_type = ft_json.get("featureType", {})
-                bbox_data = feature_type.get("latLonBoundingBox") or feature_type.get("nativeBoundingBox")
-                
-                if bbox_data:
-                    minx = bbox_data.get("minx")
-                    miny = bbox_data.get("miny")
-                    maxx = bbox_data.get("maxx")
-                    maxy = bbox_data.get("maxy")
-                    
-                    if all(v is not None for v in [minx, miny, maxx, maxy]):
-                        return [[float(minx), float(miny)], [float(maxx), float(maxy)]]
-        
-        return None
+        response = await asyncio.to_thread(delete_fn, *args)
+        if response.status_code == 200:
+            await invalidate_rest_cache(*invalidate)
+            await task_store.update(
+                task_id, status="succeeded", message=f"{description} deleted successfully!"
+            )
+        else:
+            await task_store.update(
+                task_id, status="failed", status_code=response.status_code, detail=response.text
+            )
     except Exception as e:
-        logger.warning(f"Error fetching bbox for layer {layer_name}: {str(e)}")
-        return None
+        logger.error(f"Background delete of {description} failed: {e}", exc_info=True)
+        await task_store.update(task_id, status="failed", detail=str(e))
+
+
+async def _enqueue_delete(background_tasks: BackgroundTasks, description: str, delete_fn, *args, invalidate=()):
+    """
+    Start a delete in the background and return where to poll for its outcome.
+    Without a task store every worker can read (several workers, no Redis)
+    the status URL could land on a worker that never heard of the task, so the
+    delete runs inline instead and its result is returned directly (200).
+    """
+    if not task_store.shared:
+        response = await asyncio.to_thread(delete_fn, *args)
+        if response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+        await invalidate_rest_cache(*invalidate)
+        return ORJSONResponse({"message": f"{description} deleted successfully!"})
+
+    task_id = await task_store.create(f"Delete {description}")
+    background_tasks.add_task(_run_delete_task, task_id, description, delete_fn, *args, invalidate=invalidate)
+    return {"task_id": task_id, "status": "pending", "status_url": f"/admin/tasks/{task_id}"}
+
+
+@router.get("/tasks/{task_id}", summary="Get Task Status", description="Retrieve the status of a background task (e.g. a workspace, datastore, layer or style deletion) started by one of the admin APIs.")
+async def get_task_status(task_id: str):
+    """
+    Get the state of a background task.
+    """
+    task = await task_store.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task '{task_id}' not found")
+    return task
 
 # Workspace Management APIs
 @router.get("/workspaces", summary="List All Workspaces", description="Retrieve a list of all workspaces in GeoServer. Workspaces are logical groupings of data stores and layers.")
-async def list_workspaces():
+@rest_cache("workspaces", ttl=geoserver_catalog_cache_ttl)
+async def list_workspaces(geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     List all workspaces in GeoServer.
     """
-    try:
-        response = geo_admin_service.list_workspaces()
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await geo_admin_service.list_workspaces_async()
+    if response.status_code == 200:
+        return Response(content=response.content, media_type="application/json")
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 @router.post("/workspaces", summary="Create Workspace", description="Create a new workspace in GeoServer. Workspaces organize data stores and layers logically.")
-async def create_workspace(workspace_name: str):
+async def create_workspace(workspace_name: str, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     Create a new workspace in GeoServer.
     """
-    try:
-        response = geo_admin_service.create_workspace(workspace_name)
-        if response.status_code in [200, 201]:
-            return {
-                "message": f"Workspace '{workspace_name}' created successfully!",
-                "status_code": response.status_code
-            }
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = geo_admin_service.create_workspace(workspace_name)
+    if response.status_code in [200, 201]:
+        await invalidate_rest_cache("workspaces")
+        return {
+            "message": f"Workspace '{workspace_name}' created successfully!",
+            "status_code": response.status_code
+        }
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 @router.get("/workspaces/{workspace}", summary="Get Workspace Details", description="Retrieve detailed information about a specific workspace, including its configuration and properties.")
-async def get_workspace_details(workspace: str):
+@rest_cache("workspaces", ttl=geoserver_catalog_cache_ttl)
+async def get_workspace_details(workspace: str, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     Get details of a specific workspace.
     """
-    try:
-        response = geo_admin_service.get_workspace_details(workspace)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await geo_admin_service.get_workspace_details_async(workspace)
+    if response.status_code == 200:
+        return Response(content=response.content, media_type="application/json")
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
-@router.delete("/workspaces/{workspace}", summary="Delete Workspace", description="Delete a specific workspace from GeoServer. This operation will also remove all associated data stores and layers.")
-async def delete_workspace(workspace: str):
+@router.delete("/workspaces/{workspace}", summary="Delete Workspace", status_code=202, description="Delete a specific workspace from GeoServer. This operation will also remove all associated data stores and layers.")
+async def delete_workspace(workspace: str, background_tasks: BackgroundTasks, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
-    Delete a specific workspace.
+    Delete a specific workspace in the background; poll the returned status_url for the outcome.
     """
-    try:
-        response = geo_admin_service.delete_workspace(workspace)
-        if response.status_code == 200:
-            return {"message": f"Workspace '{workspace}' deleted successfully!"}
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await _enqueue_delete(
+        background_tasks,
+        f"Workspace '{workspace}'",
+        geo_admin_service.delete_workspace, workspace,
+        invalidate=("workspaces", "datastores", "layers"),
+    )
 
 @router.put("/workspaces/{workspace}", summary="Update Workspace", description="Update the configuration and properties of a specific workspace in GeoServer.")
-async def update_workspace(workspace: str, request: UpdateRequest):
+async def update_workspace(workspace: str, request: UpdateRequest, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     Update a specific workspace.
     """
-    try:
-        response = geo_admin_service.update_workspace(workspace, request)
-        if response.status_code == 200:
-            return {"message": f"Workspace '{workspace}' updated successfully!"}
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = geo_admin_service.update_workspace(workspace, request)
+    if response.status_code == 200:
+        await invalidate_rest_cache("workspaces", "datastores", "layers")
+        return {"message": f"Workspace '{workspace}' updated successfully!"}
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 # Datastore Management APIs
 @router.get("/workspaces/{workspace}/datastores", summary="List Datastores", description="Retrieve a list of all data stores in a specific workspace. Data stores are connections to spatial data sources.")
-async def list_datastores(workspace: str):
+@rest_cache("datastores", ttl=geoserver_catalog_cache_ttl)
+async def list_datastores(workspace: str, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     List all datastores in a workspace.
     """
-    try:
-        response = geo_admin_service.list_datastores(workspace)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await geo_admin_service.list_datastores_async(workspace)
+    if response.status_code == 200:
+        return Response(content=response.content, media_type="application/json")
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 @router.get("/workspaces/{workspace}/datastores/{datastore}", summary="Get Datastore Details", description="Retrieve detailed information about a specific data store, including connection parameters and configuration.")
-async def get_datastore_details(workspace: str, datastore: str):
+@rest_cache("datastores", ttl=geoserver_catalog_cache_ttl)
+async def get_datastore_details(workspace: str, datastore: str, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     Get details of a specific datastore.
     """
-    try:
-        response = geo_admin_service.get_datastore_details(workspace, datastore)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await geo_admin_service.get_datastore_details_async(workspace, datastore)
+    if response.status_code == 200:
+        return Response(content=response.content, media_type="application/json")
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
-@router.delete("/workspaces/{workspace}/datastores/{datastore}", summary="Delete Datastore", description="Delete a specific data store from a workspace. This will remove the connection but not the underlying data source.")
-async def delete_datastore(workspace: str, datastore: str):
+@router.delete("/workspaces/{workspace}/datastores/{datastore}", summary="Delete Datastore", status_code=202, description="Delete a specific data store from a workspace. This will remove the connection but not the underlying data source.")
+async def delete_datastore(workspace: str, datastore: str, background_tasks: BackgroundTasks, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
-    Delete a specific datastore in a workspace.
+    Delete a specific datastore in a workspace in the background; poll the returned status_url for the outcome.
     """
-    try:
-        response = geo_admin_service.delete_datastore(workspace, datastore)
-        if response.status_code == 200:
-            return {"message": f"Datastore '{datastore}' in workspace '{workspace}' deleted successfully!"}
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await _enqueue_delete(
+        background_tasks,
+        f"Datastore '{datastore}' in workspace '{workspace}'",
+        geo_admin_service.delete_datastore, workspace, datastore,
+        invalidate=("datastores", "layers"),
+    )
 
 @router.put("/workspaces/{workspace}/datastores/{datastore}", summary="Update Datastore", description="Update the configuration and connection parameters of a specific data store in a workspace.")
-async def update_datastore(workspace: str, datastore: str, request: UpdateRequest):
+async def update_datastore(workspace: str, datastore: str, request: UpdateRequest, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     Update a specific datastore in a workspace.
     """
-    try:
-        response = geo_admin_service.update_datastore(workspace, datastore, request)
-        if response.status_code == 200:
-            return {
-                "message": (
-                    f"Datastore '{datastore}' in workspace '{workspace}' "
-                    "updated successfully!"
-                )
-            }
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = geo_admin_service.update_datastore(workspace, datastore, request)
+    if response.status_code == 200:
+        await invalidate_rest_cache("datastores", "layers")
+        return {
+            "message": (
+                f"Datastore '{datastore}' in workspace '{workspace}' "
+                "updated successfully!"
+            )
+        }
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 # Layer Management APIs (DELETE and PUT only)
-@router.delete("/layers/{layer}", summary="Delete Layer", description="Delete a specific layer from GeoServer. This removes the layer configuration but does not delete the underlying data.")
-async def delete_layer(layer: str):
+@router.delete("/layers/{layer}", summary="Delete Layer", status_code=202, description="Delete a specific layer from GeoServer. This removes the layer configuration but does not delete the underlying data.")
+async def delete_layer(layer: str, background_tasks: BackgroundTasks, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
-    Delete a specific layer.
+    Delete a specific layer in the background; poll the returned status_url for the outcome.
     """
-    try:
-        response = geo_admin_service.delete_layer(layer)
-        if response.status_code == 200:
-            return {"message": f"Layer '{layer}' deleted successfully!"}
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await _enqueue_delete(
+        background_tasks,
+        f"Layer '{layer}'",
+        geo_admin_service.delete_layer, layer,
+        invalidate=("layers",),
+    )
 
 @router.put("/layers/{layer}", summary="Update Layer", description="Update the configuration and properties of a specific layer, including style settings and default parameters.")
-async def update_layer(layer: str, request: UpdateRequest):
+async def update_layer(layer: str, request: UpdateRequest, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     Update a specific layer.
     """
-    try:
-        response = geo_admin_service.update_layer(layer, request)
-        if response.status_code == 200:
-            return {"message": f"Layer '{layer}' updated successfully!"}
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = geo_admin_service.update_layer(layer, request)
+    if response.status_code == 200:
+        await invalidate_rest_cache("layers")
+        return {"message": f"Layer '{layer}' updated successfully!"}
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 @router.get("/layers/{layer}", summary="Get Layer Details", description="Retrieve detailed information about a specific layer in GeoServer. This includes layer configuration, default style, resource information, and other layer properties.")
-async def get_layer_details(layer: str):
+@rest_cache("layers", ttl=geoserver_catalog_cache_ttl)
+async def get_layer_details(layer: str, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     Get details of a specific layer.
     
@@ -266,140 +249,140 @@ async def get_layer_details(layer: str):
     
     Layer name can be specified with or without workspace prefix (e.g., 'metastring:gbif' or 'gbif').
     """
-    try:
-        response = geo_admin_service.get_layer_details(layer)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await geo_admin_service.get_layer_details_async(layer)
+    if response.status_code == 200:
+        return Response(content=response.content, media_type="application/json")
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 # Style Management APIs (DELETE and PUT only)
-@router.delete("/styles/{style}", summary="Delete Style", description="Delete a specific style from GeoServer. Styles define how geographic features are rendered on maps.")
-async def delete_style(style: str):
+@router.delete("/styles/{style}", summary="Delete Style", status_code=202, description="Delete a specific style from GeoServer. Styles define how geographic features are rendered on maps.")
+async def delete_style(style: str, background_tasks: BackgroundTasks, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
-    Delete a specific style.
+    Delete a specific style in the background; poll the returned status_url for the outcome.
     """
-    try:
-        response = geo_admin_service.delete_style(style)
-        if response.status_code == 200:
-            return {"message": f"Style '{style}' deleted successfully!"}
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await _enqueue_delete(
+        background_tasks,
+        f"Style '{style}'",
+        geo_admin_service.delete_style, style,
+        invalidate=("styles",),
+    )
 
 @router.put("/styles/{style}", summary="Update Style", description="Update the configuration and properties of a specific style, including style format and resource location.")
-async def update_style(style: str, request: UpdateRequest):
+async def update_style(style: str, request: UpdateRequest, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     Update a specific style.
     """
-    try:
-        response = geo_admin_service.update_style(style, request)
-        if response.status_code == 200:
-            return {"message": f"Style '{style}' updated successfully!"}
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = geo_admin_service.update_style(style, request)
+    if response.status_code == 200:
+        await invalidate_rest_cache("styles")
+        return {"message": f"Style '{style}' updated successfully!"}
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 # Table Management APIs
 @router.get("/workspaces/{workspace}/datastores/{datastore}/tables", summary="List Datastore Tables", description="List all available tables in a PostGIS data store. Tables represent spatial data that can be published as layers.")
-async def list_datastore_tables(workspace: str, datastore: str):
+@rest_cache("datastores", ttl=geoserver_catalog_cache_ttl)
+async def list_datastore_tables(workspace: str, datastore: str, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     List all available tables in a PostGIS datastore.
     """
-    try:
-        response = geo_admin_service.list_datastore_tables(workspace, datastore)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await geo_admin_service.list_datastore_tables_async(workspace, datastore)
+    if response.status_code == 200:
+        return Response(content=response.content, media_type="application/json")
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 @router.get("/workspaces/{workspace}/datastores/{datastore}/schema/{schema}/tables", summary="List Schema Tables", description="List all tables in a specific PostGIS schema by querying the database directly. This provides direct access to schema-level tables.")
-async def list_postgis_schema_tables(workspace: str, datastore: str, schema: str):
+@rest_cache("datastores", ttl=geoserver_catalog_cache_ttl)
+async def list_postgis_schema_tables(workspace: str, datastore: str, schema: str, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     List all tables in a specific PostGIS schema by querying the database directly.
     """
-    try:
-        response = geo_admin_service.list_postgis_schema_tables(workspace, datastore, schema)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await asyncio.to_thread(geo_admin_service.list_postgis_schema_tables, workspace, datastore, schema)
+    if response.status_code == 200:
+        return Response(content=response.content, media_type="application/json")
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 @router.get("/workspaces/{workspace}/datastores/{datastore}/tables-direct", summary="List Tables Direct", description="List all tables in a PostGIS schema using direct database query. Allows specifying a custom schema, defaulting to 'public'.")
-async def list_postgis_tables_direct(workspace: str, datastore: str, schema: str = "public"):
+@rest_cache("datastores", ttl=geoserver_catalog_cache_ttl)
+async def list_postgis_tables_direct(workspace: str, datastore: str, schema: str = "public", geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     List all tables in a PostGIS schema using direct database query.
     """
-    try:
-        response = geo_admin_service.list_postgis_tables_direct(workspace, datastore, schema)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await asyncio.to_thread(geo_admin_service.list_postgis_tables_direct, workspace, datastore, schema)
+    if response.status_code == 200:
+        return Response(content=response.content, media_type="application/json")
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 @router.get("/workspaces/{workspace}/datastores/{datastore}/tables/{table}", summary="Get Table Details", description="Retrieve detailed information about a specific table in a data store, including column definitions and spatial properties.")
-async def get_table_details(workspace: str, datastore: str, table: str):
+@rest_cache("datastores", ttl=geoserver_catalog_cache_ttl)
+async def get_table_details(workspace: str, datastore: str, table: str, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     Get details of a specific table in a datastore.
     """
-    try:
-        response = geo_admin_service.get_table_details(workspace, datastore, table)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await geo_admin_service.get_table_details_async(workspace, datastore, table)
+    if response.status_code == 200:
+        return Response(content=response.content, media_type="application/json")
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 # Layer Creation API
 @router.post("/create-layer", summary="Create Layer from Table", description="Create a new GeoServer layer from an existing PostGIS table. This publishes a database table as a map layer with specified style and configuration.")
-async def create_layer_from_table(request: CreateLayerRequest):
+async def create_layer_from_table(request: CreateLayerRequest, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     Create a layer from a PostGIS table.
     """
-    try:
-        response = await geo_admin_service.create_layer_from_table(request)
-        if response.status_code in [200, 201]:
-            layer_name = request.layer_name or request.table_name
-            return {
-                "message": (
-                    f"Layer '{layer_name}' created successfully from "
-                    f"table '{request.table_name}'!"
-                ),
-                "status_code": response.status_code,
-                "workspace": request.workspace,
-                "store_name": request.store_name,
-                "table_name": request.table_name,
-                "layer_name": layer_name
-            }
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await geo_admin_service.create_layer_from_table(request)
+    if response.status_code in [200, 201]:
+        await invalidate_rest_cache("datastores", "layers")
+        layer_name = request.layer_name or request.table_name
+        return {
+            "message": (
+                f"Layer '{layer_name}' created successfully from "
+                f"table '{request.table_name}'!"
+            ),
+            "status_code": response.status_code,
+            "workspace": request.workspace,
+            "store_name": request.store_name,
+            "table_name": request.table_name,
+            "layer_name": layer_name
+        }
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+
+@router.post("/create-layers", summary="Create Layers from Tables", description="Create several GeoServer layers from existing PostGIS tables in one call. Layers of the same data store are published concurrently; set sequential=true for servers that do not tolerate parallel catalog writes.")
+async def create_layers_from_tables(
+    requests: List[CreateLayerRequest],
+    sequential: bool = False,
+    geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service),
+):
+    """
+    Create layers from PostGIS tables, reporting the outcome of each one.
+    """
+    responses = await geo_admin_service.create_layers_from_tables(requests, sequential=sequential)
+    results = []
+    for request, response in zip(requests, responses):
+        created = response.status_code in [200, 201]
+        results.append({
+            "workspace": request.workspace,
+            "store_name": request.store_name,
+            "table_name": request.table_name,
+            "layer_name": request.layer_name or request.table_name,
+            "status_code": response.status_code,
+            "created": created,
+            "detail": None if created else response.text,
+        })
+    if any(result["created"] for result in results):
+        await invalidate_rest_cache("datastores", "layers")
+    return {"results": results}
 
 # Style Management APIs (GET)
 @router.get("/styles", summary="List All Styles", description="Retrieve a list of all styles available in GeoServer. Styles define how layers are rendered on maps, including colors, symbols, and other visual properties.")
-async def list_styles():
+@rest_cache("styles", ttl=geoserver_catalog_cache_ttl)
+async def list_styles(geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     List all styles in GeoServer.
     
@@ -407,17 +390,15 @@ async def list_styles():
     how geographic features are displayed on maps, including point symbols, line styles,
     and polygon fill patterns.
     """
-    try:
-        response = geo_admin_service.list_styles()
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await geo_admin_service.list_styles_async()
+    if response.status_code == 200:
+        return Response(content=response.content, media_type="application/json")
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 @router.get("/styles/{style}", summary="Get Style Details", description="Retrieve detailed information about a specific style in GeoServer, including style format, filename, and language version.")
-async def get_style_details(style: str):
+@rest_cache("styles", ttl=geoserver_catalog_cache_ttl)
+async def get_style_details(style: str, geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service)):
     """
     Get details of a specific style.
     
@@ -427,12 +408,9 @@ async def get_style_details(style: str):
     - Language version
     - Style resource location
     """
-    try:
-        response = geo_admin_service.get_style_details(style)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await geo_admin_service.get_style_details_async(style)
+    if response.status_code == 200:
+        return Response(content=response.content, media_type="application/json")
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
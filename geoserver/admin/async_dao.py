@@ -0,0 +1,107 @@
+from typing import Optional
+import httpx
+from utils.config import geoserver_max_inflight
+from utils.http import BoundedAsyncTransport
+
+
+class AsyncGeoServerAdminDAO:
+    """
+    Async counterpart of the read-only GeoServerAdminDAO calls.
+
+    The admin read endpoints run on the event loop, so they use one pooled
+    httpx.AsyncClient instead of blocking it on `requests`. Writes stay on the
+    synchronous GeoServerAdminDAO. The client is opened/closed by the
+    application lifespan (see main.py) and created lazily otherwise.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        password: str,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        timeout: float = 10,
+        max_inflight: int = geoserver_max_inflight,
+    ):
+        self.base_url = base_url
+        self.auth = (username, password)
+        self.limits = httpx.Limits(
+            max_keepalive_connections=max_keepalive_connections,
+            max_connections=max_connections,
+        )
+        self.timeout = timeout
+        self.max_inflight = max_inflight
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                auth=self.auth,
+                headers={"Accept": "application/json"},
+                transport=BoundedAsyncTransport(self.max_inflight, limits=self.limits),
+                timeout=self.timeout,
+            )
+        return self._client
+
+    async def open(self):
+        """
+        Create the shared connection pool.
+        """
+        return self.client
+
+    async def aclose(self):
+        """
+        Close the shared connection pool.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def list_workspaces(self):
+        return await self.client.get("/workspaces.json")
+
+    async def get_workspace_details(self, workspace: str):
+        return await self.client.get(f"/workspaces/{workspace}.json")
+
+    async def list_datastores(self, workspace: str):
+        return await self.client.get(f"/workspaces/{workspace}/datastores.json")
+
+    async def get_datastore_details(self, workspace: str, datastore: str):
+        return await self.client.get(f"/workspaces/{workspace}/datastores/{datastore}.json")
+
+    async def list_datastore_tables(self, workspace: str, datastore: str):
+        """
+        List all available tables in a PostGIS datastore.
+        """
+        return await self.client.get(
+            f"/workspaces/{workspace}/datastores/{datastore}/featuretypes.json"
+        )
+
+    async def get_table_details(self, workspace: str, datastore: str, table_name: str):
+        """
+        Get details of a specific table in a datastore.
+        """
+        return await self.client.get(
+            f"/workspaces/{workspace}/datastores/{datastore}/featuretypes/{table_name}.json"
+        )
+
+    async def get_layer_details(self, layer: str):
+        """
+        Get details of a specific layer.
+        """
+        return await self.client.get(f"/layers/{layer}.json")
+
+    async def list_styles(self):
+        """
+        List all styles in GeoServer.
+        """
+        return await self.client.get("/styles.json")
+
+    async def get_style_details(self, style_name: str):
+        """
+        Get details of a specific style.
+        """
+        return await self.client.get(f"/styles/{style_name}.json")
@@ -1,50 +1,102 @@
+import re
 import requests
 import logging
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from urllib3.util.retry import Retry
 import xml.etree.ElementTree as ET
 from typing import List, Dict, Any, Optional
 from geoserver.admin.model import UpdateRequest
+from geoserver.dao import _response_from
+from utils.config import geoserver_max_inflight
+from utils.errors import InvalidRequestError
+from utils.http import DEFAULT_TIMEOUT, SLOW_TIMEOUT, CircuitBreakerHTTPAdapter, Timeout, decode_json
 
 logger = logging.getLogger(__name__)
 
+# Bodies are encoded with orjson and sent as bytes via data=
+_JSON_HEADERS = {"Content-type": "application/json"}
+
+# Schema names accepted by the information_schema SQL view. GeoServer applies
+# the validator with Java's Matcher.matches() (whole value, ASCII \w); the local
+# check uses fullmatch() since Python's $ also matches before a trailing newline
+_SCHEMA_NAME_PATTERN = r"^\w+$"
+_SCHEMA_NAME_RE = re.compile(r"\w+", re.ASCII)
+
+_SCHEMA_TABLES_SQL = """
+        SELECT
+            table_name,
+            table_type,
+            table_schema
+        FROM information_schema.tables
+        WHERE table_schema = '%schema%'
+        AND table_type = 'BASE TABLE'
+        ORDER BY table_name
+        """
+
 
 class GeoServerAdminDAO:
-    def __init__(self, base_url: str, username: str, password: str):
+    def __init__(self, base_url: str, username: str, password: str, timeout: Timeout = DEFAULT_TIMEOUT):
         self.base_url = base_url
         self.auth = (username, password)
+        self.timeout = timeout
+
+        # Keep-alive session shared by every call; auth and the JSON Accept
+        # header are set once here (calls that need another format override it).
+        # Transient gateway errors are retried for idempotent methods only, and
+        # every call gets self.timeout unless it passes its own.
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        self.session.headers["Accept"] = "application/json"
+        adapter = CircuitBreakerHTTPAdapter(
+            timeout=timeout,
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        """
+        Close the pooled connections.
+        """
+        self.session.close()
 
     def list_workspaces(self):
         url = f"{self.base_url}/workspaces.json"
-        headers = {"Accept": "application/json"}
-        return requests.get(url, auth=self.auth, headers=headers)
+        return self.session.get(url)
 
     def get_workspace_details(self, workspace: str):
         url = f"{self.base_url}/workspaces/{workspace}.json"
-        headers = {"Accept": "application/json"}
-        return requests.get(url, auth=self.auth, headers=headers)
+        return self.session.get(url)
 
     def list_datastores(self, workspace: str):
         url = f"{self.base_url}/workspaces/{workspace}/datastores.json"
-        headers = {"Accept": "application/json"}
-        return requests.get(url, auth=self.auth, headers=headers)
+        return self.session.get(url)
 
     def get_datastore_details(self, workspace: str, datastore: str):
         url = f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}.json"
-        headers = {"Accept": "application/json"}
-        return requests.get(url, auth=self.auth, headers=headers)
+        return self.session.get(url)
 
     def delete_workspace(self, workspace: str):
         """
         Delete a workspace.
         """
         url = f"{self.base_url}/workspaces/{workspace}"
-        return requests.delete(url, auth=self.auth)
+        return self.session.delete(url)
 
     def delete_datastore(self, workspace: str, datastore: str):
         """
         Delete a datastore in a workspace.
         """
         url = f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}"
-        return requests.delete(url, auth=self.auth)
+        return self.session.delete(url)
 
     def update_workspace(self, workspace: str, request: UpdateRequest):
         """
@@ -52,7 +104,7 @@ class GeoServerAdminDAO:
         """
         url = f"{self.base_url}/workspaces/{workspace}"
         data = {"workspace": {"name": request.new_name}} if request.new_name else {}
-        return requests.put(url, auth=self.auth, json=data)
+        return self.session.put(url, data=orjson.dumps(data), headers=_JSON_HEADERS)
 
     def update_datastore(self, workspace: str, datastore: str, request: UpdateRequest):
         """
@@ -60,14 +112,14 @@ class GeoServerAdminDAO:
         """
         url = f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}"
         data = {"dataStore": {"name": request.new_name}} if request.new_name else {}
-        return requests.put(url, auth=self.auth, json=data)
+        return self.session.put(url, data=orjson.dumps(data), headers=_JSON_HEADERS)
 
     def delete_layer(self, layer: str):
         """
         Delete a layer.
         """
         url = f"{self.base_url}/layers/{layer}"
-        return requests.delete(url, auth=self.auth)
+        return self.session.delete(url)
 
     def update_layer(self, layer: str, request: UpdateRequest):
         """
@@ -75,14 +127,14 @@ class GeoServerAdminDAO:
         """
         url = f"{self.base_url}/layers/{layer}"
         data = {"layer": {"name": request.new_name}} if request.new_name else {}
-        return requests.put(url, auth=self.auth, json=data)
+        return self.session.put(url, data=orjson.dumps(data), headers=_JSON_HEADERS)
 
     def delete_style(self, style: str):
         """
         Delete a style.
         """
         url = f"{self.base_url}/styles/{style}"
-        return requests.delete(url, auth=self.auth)
+        return self.session.delete(url)
 
     def update_style(self, style: str, request: UpdateRequest):
         """
@@ -90,117 +142,112 @@ class GeoServerAdminDAO:
         """
         url = f"{self.base_url}/styles/{style}"
         data = {"style": {"name": request.new_name}} if request.new_name else {}
-        return requests.put(url, auth=self.auth, json=data)
+        return self.session.put(url, data=orjson.dumps(data), headers=_JSON_HEADERS)
 
     def list_datastore_tables(self, workspace: str, datastore: str):
         """
         List all available tables in a PostGIS datastore.
         """
         url = f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}/featuretypes.json"
-        headers = {"Accept": "application/json"}
-        return requests.get(url, auth=self.auth, headers=headers)
+        return self.session.get(url)
 
     def list_postgis_schema_tables(
         self, workspace: str, datastore: str, schema: str = "public"
     ):
         """
-        List all tables in a specific PostGIS schema by querying the database directly.
-        This uses GeoServer's SQL view functionality to query the information_schema.
+        List all tables in a specific PostGIS schema.
+        When the schema is the datastore's own, GeoServer already knows its
+        tables: the configured feature types (featuretypes.json) are merged with
+        every table it can see (featuretypes.json?list=all), so published and
+        unpublished tables are both listed. The result keeps the configured
+        listing's shape, {"featureTypes": {"featureType": [{"name": ...}, ...]}},
+        with entries for unpublished tables carrying only a name. Other schemas,
+        or an empty listing, go through a temporary SQL view on
+        information_schema (see _list_schema_tables_via_sql_view).
         """
-        # First, get the datastore details to extract connection info
         datastore_url = (
             f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}.json"
         )
-        headers = {"Accept": "application/json"}
-        datastore_response = requests.get(datastore_url, auth=self.auth, headers=headers)
+        datastore_response = self.session.get(datastore_url)
 
         if datastore_response.status_code != 200:
             raise Exception(f"Failed to get datastore details: {datastore_response.text}")
 
-        # Use GeoServer's SQL view to query the database
-        sql_view_url = (
-            f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}/featuretypes"
-        )
-        headers = {"Content-type": "application/json"}
+        if self._datastore_schema(datastore_response) == schema:
+            featuretypes_url = (
+                f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}/featuretypes.json"
+            )
+            configured_response = self.session.get(featuretypes_url)
+            all_response = self.session.get(featuretypes_url, params={"list": "all"})
+            if configured_response.status_code == 200 and all_response.status_code == 200:
+                feature_types = self._configured_feature_types(configured_response)
+                known = {entry["name"] for entry in feature_types}
+                feature_types += [
+                    {"name": name} for name in self._listed_names(all_response) if name not in known
+                ]
+                if feature_types:
+                    body = orjson.dumps({"featureTypes": {"featureType": feature_types}})
+                    return _response_from(
+                        featuretypes_url, 200, body, {"Content-Type": "application/json"}
+                    )
+
+        return self._list_schema_tables_via_sql_view(workspace, datastore, schema)
 
-        # SQL query to get all tables in the specified schema
-        sql_query = f"""
-        SELECT
-            table_name,
-            table_type,
-            table_schema
-        FROM information_schema.tables
-        WHERE table_schema = '{schema}'
-        AND table_type = 'BASE TABLE'
-        ORDER BY table_name
+    def list_postgis_tables_direct(
+        self, workspace: str, datastore: str, schema: str = "public"
+    ):
         """
+        Same as list_postgis_schema_tables; kept for the /tables-direct endpoint.
+        """
+        return self.list_postgis_schema_tables(workspace, datastore, schema)
 
-        sql_view_config = {
-            "featureType": {
-                "name": f"schema_tables_{schema}",
-                "nativeName": f"schema_tables_{schema}",
-                "title": f"Tables in {schema} schema",
-                "srs": "EPSG:4326",
-                "nativeBoundingBox": {
-                    "minx": -180,
-                    "maxx": 180,
-                    "miny": -90,
-                    "maxy": 90,
-                    "crs": "EPSG:4326"
-                },
-                "latLon": {
-                    "minx": -180,
-                    "maxx": 180,
-                    "miny": -90,
-                    "maxy": 90,
-                    "crs": "EPSG:4326"
-                },
-                "metadata": {
-                    "entry": [
-                        {
-                            "@key": "JDBC_VIRTUAL_TABLE",
-                            "virtualTable": {
-                                "name": f"schema_tables_{schema}",
-                                "sql": sql_query,
-                                "escapeSql": False
-                            }
-                        }
-                    ]
-                }
-            }
-        }
-
-        # Create a temporary SQL view to query the database
-        response = requests.post(
-            sql_view_url, auth=self.auth, json=sql_view_config, headers=headers
-        )
-
-        if response.status_code in [200, 201]:
-            # Now get the data from this SQL view
-            data_url = (
-                f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}/"
-                f"featuretypes/schema_tables_{schema}.json"
-            )
-            headers = {"Accept": "application/json"}
-            data_response = requests.get(data_url, auth=self.auth, headers=headers)
+    @staticmethod
+    def _datastore_schema(datastore_response) -> str:
+        """
+        The PostGIS schema a datastore is configured for ("public" if unset).
+        """
+        data_store = (decode_json(datastore_response) or {}).get("dataStore") or {}
+        entries = ((data_store.get("connectionParameters") or {}).get("entry")) or []
+        for entry in entries:
+            if entry.get("@key") == "schema":
+                return entry.get("$") or "public"
+        return "public"
 
-            # Clean up the temporary SQL view
-            delete_url = (
-                f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}/"
-                f"featuretypes/schema_tables_{schema}"
-            )
-            requests.delete(delete_url, auth=self.auth)
+    @staticmethod
+    def _configured_feature_types(response) -> List[Dict[str, Any]]:
+        """
+        Entries of a featuretypes.json listing: {"featureTypes": {"featureType":
+        [{"name": ..., "href": ...}]}}, or {"featureTypes": ""} when empty.
+        """
+        listing = (decode_json(response) or {}).get("featureTypes") or {}
+        if not isinstance(listing, dict):
+            return []
+        entries = listing.get("featureType") or []
+        if isinstance(entries, dict):
+            entries = [entries]
+        return [entry for entry in entries if isinstance(entry, dict) and entry.get("name")]
 
-            return data_response
-        else:
-            raise Exception(f"Failed to create SQL view: {response.text}")
+    @staticmethod
+    def _listed_names(response) -> List[str]:
+        """
+        Names of a featuretypes.json?list=... listing: {"list": {"string": [...]}}.
+        A single name comes back as a bare string and an empty listing as
+        {"list": ""}.
+        """
+        listing = (decode_json(response) or {}).get("list") or {}
+        if not isinstance(listing, dict):
+            return []
+        names = listing.get("string") or []
+        if isinstance(names, str):
+            names = [names]
+        return [name for name in names if isinstance(name, str) and name]
 
-    def list_postgis_tables_direct(
-        self, workspace: str, datastore: str, schema: str = "public"
+    def _list_schema_tables_via_sql_view(
+        self, workspace: str, datastore: str, schema: str
     ):
         """
-        List all tables in a PostGIS schema by using GeoServer's SQL view endpoint.
-        This method creates a temporary SQL view to query the information_schema.
+        List the tables of a schema by creating a temporary SQL view over
+        information_schema, reading it and always deleting it again.
         """
         # Create a SQL view to query the database schema
         sql_view_url = (
@@ -208,17 +255,12 @@ class GeoServerAdminDAO:
         )
         headers = {"Content-type": "application/json"}
 
-        # SQL query to get all tables in the specified schema
-        sql_query = f"""
-        SELECT
-            table_name,
-            table_type,
-            table_schema
-        FROM information_schema.tables
-        WHERE table_schema = '{schema}'
-        AND table_type = 'BASE TABLE'
-        ORDER BY table_name
-        """
+        if not _SCHEMA_NAME_RE.fullmatch(schema):
+            raise InvalidRequestError(f"Invalid schema name: {schema!r}")
+
+        # SQL query to get all tables in the specified schema; the schema is a
+        # view parameter (validated by GeoServer too) rather than spliced in
+        sql_query = _SCHEMA_TABLES_SQL
 
         sql_view_config = {
             "featureType": {
@@ -247,7 +289,14 @@ class GeoServerAdminDAO:
                             "virtualTable": {
                                 "name": f"temp_schema_tables_{schema}",
                                 "sql": sql_query,
-                                "escapeSql": False
+                                "escapeSql": True,
+                                "parameter": [
+                                    {
+                                        "name": "schema",
+                                        "defaultValue": schema,
+                                        "regexpValidator": _SCHEMA_NAME_PATTERN
+                                    }
+                                ]
                             }
                         }
                     ]
@@ -256,8 +305,8 @@ class GeoServerAdminDAO:
         }
 
         # Create temporary SQL view
-        create_response = requests.post(
-            sql_view_url, auth=self.auth, json=sql_view_config, headers=headers
+        create_response = self.session.post(
+            sql_view_url, data=orjson.dumps(sql_view_config), headers=headers, timeout=SLOW_TIMEOUT
         )
 
         if create_response.status_code in [200, 201]:
@@ -267,8 +316,7 @@ class GeoServerAdminDAO:
                     f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}/"
                     f"featuretypes/temp_schema_tables_{schema}.json"
                 )
-                headers = {"Accept": "application/json"}
-                data_response = requests.get(data_url, auth=self.auth, headers=headers)
+                data_response = self.session.get(data_url, timeout=SLOW_TIMEOUT)
 
                 # Return the response with table information
                 return data_response
@@ -278,7 +326,7 @@ class GeoServerAdminDAO:
                     f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}/"
                     f"featuretypes/temp_schema_tables_{schema}"
                 )
-                requests.delete(delete_url, auth=self.auth)
+                self.session.delete(delete_url)
         else:
             raise Exception(f"Failed to create SQL view: {create_response.text}")
 
@@ -322,11 +370,36 @@ class GeoServerAdminDAO:
                 "name": default_style
             }
 
-        response = requests.post(
-            url, auth=self.auth, json=feature_type_config, headers=headers
+        response = self.session.post(
+            url, data=orjson.dumps(feature_type_config), headers=headers
         )
         return response
 
+    def create_layers_from_tables(
+        self,
+        workspace: str,
+        datastore: str,
+        tables: List[Dict[str, Any]],
+        sequential: bool = False,
+        max_workers: int = geoserver_max_inflight
+    ) -> List[requests.Response]:
+        """
+        Create one layer per table entry (create_layer_from_table keyword
+        arguments, at least ``table_name``) and return the responses in order.
+
+        The REST API has no bulk featuretype endpoint, so the POSTs are issued
+        in parallel over the pooled session, at most GEOSERVER_MAX_INFLIGHT at
+        a time; pass ``sequential=True`` for servers that do not tolerate
+        concurrent catalog writes.
+        """
+        def create(table: Dict[str, Any]):
+            return self.create_layer_from_table(workspace, datastore, **table)
+
+        if sequential or len(tables) <= 1:
+            return [create(table) for table in tables]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tables))) as executor:
+            return list(executor.map(create, tables))
+
     def create_feature_type_from_shapefile(
         self,
         workspace: str,
@@ -424,8 +497,8 @@ class GeoServerAdminDAO:
         # Try with configure=all parameter first (may not work, but worth trying)
         params = {"configure": "all"}
         
-        response = requests.post(
-            url, auth=self.auth, json=feature_type_config, headers=headers, params=params
+        response = self.session.post(
+            url, data=orjson.dumps(feature_type_config), headers=headers, params=params
         )
         return response
 
@@ -437,8 +510,7 @@ class GeoServerAdminDAO:
             f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}/"
             f"featuretypes/{table_name}.json"
         )
-        headers = {"Accept": "application/json"}
-        return requests.get(url, auth=self.auth, headers=headers)
+        return self.session.get(url)
 
     def create_workspace(self, workspace_name: str):
         """
@@ -447,46 +519,42 @@ class GeoServerAdminDAO:
         url = f"{self.base_url}/workspaces"
         headers = {"Content-type": "application/json"}
         data = {"workspace": {"name": workspace_name}}
-        return requests.post(url, auth=self.auth, json=data, headers=headers)
+        return self.session.post(url, data=orjson.dumps(data), headers=headers)
 
     def get_layer_details(self, layer: str):
         """
         Get details of a specific layer.
         """
         url = f"{self.base_url}/layers/{layer}.json"
-        headers = {"Accept": "application/json"}
-        return requests.get(url, auth=self.auth, headers=headers)
+        return self.session.get(url)
 
     def list_styles(self):
         """
         List all styles in GeoServer.
         """
         url = f"{self.base_url}/styles.json"
-        headers = {"Accept": "application/json"}
-        return requests.get(url, auth=self.auth, headers=headers)
+        return self.session.get(url)
 
     def get_style_details(self, style_name: str):
         """
         Get details of a specific style.
         """
         url = f"{self.base_url}/styles/{style_name}.json"
-        headers = {"Accept": "application/json"}
-        return requests.get(url, auth=self.auth, headers=headers)
+        return self.session.get(url)
 
     def get_feature_type_details(self, workspace: str, datastore: str, feature_type: str):
         """
         Get details of a specific feature type (table/layer resource).
         """
         url = f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}/featuretypes/{feature_type}.json"
-        headers = {"Accept": "application/json"}
-        return requests.get(url, auth=self.auth, headers=headers)
+        return self.session.get(url)
 
     def delete_feature_type(self, workspace: str, datastore: str, feature_type: str):
         """
         Delete a feature type from a datastore.
         """
         url = f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}/featuretypes/{feature_type}"
-        return requests.delete(url, auth=self.auth)
+        return self.session.delete(url)
 
     def reload_datastore(self, workspace: str, datastore: str):
         """
@@ -495,7 +563,7 @@ class GeoServerAdminDAO:
         """
         url = f"{self.base_url}/workspaces/{workspace}/datastores/{datastore}/reload"
         headers = {"Content-type": "application/json"}
-        return requests.post(url, auth=self.auth, headers=headers)
+        return self.session.post(url, headers=headers)
 
     def update_feature_type(self, workspace: str, datastore: str, feature_type: str, config: dict, recalculate: bool = False):
         """
@@ -512,7 +580,7 @@ class GeoServerAdminDAO:
         if recalculate:
             url += "?recalculate=nativeBoundingBox,latLonBoundingBox"
         headers = {"Content-type": "application/json"}
-        return requests.put(url, auth=self.auth, json=config, headers=headers)
+        return self.session.put(url, data=orjson.dumps(config), headers=headers)
 
     def configure_layer_tile_caching(
         self, 
@@ -538,7 +606,7 @@ class GeoServerAdminDAO:
         
         # Get existing configuration first
         headers = {"Accept": "application/xml"}
-        get_response = requests.get(url, auth=self.auth, headers=headers)
+        get_response = self.session.get(url, headers=headers)
         
         if get_response.status_code != 200:
             # If layer doesn't exist in GWC, create a new configuration
@@ -556,7 +624,7 @@ class GeoServerAdminDAO:
         
         # PUT the updated configuration
         headers = {"Content-type": "application/xml"}
-        put_response = requests.put(url, auth=self.auth, data=xml_content, headers=headers)
+        put_response = self.session.put(url, data=xml_content, headers=headers)
         
         if put_response.status_code in [200, 201]:
             logger.info(
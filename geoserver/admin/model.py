@@ -1,6 +1,6 @@
-import re
 from typing import Optional
 from pydantic import BaseModel, Field, validator
+from utils.validation import IDENTIFIER_RE
 
 
 class UpdateRequest(BaseModel):
@@ -9,7 +9,7 @@ class UpdateRequest(BaseModel):
 
     @validator('new_name')
     def validate_new_name(cls, v):
-        if v is not None and not re.match(r'^[a-zA-Z0-9_-]+$', v):
+        if v is not None and not IDENTIFIER_RE.fullmatch(v):
             raise ValueError(
                 'new_name must contain only letters, numbers, underscores, and hyphens'
             )
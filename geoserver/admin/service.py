@@ -1,34 +1,67 @@
+import asyncio
 from typing import List, Dict, Any, Optional
 
+from geoserver.admin.async_dao import AsyncGeoServerAdminDAO
 from geoserver.admin.dao import GeoServerAdminDAO
 from geoserver.admin.model import UpdateRequest
 from geoserver.model import CreateLayerRequest
+from utils.errors import InvalidRequestError
+
+_REQUIRED_MESSAGES = {
+    "workspace": "Workspace name is required.",
+    "datastore": "Datastore name is required.",
+    "schema": "Schema name is required.",
+    "table_name": "Table name is required.",
+    "style_name": "Style name is required.",
+    "feature_type": "Feature type name is required.",
+    "shapefile_name": "Shapefile name is required.",
+    "layer_name": "Layer name is required.",
+}
+
+
+def _require(value, name: str):
+    if not value:
+        raise InvalidRequestError(_REQUIRED_MESSAGES[name])
 
 
 class GeoServerAdminService:
-    def __init__(self, dao: GeoServerAdminDAO):
+    def __init__(self, dao: GeoServerAdminDAO, async_dao: Optional[AsyncGeoServerAdminDAO] = None):
         self.dao = dao
+        self.async_dao = async_dao or AsyncGeoServerAdminDAO(
+            base_url=dao.base_url, username=dao.auth[0], password=dao.auth[1]
+        )
 
     def list_workspaces(self):
         return self.dao.list_workspaces()
 
+    async def list_workspaces_async(self):
+        return await self.async_dao.list_workspaces()
+
     def create_workspace(self, workspace_name: str):
         """
         Create a new workspace in GeoServer.
         """
-        if not workspace_name or not workspace_name.strip():
-            raise ValueError("Workspace name is required.")
+        _require(workspace_name and workspace_name.strip(), "workspace")
         return self.dao.create_workspace(workspace_name.strip())
 
     def get_workspace_details(self, workspace: str):
         return self.dao.get_workspace_details(workspace)
 
+    async def get_workspace_details_async(self, workspace: str):
+        return await self.async_dao.get_workspace_details(workspace)
+
     def list_datastores(self, workspace: str):
         return self.dao.list_datastores(workspace)
 
+    async def list_datastores_async(self, workspace: str):
+        return await self.async_dao.list_datastores(workspace)
+
     def get_datastore_details(self, workspace: str, datastore: str):
         return self.dao.get_datastore_details(workspace, datastore)
 
+    async def get_datastore_details_async(self, workspace: str, datastore: str):
+        return await self.async_dao.get_datastore_details(workspace, datastore)
+
     def delete_workspace(self, workspace: str):
         """
         Delete a workspace.
@@ -81,47 +114,38 @@ class GeoServerAdminService:
         """
         List all available tables in a PostGIS datastore.
         """
-        if not workspace:
-            raise ValueError("Workspace name is required.")
-        if not datastore:
-            raise ValueError("Datastore name is required.")
+        _require(workspace, "workspace")
+        _require(datastore, "datastore")
         return self.dao.list_datastore_tables(workspace, datastore)
 
+    async def list_datastore_tables_async(self, workspace: str, datastore: str):
+        _require(workspace, "workspace")
+        _require(datastore, "datastore")
+        return await self.async_dao.list_datastore_tables(workspace, datastore)
+
     def list_postgis_schema_tables(self, workspace: str, datastore: str, schema: str = "public"):
         """
         List all tables in a specific PostGIS schema by querying the database directly.
         """
-        if not workspace:
-            raise ValueError("Workspace name is required.")
-        if not datastore:
-            raise ValueError("Datastore name is required.")
-        if not schema:
-            raise ValueError("Schema name is required.")
+        _require(workspace, "workspace")
+        _require(datastore, "datastore")
+        _require(schema, "schema")
         return self.dao.list_postgis_schema_tables(workspace, datastore, schema)
 
     def list_postgis_tables_direct(self, workspace: str, datastore: str, schema: str = "public"):
         """
         List all tables in a PostGIS schema using direct database query.
         """
-        if not workspace:
-            raise ValueError("Workspace name is required.")
-        if not datastore:
-            raise ValueError("Datastore name is required.")
-        if not schema:
-            raise ValueError("Schema name is required.")
+        _require(workspace, "workspace")
+        _require(datastore, "datastore")
+        _require(schema, "schema")
         return self.dao.list_postgis_tables_direct(workspace, datastore, schema)
 
     async def create_layer_from_table(self, request: CreateLayerRequest):
         """
         Create a layer from a PostGIS table.
+        workspace, store_name and table_name are validated by CreateLayerRequest.
         """
-        if not request.workspace:
-            raise ValueError("Workspace name is required.")
-        if not request.store_name:
-            raise ValueError("Store name is required.")
-        if not request.table_name:
-            raise ValueError("Table name is required.")
-            
         return self.dao.create_layer_from_table(
             workspace=request.workspace,
             datastore=request.store_name,
@@ -133,48 +157,87 @@ class GeoServerAdminService:
             default_style=request.default_style
         )
 
+    async def create_layers_from_tables(self, requests: List[CreateLayerRequest], sequential: bool = False):
+        """
+        Create several layers from PostGIS tables, batched per datastore.
+        Responses are returned in the order of the requests.
+        """
+        by_store: Dict[tuple, List[int]] = {}
+        for index, request in enumerate(requests):
+            # workspace, store_name and table_name are validated by CreateLayerRequest
+            by_store.setdefault((request.workspace, request.store_name), []).append(index)
+
+        responses: List[Any] = [None] * len(requests)
+        for (workspace, store_name), indexes in by_store.items():
+            tables = [
+                {
+                    "table_name": requests[i].table_name,
+                    "layer_name": requests[i].layer_name,
+                    "title": requests[i].title,
+                    "description": requests[i].description,
+                    "enabled": requests[i].enabled,
+                    "default_style": requests[i].default_style,
+                }
+                for i in indexes
+            ]
+            store_responses = await asyncio.to_thread(
+                self.dao.create_layers_from_tables, workspace, store_name, tables, sequential
+            )
+            for i, response in zip(indexes, store_responses):
+                responses[i] = response
+        return responses
+
     def get_table_details(self, workspace: str, datastore: str, table_name: str):
         """
         Get details of a specific table in a datastore.
         """
-        if not workspace:
-            raise ValueError("Workspace name is required.")
-        if not datastore:
-            raise ValueError("Datastore name is required.")
-        if not table_name:
-            raise ValueError("Table name is required.")
+        _require(workspace, "workspace")
+        _require(datastore, "datastore")
+        _require(table_name, "table_name")
         return self.dao.get_table_details(workspace, datastore, table_name)
 
+    async def get_table_details_async(self, workspace: str, datastore: str, table_name: str):
+        _require(workspace, "workspace")
+        _require(datastore, "datastore")
+        _require(table_name, "table_name")
+        return await self.async_dao.get_table_details(workspace, datastore, table_name)
+
     def get_layer_details(self, layer: str):
         """
         Get details of a specific layer.
         """
         return self.dao.get_layer_details(layer)
 
+    async def get_layer_details_async(self, layer: str):
+        return await self.async_dao.get_layer_details(layer)
+
     def list_styles(self):
         """
         List all styles in GeoServer.
         """
         return self.dao.list_styles()
 
+    async def list_styles_async(self):
+        return await self.async_dao.list_styles()
+
     def get_style_details(self, style_name: str):
         """
         Get details of a specific style.
         """
-        if not style_name:
-            raise ValueError("Style name is required.")
+        _require(style_name, "style_name")
         return self.dao.get_style_details(style_name)
 
+    async def get_style_details_async(self, style_name: str):
+        _require(style_name, "style_name")
+        return await self.async_dao.get_style_details(style_name)
+
     def get_feature_type_details(self, workspace: str, datastore: str, feature_type: str):
         """
         Get details of a specific feature type.
         """
-        if not workspace:
-            raise ValueError("Workspace name is required.")
-        if not datastore:
-            raise ValueError("Datastore name is required.")
-        if not feature_type:
-            raise ValueError("Feature type name is required.")
+        _require(workspace, "workspace")
+        _require(datastore, "datastore")
+        _require(feature_type, "feature_type")
         return self.dao.get_feature_type_details(workspace, datastore, feature_type)
 
     def update_feature_type(self, workspace: str, datastore: str, feature_type: str, config: dict, recalculate: bool = False):
@@ -188,24 +251,18 @@ class GeoServerAdminService:
             config: Feature type configuration dictionary
             recalculate: If True, trigger bounding box recalculation via query parameter
         """
-        if not workspace:
-            raise ValueError("Workspace name is required.")
-        if not datastore:
-            raise ValueError("Datastore name is required.")
-        if not feature_type:
-            raise ValueError("Feature type name is required.")
+        _require(workspace, "workspace")
+        _require(datastore, "datastore")
+        _require(feature_type, "feature_type")
         return self.dao.update_feature_type(workspace, datastore, feature_type, config, recalculate=recalculate)
 
     def delete_feature_type(self, workspace: str, datastore: str, feature_type: str):
         """
         Delete a feature type from a datastore.
         """
-        if not workspace:
-            raise ValueError("Workspace name is required.")
-        if not datastore:
-            raise ValueError("Datastore name is required.")
-        if not feature_type:
-            raise ValueError("Feature type name is required.")
+        _require(workspace, "workspace")
+        _require(datastore, "datastore")
+        _require(feature_type, "feature_type")
         return self.dao.delete_feature_type(workspace, datastore, feature_type)
 
     def create_feature_type_from_shapefile(
@@ -235,12 +292,9 @@ class GeoServerAdminService:
         Returns:
             Response object from GeoServer REST API
         """
-        if not workspace:
-            raise ValueError("Workspace name is required.")
-        if not datastore:
-            raise ValueError("Datastore name is required.")
-        if not shapefile_name:
-            raise ValueError("Shapefile name is required.")
+        _require(workspace, "workspace")
+        _require(datastore, "datastore")
+        _require(shapefile_name, "shapefile_name")
         return self.dao.create_feature_type_from_shapefile(
             workspace, datastore, shapefile_name, feature_type_name, enabled, attributes, srs, native_bbox
         )
@@ -250,10 +304,8 @@ class GeoServerAdminService:
         Reload a datastore to trigger auto-discovery of feature types.
         This is useful after uploading shapefiles to trigger GeoServer to discover and create feature types.
         """
-        if not workspace:
-            raise ValueError("Workspace name is required.")
-        if not datastore:
-            raise ValueError("Datastore name is required.")
+        _require(workspace, "workspace")
+        _require(datastore, "datastore")
         return self.dao.reload_datastore(workspace, datastore)
 
     def configure_layer_tile_caching(
@@ -266,9 +318,7 @@ class GeoServerAdminService:
         """
         Configure tile caching for a layer.
         """
-        if not workspace:
-            raise ValueError("Workspace name is required.")
-        if not layer_name:
-            raise ValueError("Layer name is required.")
+        _require(workspace, "workspace")
+        _require(layer_name, "layer_name")
         return self.dao.configure_layer_tile_caching(workspace, layer_name, tile_formats, gridset)
 
@@ -1,97 +1,185 @@
-import os
-import sys
+import asyncio
 import logging
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from operator import attrgetter
+from typing import AsyncIterator, List, Dict, Optional
 from urllib.parse import urlencode
+import anyio
+import httpx
+import orjson
 import requests
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Query
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from database.database import get_db
+from database.database import AsyncSessionLocal, get_db, get_async_db
+from geoserver.async_dao import AsyncGeoServerDAO
 from geoserver.dao import GeoServerDAO
 from geoserver.model import (CreateLayerRequest, PostGISRequest, PublishUploadLogRequest, PublishUploadLogResponse)
-from geoserver.service import GeoServerService
-from geoserver.admin.api import get_layer_bbox
+from geoserver.service import GeoServerService, decode_json
 from metadata.models.schema import Metadata
 from metadata.service.service import MetadataService
-
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'utils'))
-from utils.config import *  # noqa: E402, F403
+from utils.cache import rest_cache, invalidate_rest_cache
+from utils.config import (
+    bbox_refresh_interval,
+    geoserver_host,
+    geoserver_port,
+    geoserver_username,
+    geoserver_password,
+    layers_snapshot_interval,
+)
 
 logger = logging.getLogger(__name__)
 
 # Initialize router
-router = APIRouter(tags=["geoserver"])
+router = APIRouter(tags=["geoserver"], default_response_class=ORJSONResponse)
+
+
+def create_geo_service() -> GeoServerService:
+    """
+    Build the GeoServer service for one app instance. Called from the lifespan
+    in main.py, which opens/closes the async connection pool and keeps the
+    service on app.state.
+    """
+    base_url = f"http://{geoserver_host}:{geoserver_port}/geoserver/rest"
+    return GeoServerService(
+        GeoServerDAO(base_url=base_url, username=geoserver_username, password=geoserver_password),
+        AsyncGeoServerDAO(base_url=base_url, username=geoserver_username, password=geoserver_password),
+    )
+
+
+def get_geo_service(request: Request) -> GeoServerService:
+    """Dependency returning the app-wide GeoServerService."""
+    return request.app.state.geo_service
 
-# Initialize DAO and Service with configuration
-geo_dao = GeoServerDAO(
-    base_url=f"http://{geoserver_host}:{geoserver_port}/geoserver/rest",
-    username=geoserver_username,
-    password=geoserver_password
-)
-geo_service = GeoServerService(geo_dao)
 
 @router.post("/upload", summary="Upload Shapefile/Resource (Used for internal api calls)", description="Upload a shapefile or other resource to GeoServer. This API is used to upload shapefiles (as ZIP archives) to GeoServer. The shapefile must be in a ZIP format containing all required components (.shp, .shx, .dbf, etc.).")
 async def upload_resource(
     workspace: str = Form(..., description="Target workspace name in GeoServer (e.g., 'metastring')"),
     store_name: str = Form(..., description="Name of the datastore where the resource will be stored"),
     resource_type: str = Form(..., description="Type of resource to upload (e.g., 'shapefile')"),
-    file: UploadFile = File(..., description="The file to upload (must be a ZIP file for shapefiles)")
+    file: UploadFile = File(..., description="The file to upload (must be a ZIP file for shapefiles)"),
+    geo_service: GeoServerService = Depends(get_geo_service)
 ):
-    try:
-        response = await geo_service.upload_resource(workspace, store_name, resource_type, file)
-        if response.status_code in [200, 201]:
-            return {"message": "Resource uploaded successfully!", "status_code": response.status_code}
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    response = await geo_service.upload_resource(workspace, store_name, resource_type, file)
+    if response.status_code in [200, 201]:
+        await invalidate_rest_cache("datastores", "layers")
+        return {"message": "Resource uploaded successfully!", "status_code": response.status_code}
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 
 @router.post("/upload-postgis", summary="Create PostGIS Datastore (Used for internal api calls)", description="Create a PostGIS datastore connection in GeoServer. This API is used to connect GeoServer to a PostgreSQL/PostGIS database, allowing GeoServer to access spatial data stored in the database.")
-async def upload_postgis(request: PostGISRequest):
-    try:
-        response = await geo_service.upload_postgis(request)
-        if response.status_code in [200, 201]:
-            return {
-                "message": f"PostGIS datastore '{request.store_name}' created successfully!",
-                "status_code": response.status_code,
-                "workspace": request.workspace,
-                "store_name": request.store_name,
-                "database": request.database,
-                "host": request.host
-            }
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def upload_postgis(request: PostGISRequest, geo_service: GeoServerService = Depends(get_geo_service)):
+    response = await geo_service.upload_postgis(request)
+    if response.status_code in [200, 201]:
+        await invalidate_rest_cache("datastores", "layers")
+        return {
+            "message": f"PostGIS datastore '{request.store_name}' created successfully!",
+            "status_code": response.status_code,
+            "workspace": request.workspace,
+            "store_name": request.store_name,
+            "database": request.database,
+            "host": request.host
+        }
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+
+
+
+# (response key, Metadata attribute) pairs for _map_metadata_to_layer
+_LAYER_FIELDS = (
+    ("id", "id"),
+    ("geoserverName", "geoserver_name"),
+    ("nameOfDataset", "name_of_dataset"),
+    ("theme", "theme"),
+    ("keywords", "keywords"),
+    ("purposeOfCreatingData", "purpose_of_creating_data"),
+    ("dataType", "data_type"),
+    ("contactPerson", "contact_person"),
+    ("organization", "organization"),
+    ("contactEmail", "contact_email"),
+    ("country", "country"),
+    ("createdOn", "created_on"),
+    ("updatedOn", "updated_on"),
+    ("accessConstraints", "access_constraints"),
+    ("useConstraints", "use_constraints"),
+    ("mailingAddress", "mailing_address"),
+    ("cityLocalityCountry", "city_locality_country"),
+)
+
+# (response key, Metadata attribute) pairs for _map_metadata_to_layer1 (renamed keys, fewer fields)
+_LAYER1_FIELDS = (
+    ("id", "id"),
+    ("title", "name_of_dataset"),
+    ("tags", "keywords"),
+    ("purposeOfCreatingData", "purpose_of_creating_data"),
+    ("layerType", "data_type"),
+    ("createdBy", "contact_person"),
+    ("organization", "organization"),
+    ("contactEmail", "contact_email"),
+    ("country", "country"),
+    ("createdDate", "created_on"),
+    ("modifiedDate", "updated_on"),
+    ("accessConstraints", "access_constraints"),
+    ("useConstraints", "use_constraints"),
+    ("mailingAddress", "mailing_address"),
+    ("cityLocalityCountry", "city_locality_country"),
+)
+
+# Fixed values appended to every /layers1 entry
+_LAYER1_CONSTANTS = {
+    "attribution": None,
+    "author": None,
+    "pdfLink": None,
+    "pageId": None,
+    "downloadAccess": "ALL",
+    "url": None,
+    "license": None,
+    "uploaderUserId": None,
+    "isDownloadable": None,
+    "layerStatus": None,
+    "portalId": None,
+}
+
+
+# Placeholder fields every /layers1 entry starts with (metadata fields override them)
+_LAYER1_DEFAULTS = {"description": None, **_LAYER1_CONSTANTS, "category": "biodiversity"}
+
+
+def _fields_mapper(fields, isoformat_keys, constants=None):
+    """
+    Build a function mapping a metadata object (ORM instance or row) to a dict.
+    All attributes are fetched in one attrgetter call and zipped with the keys;
+    only the id and the timestamp values need converting afterwards.
+    """
+    keys = tuple(key for key, _ in fields)
+    fetch = attrgetter(*(attr for _, attr in fields))
+
+    def mapper(metadata: Metadata) -> Dict:
+        mapped = dict(zip(keys, fetch(metadata)))
+        mapped["id"] = str(mapped["id"])
+        for key in isoformat_keys:
+            value = mapped[key]
+            if value:
+                mapped[key] = value.isoformat()
+            else:
+                mapped[key] = None
+        if constants:
+            mapped.update(constants)
+        return mapped
+    return mapper
+
 
+_layer_mapper = _fields_mapper(_LAYER_FIELDS, ("createdOn", "updatedOn"))
+_layer1_mapper = _fields_mapper(_LAYER1_FIELDS, ("createdDate", "modifiedDate"), _LAYER1_CONSTANTS)
 
 
 def _map_metadata_to_layer(metadata: Metadata) -> Dict:
     """
     Helper function to map metadata object to layer response dictionary.
     """
-    return {
-        "id": str(metadata.id),
-        "geoserverName": metadata.geoserver_name,
-        "nameOfDataset": metadata.name_of_dataset,
-        "theme": metadata.theme,
-        "keywords": metadata.keywords,
-        "purposeOfCreatingData": metadata.purpose_of_creating_data,
-        "dataType": metadata.data_type,
-        "contactPerson": metadata.contact_person,
-        "organization": metadata.organization,
-        "contactEmail": metadata.contact_email,
-        "country": metadata.country,
-        "createdOn": metadata.created_on.isoformat() if metadata.created_on else None,
-        "updatedOn": metadata.updated_on.isoformat() if metadata.updated_on else None,
-        "accessConstraints": metadata.access_constraints,
-        "useConstraints": metadata.use_constraints,
-        "mailingAddress": metadata.mailing_address,
-        "cityLocalityCountry": metadata.city_locality_country
-    }
+    return _layer_mapper(metadata)
 
 
 def _map_metadata_to_layer1(metadata: Metadata) -> Dict:
@@ -99,238 +187,288 @@ def _map_metadata_to_layer1(metadata: Metadata) -> Dict:
     Helper function to map metadata object to layer response dictionary for /layers1 endpoint.
     Uses renamed keys and excludes certain fields.
     """
-    return {
-        "id": str(metadata.id),
-        "title": metadata.name_of_dataset,
-        "tags": metadata.keywords,
-        "purposeOfCreatingData": metadata.purpose_of_creating_data,
-        "layerType": metadata.data_type,
-        "createdBy": metadata.contact_person,
-        "organization": metadata.organization,
-        "contactEmail": metadata.contact_email,
-        "country": metadata.country,
-        "createdDate": metadata.created_on.isoformat() if metadata.created_on else None,
-        "modifiedDate": metadata.updated_on.isoformat() if metadata.updated_on else None,
-        "accessConstraints": metadata.access_constraints,
-        "useConstraints": metadata.use_constraints,
-        "mailingAddress": metadata.mailing_address,
-        "cityLocalityCountry": metadata.city_locality_country,
-        "attribution": None,
-        "author": None,
-        "pdfLink": None,
-        "pageId": None,
-        "downloadAccess": "ALL",
-        "url": None,
-        "license": None,
-        "uploaderUserId": None,
-        "isDownloadable": None,
-        "layerStatus": None,
-        "portalId": None
-    }
+    return _layer1_mapper(metadata)
 
 
+# Mapped metadata fields keyed by (mapper, metadata.id, metadata.updated_on).
+# updated_on changes on every row update, so stale entries are never served.
+_LAYER_FIELDS_CACHE_SIZE = 4096
+_layer_fields_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
 
 
-@router.get("/layers", summary="List All Layers (Used for frontend api calls)", description="Retrieve a list of all layers in GeoServer with their metadata. This API returns enhanced layer information including metadata (if available) for each layer.")
-async def list_layers(db: Session = Depends(get_db)):
-    try:
-        response = geo_service.list_layers()
-        if response.status_code == 200:
-            layers_data = response.json()
-
-            # Extract layers list
-            layers_list = layers_data.get("layers", {}).get("layer", [])
-
-            if not layers_list:
-                return {"layers": {"layer": []}}
-
-            # Collect all layer names for batch metadata fetching
-            layer_names = [layer.get("name") for layer in layers_list if layer.get("name")]
-
-            # Batch fetch all metadata in one query (solves N+1 problem)
-            metadata_dict: Dict[str, Metadata] = {}
-            if layer_names:
-                try:
-                    metadata_list = MetadataService.get_by_geoserver_names(layer_names, db)
-                    # Create a dictionary for O(1) lookup by geoserver_name
-                    metadata_dict = {meta.geoserver_name: meta for meta in metadata_list}
-                    logger.info(
-                        f"Found metadata for {len(metadata_dict)} out of {len(layer_names)} layers"
-                    )
-                except Exception as e:
-                    logger.warning(
-                        f"Error batch fetching metadata: {str(e)}. Continuing without metadata."
-                    )
-
-            # Enhance each layer with metadata
-            enhanced_layers = []
-            for layer in layers_list:
-                layer_name = layer.get("name")
-                enhanced_layer = {
-                    "name": layer.get("name"),
-                    "href": layer.get("href")
-                }
-
-                # Add metadata if available
-                if layer_name and layer_name in metadata_dict:
-                    metadata = metadata_dict[layer_name]
-                    enhanced_layer.update(_map_metadata_to_layer(metadata))
-
-                    # Add WMS link
-                    if metadata.geoserver_name:
-                        wms_link = geo_service.get_tile_layer_url(metadata.geoserver_name)
-                        enhanced_layer["wms_link"] = wms_link
-
-                enhanced_layers.append(enhanced_layer)
-
-            # Return the enhanced response
-            return {
-                "layers": {
-                    "layer": enhanced_layers
-                }
+def _cached_layer_fields(metadata: Metadata, mapper) -> Dict:
+    """
+    Return mapper(metadata), reusing the dict built for the same metadata row version.
+    The returned dict is shared; callers merge it with update() and must not mutate it.
+    """
+    key = (mapper.__name__, metadata.id, metadata.updated_on)
+    fields = _layer_fields_cache.get(key)
+    if fields is None:
+        fields = mapper(metadata)
+        _layer_fields_cache[key] = fields
+        if len(_layer_fields_cache) > _LAYER_FIELDS_CACHE_SIZE:
+            _layer_fields_cache.popitem(last=False)
+    else:
+        _layer_fields_cache.move_to_end(key)
+    return fields
+
+
+async def _fetch_metadata_dict(layer_names: List[str], db: AsyncSession) -> Dict[str, Metadata]:
+    """
+    Batch fetch metadata for the given layer names keyed by geoserver_name.
+    Only the listing columns are loaded; the rows expose them as attributes,
+    so the field getters work on them unchanged.
+    Falls back to an empty dict so the layer listing still works without metadata.
+    """
+    metadata_dict: Dict[str, Metadata] = {}
+    if layer_names:
+        try:
+            metadata_list = await MetadataService.get_by_geoserver_names_slim_async(layer_names, db)
+            # Create a dictionary for O(1) lookup by geoserver_name
+            metadata_dict = {meta.geoserver_name: meta for meta in metadata_list}
+            logger.info(f"Fetched metadata for {len(metadata_dict)} geoserver names")
+        except Exception as e:
+            logger.warning(
+                f"Error batch fetching metadata: {str(e)}. Continuing without metadata."
+            )
+    return metadata_dict
+
+
+async def _fetch_layer_bboxes(
+    geo_service: GeoServerService, layer_names: List[str]
+) -> Dict[str, Optional[List[List[float]]]]:
+    """
+    Fetch bounding boxes for the given layers in one batch (WMS capabilities),
+    falling back to concurrent per-layer lookups for anything it does not cover.
+    """
+    return await geo_service.get_bboxes_for_layers(layer_names)
+
+
+async def _build_layers_payload(geo_service: GeoServerService, db: AsyncSession) -> Dict:
+    """
+    Assemble the /layers response: GeoServer layers enhanced with their metadata.
+    """
+    response = await geo_service.list_layers_async()
+    if response.status_code == 200:
+        layers_data = decode_json(response) or {}
+
+        # Extract layers list
+        layers_list = layers_data.get("layers", {}).get("layer", [])
+
+        if not layers_list:
+            return {"layers": {"layer": []}}
+
+        layer_names = [name for layer in layers_list if (name := layer.get("name"))]
+        # Batch fetch metadata for the listed layers only (one query, solves N+1)
+        metadata_dict = await _fetch_metadata_dict(layer_names, db)
+        tile_urls = geo_service.get_tile_layer_urls(
+            [name for name in layer_names if name in metadata_dict]
+        )
+
+        # Enhance each layer with metadata
+        enhanced_layers = [None] * len(layers_list)
+        for i, layer in enumerate(layers_list):
+            layer_name = layer.get("name")
+            enhanced_layer = {
+                "name": layer_name,
+                "href": layer.get("href")
             }
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except HTTPException:
-        # Re-raise HTTPExceptions
-        raise
-    except Exception as e:
-        logger.error(f"Error in list_layers: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+
+            # Add metadata if available
+            metadata = metadata_dict.get(layer_name)
+            if metadata is not None:
+                enhanced_layer.update(_cached_layer_fields(metadata, _map_metadata_to_layer))
+
+                # Add WMS link
+                if metadata.geoserver_name:
+                    enhanced_layer["wms_link"] = tile_urls[metadata.geoserver_name]
+
+            enhanced_layers[i] = enhanced_layer
+
+        # Return the enhanced response
+        return {
+            "layers": {
+                "layer": enhanced_layers
+            }
+        }
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+
+
+@rest_cache("layers")
+async def _live_layers_payload(geo_service: GeoServerService, db: AsyncSession) -> Dict:
+    """
+    /layers fallback used until the snapshot is (re)built, cached like the other
+    layer reads so requests in that window don't each rebuild the payload.
+    """
+    return await _build_layers_payload(geo_service, db)
+
+
+def request_layers_refresh(app):
+    """
+    Drop the /layers snapshot (so requests build live until it is rebuilt)
+    and wake the refresh loop.
+    """
+    app.state.layers_snapshot = None
+    app.state.layers_refresh_event.set()
+
+
+async def refresh_layers_snapshot_loop(app, interval: float = layers_snapshot_interval):
+    """
+    Keep app.state.layers_snapshot, the serialized /layers payload, up to date.
+    Rebuilds every `interval` seconds, or as soon as request_layers_refresh() is called.
+    Started and cancelled by the lifespan in main.py.
+    """
+    event = app.state.layers_refresh_event
+    while True:
+        event.clear()
+        try:
+            async with AsyncSessionLocal() as db:
+                payload = await _build_layers_payload(app.state.geo_service, db)
+            if not event.is_set():
+                app.state.layers_snapshot = orjson.dumps(payload)
+        except Exception as e:
+            logger.warning(f"Refreshing /layers snapshot failed: {str(e)}")
+        try:
+            await asyncio.wait_for(event.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def refresh_bbox_cache_loop(app, interval: float = bbox_refresh_interval):
+    """
+    Reload the layer bbox cache every `interval` seconds so /layers1 reads
+    bboxes without a GeoServer round trip. Started and cancelled by the
+    lifespan in main.py.
+    """
+    while True:
+        await app.state.geo_service.refresh_bbox_cache()
+        await asyncio.sleep(interval)
+
+
+@router.get("/layers", summary="List All Layers (Used for frontend api calls)", description="Retrieve a list of all layers in GeoServer with their metadata. This API returns enhanced layer information including metadata (if available) for each layer.")
+async def list_layers(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    geo_service: GeoServerService = Depends(get_geo_service)
+):
+    # Served from the background-refreshed snapshot when one is available
+    snapshot = getattr(request.app.state, "layers_snapshot", None)
+    if snapshot is not None:
+        return Response(content=snapshot, media_type="application/json")
+    return await _live_layers_payload(geo_service=geo_service, db=db)
 
 @router.get("/layers1", summary="List All Layers (Used for frontend api calls)", description="Retrieve a list of all layers in GeoServer with their metadata. This API returns enhanced layer information including metadata (if available) for each layer.")
-async def list_layers1(db: Session = Depends(get_db)):
-    try:
-        response = geo_service.list_layers()
-        if response.status_code == 200:
-            layers_data = response.json()
-
-            # Extract layers list
-            layers_list = layers_data.get("layers", {}).get("layer", [])
-
-            if not layers_list:
-                return {
-                    "layers": [],
-                    "page": 1,
-                    "totalPage": "",
-                    "currPage": ""
-                }
-
-            # Collect all layer names for batch metadata fetching
-            layer_names = [layer.get("name") for layer in layers_list if layer.get("name")]
-
-            # Batch fetch all metadata in one query (solves N+1 problem)
-            metadata_dict: Dict[str, Metadata] = {}
-            if layer_names:
-                try:
-                    metadata_list = MetadataService.get_by_geoserver_names(layer_names, db)
-                    # Create a dictionary for O(1) lookup by geoserver_name
-                    metadata_dict = {meta.geoserver_name: meta for meta in metadata_list}
-                    logger.info(
-                        f"Found metadata for {len(metadata_dict)} out of {len(layer_names)} layers"
-                    )
-                except Exception as e:
-                    logger.warning(
-                        f"Error batch fetching metadata: {str(e)}. Continuing without metadata."
-                    )
-
-            # Enhance each layer with metadata
-            enhanced_layers = []
-            for layer in layers_list:
-                layer_name = layer.get("name")
-                geoserver_name = layer.get("name")
-                # Extract just the layer name (without workspace prefix)
-                # e.g., "metastring:gbif" -> "gbif"
-                name_only = geoserver_name.split(":")[-1] if geoserver_name and ":" in geoserver_name else geoserver_name
-                
-                enhanced_layer = {
-                    "geoserver_name": geoserver_name,
-                    "name": name_only,
-                    "description": None,
-                    "attribution": None,
-                    "author": None,
-                    "pdfLink": None,
-                    "pageId": None,
-                    "downloadAccess": "ALL",
-                    "url": None,
-                    "license": None,
-                    "uploaderUserId": None,
-                    "isDownloadable": None,
-                    "layerStatus": None,
-                    "portalId": None,
-                    "category": "biodiversity"
-                }
-
-                # Add metadata if available
-                if layer_name and layer_name in metadata_dict:
-                    metadata = metadata_dict[layer_name]
-                    enhanced_layer.update(_map_metadata_to_layer1(metadata))
-
-                    # Add thumbnail (WMS link)
-                    if metadata.geoserver_name:
-                        wms_link = geo_service.get_tile_layer_url(metadata.geoserver_name)
-                        enhanced_layer["thumbnail"] = wms_link
-
-                # Fetch and add bounding box
-                if layer_name:
-                    bbox = get_layer_bbox(layer_name)
-                    enhanced_layer["bbox"] = bbox
-
-                enhanced_layers.append(enhanced_layer)
-
-            # Return the enhanced response
+@rest_cache("layers")
+async def list_layers1(db: AsyncSession = Depends(get_async_db), geo_service: GeoServerService = Depends(get_geo_service)):
+    response = await geo_service.list_layers_async()
+    if response.status_code == 200:
+        layers_data = decode_json(response) or {}
+
+        # Extract layers list
+        layers_list = layers_data.get("layers", {}).get("layer", [])
+
+        if not layers_list:
             return {
-                "layers": enhanced_layers,
+                "layers": [],
                 "page": 1,
                 "totalPage": "",
                 "currPage": ""
             }
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except HTTPException:
-        # Re-raise HTTPExceptions
-        raise
-    except Exception as e:
-        logger.error(f"Error in list_layers1: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+
+        layer_names = [name for layer in layers_list if (name := layer.get("name"))]
+        # Metadata for the listed layers (one query) while the bboxes are looked up
+        metadata_dict, bboxes = await asyncio.gather(
+            _fetch_metadata_dict(layer_names, db),
+            _fetch_layer_bboxes(geo_service, layer_names),
+        )
+        tile_urls = geo_service.get_tile_layer_urls(
+            [name for name in layer_names if name in metadata_dict]
+        )
+
+        # Enhance each layer with metadata
+        enhanced_layers = [None] * len(layers_list)
+        for i, layer in enumerate(layers_list):
+            layer_name = layer.get("name")
+            # Extract just the layer name (without workspace prefix)
+            # e.g., "metastring:gbif" -> "gbif"
+            name_only = layer_name.rpartition(":")[2] if layer_name else layer_name
+            
+            enhanced_layer = {"geoserver_name": layer_name, "name": name_only, **_LAYER1_DEFAULTS}
+
+            # Add metadata if available
+            metadata = metadata_dict.get(layer_name)
+            if metadata is not None:
+                enhanced_layer.update(_cached_layer_fields(metadata, _map_metadata_to_layer1))
+
+                # Add thumbnail (WMS link)
+                if metadata.geoserver_name:
+                    enhanced_layer["thumbnail"] = tile_urls[metadata.geoserver_name]
+
+            # Add bounding box
+            if layer_name:
+                enhanced_layer["bbox"] = bboxes.get(layer_name)
+
+            enhanced_layers[i] = enhanced_layer
+
+        # Return the enhanced response
+        return {
+            "layers": enhanced_layers,
+            "page": 1,
+            "totalPage": "",
+            "currPage": ""
+        }
+    else:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
 
 ####################################API to Get Tile Layer URL#############################
 
 @router.get("/layers/{layer}/tile_url", summary="Get Layer Tile URL (Used for frontend api calls)", description="Generate a WMS (Web Map Service) tile URL for a specific layer. This URL can be used by frontend applications to render map tiles for the layer.")
-async def get_layer_tile_url(layer: str):
-    try:
-        tile_url = geo_service.get_tile_layer_url(layer)
-        return {"tile_url": tile_url}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_layer_tile_url(layer: str, geo_service: GeoServerService = Depends(get_geo_service)):
+    tile_url = geo_service.get_tile_layer_url(layer)
+    return {"tile_url": tile_url}
 
 @router.get("/layers/{layer}/vector_tile_url", summary="Get Layer Vector Tile URL (Used for frontend api calls)", description="Generate a vector tile URL (TMS/PBF) for a specific layer. This URL template can be used by frontend applications to render vector map tiles. The URL contains placeholders {z}, {x}, {-y} that should be replaced with actual tile coordinates.")
-async def get_layer_vector_tile_url(layer: str):
-    try:
-        tile_url = geo_service.get_vectortile_layer_url(layer)
-        return {"tile_url": tile_url}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_layer_vector_tile_url(layer: str, geo_service: GeoServerService = Depends(get_geo_service)):
+    tile_url = geo_service.get_vectortile_layer_url(layer)
+    return {"tile_url": tile_url}
 
 @router.post("/layers/tile_urls", summary="Get Tile URLs for Multiple Datasets", description="Retrieve WMS tile URLs for multiple datasets at once. This endpoint accepts a list of dataset names and returns a mapping of dataset names to their corresponding WMS tile URLs, enabling efficient batch retrieval for frontend applications.")
-async def get_tile_urls_for_datasets(datasets: List[str]):
-    try:
-        return geo_service.get_tile_urls_for_datasets(datasets)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@rest_cache("layers")
+async def get_tile_urls_for_datasets(
+    datasets: List[str],
+    workspace: Optional[str] = Query(None, description="Only look the datasets up in this workspace (much faster on large GeoServers)"),
+    geo_service: GeoServerService = Depends(get_geo_service)
+):
+    return await geo_service.get_tile_urls_for_datasets_async(datasets, workspace)
 
 
 ############################## New simplified Layer APIs To Get column and data ###########################
 
 @router.get("/layer/columns", summary="Get Layer Schema/Columns", description="Retrieve the schema (column definitions) for a specific layer. This endpoint returns information about all attributes/columns available in the layer, including data types and constraints.")
-async def get_layer_columns(layer: str = Query(..., description="Layer name (e.g., 'metastring:gbif')")):
+# Not wrapped in rest_cache: GeoServerService caches columns per layer itself
+# (shared with the styles DAO) and is cleared on "layers" invalidation
+async def get_layer_columns(
+    layer: str = Query(..., description="Layer name (e.g., 'metastring:gbif')"),
+    geo_service: GeoServerService = Depends(get_geo_service)
+):
+    result = await geo_service.get_layer_columns_async(layer)
+    return result
+
+async def _relay_body(response: httpx.Response) -> AsyncIterator[bytes]:
+    """
+    Yield an upstream response body and always close the upstream response,
+    also when the client disconnects and the streaming is cancelled midway
+    (a BackgroundTask would not run then and the connection would leak).
+    """
     try:
-        result = geo_service.get_layer_columns(layer)
-        return result
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        async for chunk in response.aiter_bytes():
+            yield chunk
+    finally:
+        # Shielded: after a disconnect the surrounding scope is already cancelled
+        with anyio.CancelScope(shield=True):
+            await response.aclose()
+
 
 @router.get("/layer/data", summary="Get Layer Feature Data", description="Retrieve actual feature data from a layer via WFS (Web Feature Service). This endpoint allows you to fetch geographic features with optional filtering, bounding box constraints, and property selection.")
 async def get_layer_data(
@@ -338,7 +476,8 @@ async def get_layer_data(
     maxFeatures: int = Query(100, description="Maximum number of features to return (default: 100)"),
     bbox: str = Query(None, description="Bounding box filter in format 'minx,miny,maxx,maxy'"),
     filter: str = Query(None, description="CQL filter expression for attribute-based filtering"),
-    properties: str = Query(None, description="Comma-separated list of property names to return (if not specified, all properties are returned)")
+    properties: str = Query(None, description="Comma-separated list of property names to return (if not specified, all properties are returned)"),
+    geo_service: GeoServerService = Depends(get_geo_service)
 ):
     """
     Return feature data for a layer via WFS with optional bbox/filter and maxFeatures.
@@ -351,22 +490,22 @@ async def get_layer_data(
     
     Returns features in GeoJSON format with geometry and attributes.
     """
-    try:
-        response = geo_service.get_layer_data(
-            layer,
-            max_features=maxFeatures,
-            bbox=bbox,
-            filter_query=filter,
-            properties=properties,
-        )
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await geo_service.stream_layer_data(
+        layer,
+        max_features=maxFeatures,
+        bbox=bbox,
+        filter_query=filter,
+        properties=properties,
+    )
+    if response.status_code != 200:
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+
+    # Relay the GeoJSON bytes as they arrive instead of buffering the whole payload
+    return StreamingResponse(_relay_body(response), media_type="application/json")
 
 
 @router.post("/upload_logs/{log_id}/publish (Used for internal api calls)", response_model=PublishUploadLogResponse, summary="Publish Upload Log to GeoServer", description="Publish a previously uploaded file (stored in upload logs) to GeoServer as a layer. This endpoint takes an upload log ID and publishes the associated file to the specified GeoServer workspace and datastore. It is used for internal api calls")
@@ -374,6 +513,7 @@ async def publish_upload_log(
     log_id: int,
     request: PublishUploadLogRequest,
     db: Session = Depends(get_db),
+    geo_service: GeoServerService = Depends(get_geo_service),
 ):
     """
     Publish a stored upload log to GeoServer.
@@ -384,7 +524,9 @@ async def publish_upload_log(
     spatial data format (e.g., shapefile).
     """
     try:
-        return geo_service.publish_upload_log(log_id, request, db)
+        result = await geo_service.publish_upload_log(log_id, request, db)
+        await invalidate_rest_cache("datastores", "layers")
+        return result
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except ValueError as exc:
@@ -393,5 +535,3 @@ async def publish_upload_log(
         raise HTTPException(status_code=status_code, detail=detail) from exc
     except RuntimeError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
@@ -0,0 +1,256 @@
+import os
+from typing import AsyncIterator, Optional
+import aiofiles
+import httpx
+import orjson
+from utils.config import geoserver_max_inflight
+from utils.errors import InvalidRequestError
+from utils.http import ASYNC_SLOW_TIMEOUT, BoundedAsyncTransport
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Fixed parts of the OWS requests; per-call values are merged in on top
+WFS_GET_FEATURE_PARAMS = {
+    "service": "WFS",
+    "version": "1.1.0",
+    "request": "GetFeature",
+    "outputFormat": "application/json",
+}
+WMS_GET_CAPABILITIES_PARAMS = {"service": "WMS", "version": "1.1.1", "request": "GetCapabilities"}
+
+# Connection parameters shared by every PostGIS datastore we create
+_POSTGIS_FIXED_ENTRIES = (
+    {"@key": "dbtype", "$": "postgis"},
+    {"@key": "validate connections", "$": "true"},
+    {"@key": "max connections", "$": "10"},
+    {"@key": "min connections", "$": "1"},
+)
+
+
+def postgis_datastore_payload(
+    store_name: str,
+    database: str,
+    host: str,
+    port: int,
+    username: str,
+    password: str,
+    schema: str = "public",
+    description: str = None,
+    enabled: bool = True
+) -> bytes:
+    """
+    Serialized JSON body for creating a PostGIS datastore through the REST API.
+    """
+    data_store = {
+        "name": store_name,
+        "type": "PostGIS",
+        "enabled": enabled,
+        "connectionParameters": {
+            "entry": [
+                {"@key": "database", "$": database},
+                {"@key": "host", "$": host},
+                {"@key": "port", "$": str(port)},
+                {"@key": "user", "$": username},
+                {"@key": "passwd", "$": password},
+                {"@key": "schema", "$": schema},
+                *_POSTGIS_FIXED_ENTRIES,
+            ]
+        },
+    }
+    if description:
+        data_store["description"] = description
+    return orjson.dumps({"dataStore": data_store})
+
+
+class AsyncGeoServerDAO:
+    """
+    Async counterpart of GeoServerDAO used by the FastAPI handlers.
+
+    All calls share one pooled httpx.AsyncClient so concurrent requests reuse
+    keep-alive connections instead of blocking the event loop on `requests`.
+    The client is opened/closed by the application lifespan (see main.py) and
+    created lazily if a call happens outside of it.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        password: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 50,
+        timeout: float = 10,
+        max_inflight: int = geoserver_max_inflight,
+    ):
+        self.base_url = base_url
+        self.auth = (username, password)
+        # OWS endpoints live next to /rest, e.g. /geoserver/wms and /geoserver/wfs
+        self.wms_url = f"{base_url.removesuffix('/rest')}/wms"
+        self.wfs_url = f"{base_url.removesuffix('/rest')}/wfs"
+        self.limits = httpx.Limits(
+            max_keepalive_connections=max_keepalive_connections,
+            max_connections=max_connections,
+        )
+        self.timeout = timeout
+        self.max_inflight = max_inflight
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                auth=self.auth,
+                transport=BoundedAsyncTransport(self.max_inflight, limits=self.limits),
+                timeout=self.timeout,
+            )
+        return self._client
+
+    async def open(self):
+        """
+        Create the shared connection pool.
+        """
+        return self.client
+
+    async def aclose(self):
+        """
+        Close the shared connection pool.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_version(self):
+        """
+        Fetch GeoServer version info; cheap enough to use as a connectivity check.
+        """
+        return await self.client.get("/about/version")
+
+    async def upload_shapefile(self, workspace: str, store_name: str, file_path: str):
+        """
+        Upload a zipped shapefile to GeoServer, streaming it from disk.
+        """
+        if not file_path.lower().endswith(".zip"):
+            raise InvalidRequestError("Shapefile must be provided as a .zip archive.")
+
+        async def file_chunks():
+            async with aiofiles.open(file_path, "rb") as f:
+                while chunk := await f.read(CHUNK_SIZE):
+                    yield chunk
+
+        # Known length: GeoServer does not handle chunked upload bodies
+        return await self.upload_shapefile_stream(
+            workspace, store_name, file_chunks(), size=os.path.getsize(file_path)
+        )
+
+    async def upload_shapefile_stream(
+        self,
+        workspace: str,
+        store_name: str,
+        chunks: AsyncIterator[bytes],
+        size: Optional[int] = None
+    ):
+        """
+        Upload a zipped shapefile to GeoServer from an async byte stream,
+        without holding the whole archive in memory.
+        """
+        headers = {"Content-type": "application/zip"}
+        if size is not None:
+            headers["Content-Length"] = str(size)
+        return await self.client.put(
+            f"/workspaces/{workspace}/datastores/{store_name}/file.shp",
+            content=chunks,
+            headers=headers,
+            params={"configure": "first"},
+            timeout=ASYNC_SLOW_TIMEOUT,
+        )
+
+    async def upload_postgis(
+        self,
+        workspace: str,
+        store_name: str,
+        database: str,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        schema: str = "public",
+        description: str = None,
+        enabled: bool = True
+    ):
+        """
+        Create a PostGIS datastore in GeoServer.
+        """
+        data_store_config = postgis_datastore_payload(
+            store_name, database, host, port, username, password, schema, description, enabled
+        )
+
+        return await self.client.post(
+            f"/workspaces/{workspace}/datastores",
+            content=data_store_config,
+            headers={"Content-type": "application/json"},
+            timeout=ASYNC_SLOW_TIMEOUT,
+        )
+
+    async def list_layers(self):
+        """
+        List every layer in the catalog. Slow on large installs; prefer
+        list_layers_in_workspace when the workspace is known.
+        """
+        return await self.client.get("/layers.json", headers={"Accept": "application/json"})
+
+    async def list_layers_in_workspace(self, workspace: str):
+        return await self.client.get(
+            f"/workspaces/{workspace}/layers.json", headers={"Accept": "application/json"}
+        )
+
+    async def get_layer_details(self, layer: str):
+        return await self.client.get(f"/layers/{layer}.json", headers={"Accept": "application/json"})
+
+    def _wfs_get_feature(
+        self,
+        layer: str,
+        bbox: str = None,
+        filter_query: str = None,
+        max_features: int = None,
+        property_names: str = None
+    ) -> httpx.Request:
+        params = {**WFS_GET_FEATURE_PARAMS, "typeName": layer}
+        if bbox:
+            params["bbox"] = bbox
+        if filter_query:
+            params["CQL_FILTER"] = filter_query
+        if max_features is not None:
+            params["maxFeatures"] = str(max_features)
+        if property_names:
+            params["propertyName"] = property_names
+
+        return self.client.build_request("GET", self.wfs_url, params=params)
+
+    async def stream_features(
+        self,
+        layer: str,
+        bbox: str = None,
+        filter_query: str = None,
+        max_features: int = None,
+        property_names: str = None
+    ) -> httpx.Response:
+        """
+        Query features from the WFS service, returning as soon as the headers
+        arrive without reading the body. The caller must consume it (aiter_bytes/aread) and
+        then call aclose() on the response.
+        """
+        request = self._wfs_get_feature(layer, bbox, filter_query, max_features, property_names)
+        return await self.client.send(request, stream=True)
+
+    async def get_wms_capabilities(self):
+        """
+        Fetch the WMS 1.1.1 capabilities document (every published layer with its bbox).
+        """
+        return await self.client.get(self.wms_url, params=WMS_GET_CAPABILITIES_PARAMS)
+
+    async def get_url(self, url: str):
+        """
+        Perform an authenticated GET to an absolute GeoServer REST URL.
+        """
+        return await self.client.get(url)
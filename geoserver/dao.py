@@ -1,31 +1,334 @@
+import functools
 import os
-import tempfile
+import time
+import struct
 import zipfile
-from urllib.parse import urlencode
+import zlib
+from types import MappingProxyType
+from urllib.parse import quote_plus, urlencode
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+import orjson
 import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from geoserver.async_dao import CHUNK_SIZE, WFS_GET_FEATURE_PARAMS, postgis_datastore_payload
+from urllib3.util.retry import Retry
+from utils.config import geoserver_cache_ttl
+from utils.errors import InvalidRequestError
+from utils.http import DEFAULT_TIMEOUT, SLOW_TIMEOUT, CircuitBreakerHTTPAdapter, Timeout
+
+
+def _response_from(url: str, status_code: int, content: bytes, headers: Dict[str, str]) -> requests.Response:
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response._content = content
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    return response
+
+
+def _conditional_headers(headers) -> Dict[str, str]:
+    conditional = {}
+    etag = headers.get("ETag")
+    if etag:
+        conditional["If-None-Match"] = etag
+    last_modified = headers.get("Last-Modified")
+    if last_modified:
+        conditional["If-Modified-Since"] = last_modified
+    return conditional
+
+
+def _open_for_upload(file_path: str):
+    # One open() instead of exists() + open(): no extra stat, no race in between
+    try:
+        return open(file_path, "rb")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {file_path}") from None
+
+
+# Shared request headers; requests copies them into each request, never mutates them
+_ZIP_HEADERS = MappingProxyType({"Content-type": "application/zip"})
+_SLD_HEADERS = MappingProxyType({"Content-type": "application/vnd.ogc.sld+xml"})
+_JSON_HEADERS = MappingProxyType({"Content-type": "application/json"})
+_MBSTYLE_HEADERS = MappingProxyType({"Content-type": "application/vnd.geoserver.mbstyle+json"})
+_ACCEPT_JSON_HEADERS = MappingProxyType({"Accept": "application/json"})
+
+
+# Map EPSG codes to GeoWebCache gridset names
+# GeoWebCache uses 'WebMercatorQuad' for EPSG:3857 (Web Mercator)
+GWC_GRIDSETS = {
+    3857: "WebMercatorQuad",
+    900913: "WebMercatorQuad",  # Google's alternate code for Web Mercator
+    4326: "EPSG:4326",  # EPSG:4326 is used directly
+}
+
+class _StoredZip:
+    """
+    Uncompressed zip archive of `files` ((path, arcname) pairs), iterated in
+    roughly CHUNK_SIZE pieces while each file is read, with its total length
+    known before the first byte is sent so uploads carry a Content-Length.
+
+    Java's ZipInputStream (GeoServer) rejects data descriptors on stored
+    entries, so every local header holds the entry's size and CRC. Those CRCs
+    are computed when the archive is built, which reads each file twice: once
+    here and once while it is streamed (normally from the page cache).
+    Shapefile components are limited to 2 GB, so zip64 is not supported.
+    """
+
+    def __init__(self, files: List[Tuple[str, str]]):
+        self._entries: List[Tuple[str, zipfile.ZipInfo, bytes, int]] = []
+        offset = 0
+        for path, arcname in files:
+            zinfo = zipfile.ZipInfo.from_file(path, arcname)
+            name, flags = self._encode_name(zinfo.filename)
+            self._entries.append((path, zinfo, name, flags))
+            zinfo.header_offset = offset
+            zinfo.CRC = self._crc32(path)
+            offset += zipfile.sizeFileHeader + len(name) + zinfo.file_size
+        self._central_directory_offset = offset
+        self._central_directory_size = sum(
+            zipfile.sizeCentralDir + len(name) for _, _, name, _ in self._entries
+        )
+        self._length = offset + self._central_directory_size + zipfile.sizeEndCentDir
+        if self._length > zipfile.ZIP64_LIMIT or len(self._entries) > 0xFFFF:
+            raise InvalidRequestError("Shapefile components are too large to zip for upload")
+
+    def __len__(self) -> int:
+        # requests sets Content-Length from this rather than sending it chunked
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        for path, zinfo, name, flags in self._entries:
+            yield self._local_header(zinfo, name, flags)
+            crc = 0
+            size = 0
+            with open(path, "rb") as src:
+                while chunk := src.read(CHUNK_SIZE):
+                    crc = zlib.crc32(chunk, crc)
+                    size += len(chunk)
+                    yield chunk
+            if crc != zinfo.CRC or size != zinfo.file_size:
+                raise ValueError(f"{path} changed while it was being zipped")
+        yield b"".join(
+            self._central_directory_header(zinfo, name, flags)
+            for _, zinfo, name, flags in self._entries
+        ) + self._end_record()
+
+    def close(self):
+        # Files are only open while being iterated; nothing to release here
+        pass
+
+    @staticmethod
+    def _crc32(path: str) -> int:
+        crc = 0
+        with open(path, "rb") as src:
+            while chunk := src.read(CHUNK_SIZE):
+                crc = zlib.crc32(chunk, crc)
+        return crc
+
+    @staticmethod
+    def _encode_name(filename: str) -> Tuple[bytes, int]:
+        try:
+            return filename.encode("ascii"), 0
+        except UnicodeEncodeError:
+            return filename.encode("utf-8"), 0x800  # language encoding flag: UTF-8 name
+
+    @staticmethod
+    def _dos_date_time(zinfo: zipfile.ZipInfo) -> Tuple[int, int]:
+        year, month, day, hour, minute, second = zinfo.date_time
+        return (year - 1980) << 9 | month << 5 | day, hour << 11 | minute << 5 | second // 2
+
+    def _local_header(self, zinfo: zipfile.ZipInfo, name: bytes, flags: int) -> bytes:
+        dosdate, dostime = self._dos_date_time(zinfo)
+        return struct.pack(
+            zipfile.structFileHeader, zipfile.stringFileHeader,
+            zipfile.DEFAULT_VERSION, 0, flags, zipfile.ZIP_STORED, dostime, dosdate,
+            zinfo.CRC, zinfo.file_size, zinfo.file_size, len(name), 0,
+        ) + name
+
+    def _central_directory_header(self, zinfo: zipfile.ZipInfo, name: bytes, flags: int) -> bytes:
+        dosdate, dostime = self._dos_date_time(zinfo)
+        return struct.pack(
+            zipfile.structCentralDir, zipfile.stringCentralDir,
+            zipfile.DEFAULT_VERSION, zinfo.create_system, zipfile.DEFAULT_VERSION, 0,
+            flags, zipfile.ZIP_STORED, dostime, dosdate,
+            zinfo.CRC, zinfo.file_size, zinfo.file_size, len(name), 0, 0, 0, 0,
+            zinfo.external_attr, zinfo.header_offset,
+        ) + name
+
+    def _end_record(self) -> bytes:
+        count = len(self._entries)
+        return struct.pack(
+            zipfile.structEndArchive, zipfile.stringEndArchive, 0, 0, count, count,
+            self._central_directory_size, self._central_directory_offset, 0,
+        )
+
+
+# Relative WMS URL for the CML frontend (it prepends the endpoint and replaces
+# the bbox placeholder); only the trailing layers value varies per layer
+_CML_TILE_URL_PREFIX = "/wms?" + urlencode({
+    "bbox": "{bbox-epsg-3857}",
+    "format": "image/png",
+    "service": "WMS",
+    "version": "1.1.1",
+    "request": "GetMap",
+    "srs": "EPSG:3857",
+    "width": "256",
+    "height": "256",
+    "transparent": "true",
+}) + "&layers="
+
+
+# Per-layer parts of the tile URLs, memoized at module level (not on the DAO,
+# so the cache holds only strings); tile proxies ask for the same few layers
+@functools.lru_cache(maxsize=2048)
+def _cml_layers_param(layer: str) -> str:
+    # "metastring:gbif" -> "biodiv%3Agbif": the frontend expects the biodiv workspace
+    return quote_plus(f"biodiv:{layer.rpartition(':')[2]}", safe="")
+
+
+@functools.lru_cache(maxsize=2048)
+def _vectortile_path(layer: str, epsg: int) -> str:
+    # GeoWebCache names gridsets (e.g. 'WebMercatorQuad' for EPSG:3857) rather
+    # than using EPSG codes, defaulting to EPSG:{code}. {-y} is the inverted TMS
+    # row; the layer is used as-is (GeoServer TMS handles ":" in layer names)
+    gridset_name = GWC_GRIDSETS.get(epsg) or f"EPSG:{epsg}"
+    return f"/{layer}@{gridset_name}@pbf/{{z}}/{{x}}/{{-y}}.pbf"
 
 
 class GeoServerDAO:
-    def __init__(self, base_url: str, username: str, password: str):
-        self.base_url = base_url
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        password: str,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        catalog_cache_ttl: int = geoserver_cache_ttl,
+        catalog_cache_size: int = 1024,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.workspaces_url = f"{self.base_url}/workspaces"
         self.auth = (username, password)
+        self.timeout = timeout
+
+        # Short-lived cache of catalog GETs (layers, styles) keyed by URL. Only
+        # (status, body, headers) are kept; each hit gets a fresh Response.
+        # Expired entries are revalidated with If-None-Match/If-Modified-Since.
+        # This DAO's own writes clear it; see clear_catalog_cache.
+        self.catalog_cache_ttl = catalog_cache_ttl
+        self.catalog_cache_size = catalog_cache_size
+        self._catalog_cache: Dict[str, Tuple[float, int, bytes, Dict[str, str]]] = {}
+
+        # Keep-alive session shared by every call; auth is set once here and
+        # every call gets self.timeout unless it passes its own. Gateway errors
+        # are retried for GET/DELETE only: upload bodies are streamed from disk
+        # and could not be replayed.
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        adapter = CircuitBreakerHTTPAdapter(
+            timeout=timeout,
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=frozenset({"GET", "HEAD", "OPTIONS", "DELETE"}),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # OWS endpoints live next to /rest, e.g. /geoserver/wms and /geoserver/wfs
+        self.ows_base = self.base_url.removesuffix("/rest")
+        self.wms_url = f"{self.ows_base}/wms"
+        self.wfs_url = f"{self.ows_base}/wfs"
+        self.gwc_tms_url = f"{self.ows_base}/gwc/service/tms/1.0.0"
+
+        # Everything but the layer name is fixed, so the WMS tile URL is encoded
+        # once here and get_tile_layer_url only has to quote the layer
+        self._tile_url_prefix = self.wms_url + "?" + urlencode({
+            "service": "WMS",
+            "version": "1.1.1",
+            "request": "GetMap",
+        }) + "&layers="
+        self._tile_url_suffix = "&" + urlencode({
+            "styles": "",
+            "bbox": "-180,-90,180,90",  # Change this to your actual dataset extent
+            "width": "256",
+            "height": "256",
+            "srs": "EPSG:4326",
+            "format": "image/png",
+            "transparent": "true"
+        })
+
+    def close(self):
+        """
+        Close the pooled connections.
+        """
+        self.session.close()
+
+    def clear_catalog_cache(self):
+        self._catalog_cache.clear()
+
+    def _cached_get(self, url: str, headers: Optional[Mapping[str, str]] = None) -> requests.Response:
+        entry = self._catalog_cache.get(url)
+        if entry is not None and entry[0] > time.monotonic():
+            return _response_from(url, *entry[1:])
+
+        # Expired entries are revalidated with a conditional GET when GeoServer
+        # sent a validator; a 304 reuses the stored body
+        conditional = _conditional_headers(entry[3]) if entry is not None else {}
+        response = self.session.get(url, headers={**(headers or {}), **conditional})
+        if response.status_code == 304 and entry is not None:
+            self._catalog_cache[url] = (time.monotonic() + self.catalog_cache_ttl, *entry[1:])
+            return _response_from(url, *entry[1:])
+
+        if response.status_code == 200 and (self.catalog_cache_ttl > 0 or _conditional_headers(response.headers)):
+            if len(self._catalog_cache) >= self.catalog_cache_size:
+                now = time.monotonic()
+                self._catalog_cache = {k: v for k, v in self._catalog_cache.items() if v[0] > now}
+                if len(self._catalog_cache) >= self.catalog_cache_size:
+                    self._catalog_cache.clear()
+            self._catalog_cache[url] = (
+                time.monotonic() + self.catalog_cache_ttl,
+                response.status_code,
+                response.content,
+                dict(response.headers),
+            )
+        else:
+            self._catalog_cache.pop(url, None)
+        return response
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     def upload_shapefile(self, workspace: str, store_name: str, file_path: str):
         """
         Upload a shapefile to GeoServer.
-        """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
 
-        url = f"{self.base_url}/workspaces/{workspace}/datastores/{store_name}/file.shp"
-        headers = {"Content-type": "application/zip"}
+        Loose .shp files are zipped with their sidecars on the fly while the
+        request body is being sent (see _StoredZip), so zipping and uploading
+        overlap and nothing is buffered on disk. Entries are stored uncompressed,
+        since GeoServer is on the local network and would only inflate them
+        again, which also gives the archive a known length.
+        """
+        url = f"{self.workspaces_url}/{workspace}/datastores/{store_name}/file.shp"
+        headers = _ZIP_HEADERS
 
         # Determine whether the provided path is a zip archive or a loose shapefile
-        cleanup_path = None
-        upload_path = file_path
-
         if file_path.lower().endswith('.zip'):
-            upload_path = file_path
+            body = _open_for_upload(file_path)
+            # Stream the archive itself with a known length rather than chunked
+            # transfer encoding, which GeoServer's upload handling does not expect
+            size = body.seek(0, os.SEEK_END)
+            body.seek(0)
+            headers = {**_ZIP_HEADERS, "Content-Length": str(size)}
         elif file_path.lower().endswith('.shp'):
             base_name, _ = os.path.splitext(file_path)
             directory = os.path.dirname(file_path) or "."
@@ -35,39 +338,35 @@ class GeoServerDAO:
             required_extensions = ['.shp', '.shx', '.dbf']
             matching_files = []
             available_extensions = set()
-            for filename in os.listdir(directory):
-                file_full_path = os.path.join(directory, filename)
-                if not os.path.isfile(file_full_path):
-                    continue
-                name_root, ext = os.path.splitext(filename)
-                if name_root.lower() == basename_lower and ext.lower() != '.zip':
-                    matching_files.append(filename)
-                    available_extensions.add(ext.lower())
-
+            # scandir exposes the file type from the directory listing itself,
+            # so unrelated entries cost no extra stat() call
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name_root, ext = os.path.splitext(entry.name)
+                    if name_root.lower() != basename_lower:
+                        continue
+                    ext_lower = ext.lower()
+                    if ext_lower != '.zip' and entry.is_file():
+                        matching_files.append(entry.name)
+                        available_extensions.add(ext_lower)
+
+            if '.shp' not in available_extensions:
+                raise FileNotFoundError(f"File not found: {file_path}")
             missing_components = [
                 ext for ext in required_extensions if ext not in available_extensions
             ]
             if missing_components:
                 missing_str = ', '.join(missing_components)
-                raise ValueError(
+                raise InvalidRequestError(
                     f"Missing required shapefile component(s) for '{file_path}': {missing_str}"
                 )
 
-            fd, temp_zip_path = tempfile.mkstemp(suffix=".zip")
-            os.close(fd)
-            try:
-                with zipfile.ZipFile(temp_zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for filename in matching_files:
-                        file_to_add = os.path.join(directory, filename)
-                        zipf.write(file_to_add, arcname=filename)
-                upload_path = temp_zip_path
-                cleanup_path = temp_zip_path
-            except Exception:
-                if os.path.exists(temp_zip_path):
-                    os.remove(temp_zip_path)
-                raise
+            # Sized iterable: requests sends it with a Content-Length, not chunked
+            body = _StoredZip(
+                [(os.path.join(directory, filename), filename) for filename in matching_files]
+            )
         else:
-            raise ValueError(
+            raise InvalidRequestError(
                 "Shapefile must be provided as a .zip archive or a .shp file "
                 "with accompanying components."
             )
@@ -77,27 +376,25 @@ class GeoServerDAO:
             # configure=first: configure only the first feature type found (more reliable than configure=all)
             # If configure=first doesn't work, we'll explicitly create the feature type after upload
             params = {"configure": "first"}
-            with open(upload_path, "rb") as f:
-                response = requests.put(url, auth=self.auth, data=f, headers=headers, params=params)
+            response = self.session.put(
+                url, data=body, headers=headers, params=params, timeout=SLOW_TIMEOUT
+            )
         finally:
-            if cleanup_path and os.path.exists(cleanup_path):
-                os.remove(cleanup_path)
+            body.close()
+        self.clear_catalog_cache()
         return response
 
     def upload_style(self, workspace: str, style_name: str, file_path: str):
         """
         Upload a style (SLD file) to GeoServer.
         """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        url = f"{self.base_url}/workspaces/{workspace}/styles"
-        headers = {"Content-type": "application/vnd.ogc.sld+xml"}
-        with open(file_path, "rb") as f:
-            data = f.read()
-        response = requests.post(
-            url, auth=self.auth, data=data, headers=headers, params={"name": style_name}
-        )
+        url = f"{self.workspaces_url}/{workspace}/styles"
+        headers = _SLD_HEADERS
+        with _open_for_upload(file_path) as f:
+            response = self.session.post(
+                url, data=f, headers=headers, params={"name": style_name}
+            )
+        self.clear_catalog_cache()
         return response
 
     def upload_postgis(
@@ -116,69 +413,43 @@ class GeoServerDAO:
         """
         Create a PostGIS datastore in GeoServer.
         """
-        url = f"{self.base_url}/workspaces/{workspace}/datastores"
-        headers = {"Content-type": "application/json"}
-
-        data_store_config = {
-            "dataStore": {
-                "name": store_name,
-                "type": "PostGIS",
-                "enabled": enabled,
-                "connectionParameters": {
-                    "entry": [
-                        {"@key": "database", "$": database},
-                        {"@key": "host", "$": host},
-                        {"@key": "port", "$": str(port)},
-                        {"@key": "user", "$": username},
-                        {"@key": "passwd", "$": password},
-                        {"@key": "schema", "$": schema},
-                        {"@key": "dbtype", "$": "postgis"},
-                        {"@key": "validate connections", "$": "true"},
-                        {"@key": "max connections", "$": "10"},
-                        {"@key": "min connections", "$": "1"}
-                    ]
-                }
-            }
-        }
+        url = f"{self.workspaces_url}/{workspace}/datastores"
+        headers = _JSON_HEADERS
 
-        if description:
-            data_store_config["dataStore"]["description"] = description
+        data_store_config = postgis_datastore_payload(
+            store_name, database, host, port, username, password, schema, description, enabled
+        )
 
-        response = requests.post(
-            url, auth=self.auth, json=data_store_config, headers=headers
+        response = self.session.post(
+            url, data=data_store_config, headers=headers
         )
+        self.clear_catalog_cache()
         return response
 
     def list_layers(self):
+        """
+        List every layer in the catalog. Slow on large installs; prefer
+        list_layers_in_workspace when the workspace is known.
+        """
         url = f"{self.base_url}/layers.json"
-        headers = {"Accept": "application/json"}
-        return requests.get(url, auth=self.auth, headers=headers)
+        headers = _ACCEPT_JSON_HEADERS
+        return self._cached_get(url, headers=headers)
+
+    def list_layers_in_workspace(self, workspace: str):
+        url = f"{self.workspaces_url}/{workspace}/layers.json"
+        headers = _ACCEPT_JSON_HEADERS
+        return self._cached_get(url, headers=headers)
 
     def get_layer_details(self, layer: str):
         url = f"{self.base_url}/layers/{layer}.json"
-        headers = {"Accept": "application/json"}
-        return requests.get(url, auth=self.auth, headers=headers)
-
+        headers = _ACCEPT_JSON_HEADERS
+        return self._cached_get(url, headers=headers)
 
     def get_tile_layer_url(self, layer: str):
         """
         Construct a WMS URL for fetching the tile layer.
         """
-        wms_url = self.base_url.replace("/rest", "") + "/wms"  # WMS endpoint
-        params = {
-            "service": "WMS",
-            "version": "1.1.1",
-            "request": "GetMap",
-            "layers": layer,
-            "styles": "",
-            "bbox": "-180,-90,180,90",  # Change this to your actual dataset extent
-            "width": "256",
-            "height": "256",
-            "srs": "EPSG:4326",
-            "format": "image/png",
-            "transparent": "true"
-        }
-        return wms_url + "?" + urlencode(params)
+        return f"{self._tile_url_prefix}{quote_plus(layer, safe='')}{self._tile_url_suffix}"
 
     def get_tile_layer_url_cml(self, layer: str):
         """
@@ -188,27 +459,8 @@ class GeoServerDAO:
         version=1.1.1&request=GetMap&srs=EPSG:3857&width=256&height=256&
         transparent=true&layers=biodiv:${layer_name}
         """
-        # Extract layer name from workspace:layer format
-        # (e.g., "metastring:gbif" -> "gbif")
-        layer_name = layer.split(":")[-1] if ":" in layer else layer
-
-        # Prepend "biodiv:" prefix as expected by frontend
-        layers_param = f"biodiv:{layer_name}"
-
-        # Construct relative WMS URL path (frontend will prepend the endpoint)
-        params = {
-            "bbox": "{bbox-epsg-3857}",  # Placeholder for frontend to replace
-            "format": "image/png",
-            "service": "WMS",
-            "version": "1.1.1",
-            "request": "GetMap",
-            "srs": "EPSG:3857",
-            "width": "256",
-            "height": "256",
-            "transparent": "true",
-            "layers": layers_param
-        }
-        return "/wms?" + urlencode(params)
+        # Everything before the layers param is fixed and encoded once at import
+        return _CML_TILE_URL_PREFIX + _cml_layers_param(layer)
 
     def query_features(
         self,
@@ -221,14 +473,7 @@ class GeoServerDAO:
         """
         Query features from a GeoServer WFS service.
         """
-        wfs_url = self.base_url.replace("/rest", "") + "/wfs"  # WFS endpoint
-        params = {
-            "service": "WFS",
-            "version": "1.1.0",
-            "request": "GetFeature",
-            "typeName": layer,
-            "outputFormat": "application/json",
-        }
+        params = {**WFS_GET_FEATURE_PARAMS, "typeName": layer}
         if bbox:
             params["bbox"] = bbox
         if filter_query:
@@ -239,21 +484,21 @@ class GeoServerDAO:
             # Comma-separated list of attribute names
             params["propertyName"] = property_names
 
-        return requests.get(wfs_url, params=params, auth=self.auth)
+        return self.session.get(self.wfs_url, params=params)
 
     def list_styles(self):
         """
         List all styles in GeoServer.
         """
         url = f"{self.base_url}/styles.json"
-        return requests.get(url, auth=self.auth)
+        return self._cached_get(url)
 
     def get_style_details(self, style_name: str):
         """
         Get details of a specific style.
         """
         url = f"{self.base_url}/styles/{style_name}.json"
-        return requests.get(url, auth=self.auth)
+        return self._cached_get(url)
 
     def create_mbstyle(self, workspace: str, style_name: str, style_content: str):
         """
@@ -267,28 +512,30 @@ class GeoServerDAO:
         Returns:
             Response object from GeoServer REST API
         """
-        url = f"{self.base_url}/workspaces/{workspace}/styles"
-        headers = {"Content-type": "application/vnd.geoserver.mbstyle+json"}
+        url = f"{self.workspaces_url}/{workspace}/styles"
+        headers = _MBSTYLE_HEADERS
+        # Encode once for both attempts; a str body would be re-encoded per
+        # request (as latin-1 by http.client)
+        body = style_content.encode("utf-8")
         
         # First, try to create the style
-        response = requests.post(
+        response = self.session.post(
             url,
-            auth=self.auth,
-            data=style_content,
+            data=body,
             headers=headers,
             params={"name": style_name}
         )
         
         # If style already exists (409), update it instead
         if response.status_code == 409:
-            update_url = f"{self.base_url}/workspaces/{workspace}/styles/{style_name}"
-            response = requests.put(
+            update_url = f"{self.workspaces_url}/{workspace}/styles/{style_name}"
+            response = self.session.put(
                 update_url,
-                auth=self.auth,
-                data=style_content,
+                data=body,
                 headers=headers
             )
         
+        self.clear_catalog_cache()
         return response
 
     def set_layer_default_style(self, workspace: str, layer_name: str, style_name: str):
@@ -304,7 +551,7 @@ class GeoServerDAO:
             Response object from GeoServer REST API
         """
         url = f"{self.base_url}/layers/{workspace}:{layer_name}"
-        headers = {"Content-type": "application/json"}
+        headers = _JSON_HEADERS
         
         data = {
             "layer": {
@@ -314,20 +561,20 @@ class GeoServerDAO:
             }
         }
         
-        response = requests.put(
+        response = self.session.put(
             url,
-            auth=self.auth,
-            json=data,
+            data=orjson.dumps(data),
             headers=headers
         )
         
+        self.clear_catalog_cache()
         return response
 
     def get_url(self, url: str):
         """
         Perform an authenticated GET to an absolute GeoServer REST URL.
         """
-        return requests.get(url, auth=self.auth)
+        return self.session.get(url)
 
     def get_vectortile_layer_url(self, layer: str, epsg: int = 3857):
         """
@@ -344,26 +591,5 @@ class GeoServerDAO:
         Note: GeoWebCache uses gridset names (like 'WebMercatorQuad' for EPSG:3857)
         instead of EPSG codes directly in the TMS URL.
         """
-        # Get base URL without /rest
-        base_url = self.base_url.replace("/rest", "")
-        
-        # Map EPSG codes to GeoWebCache gridset names
-        # GeoWebCache uses 'WebMercatorQuad' for EPSG:3857 (Web Mercator)
-        gridset_mapping = {
-            3857: "WebMercatorQuad",
-            900913: "WebMercatorQuad",  # Google's alternate code for Web Mercator
-            4326: "EPSG:4326",  # EPSG:4326 is used directly
-        }
-        
-        # Get the gridset name, defaulting to EPSG:{code} format if not in mapping
-        gridset_name = gridset_mapping.get(epsg, f"EPSG:{epsg}")
-        
-        # Construct vector tile URL template
-        # Format: /gwc/service/tms/1.0.0/{layer}@{gridSet}@pbf/{z}/{x}/{-y}.pbf
-        # Note: {-y} is used for TMS Y coordinate inversion
-        # The layer name is used as-is in the path (GeoServer TMS handles : in layer names)
-        # base_url already contains /geoserver, so we only add /gwc/...
-        tile_url_template = f"{base_url}/gwc/service/tms/1.0.0/{layer}@{gridset_name}@pbf/{{z}}/{{x}}/{{-y}}.pbf"
-        
-        return tile_url_template
+        return self.gwc_tms_url + _vectortile_path(layer, epsg)
 
@@ -1,7 +1,7 @@
-import re
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field, validator
 from upload_log.models.model import UploadLogOut
+from utils.validation import IDENTIFIER_RE
 
 
 class UploadRequest(BaseModel):
@@ -20,7 +20,7 @@ class UploadRequest(BaseModel):
 
     @validator('workspace')
     def validate_workspace(cls, v):
-        if not re.match(r'^[a-zA-Z0-9_-]+$', v):
+        if not IDENTIFIER_RE.fullmatch(v):
             raise ValueError(
                 'workspace must contain only letters, numbers, underscores, and hyphens'
             )
@@ -31,17 +31,17 @@ class PostGISRequest(BaseModel):
     workspace: str = Field(..., description="Target workspace in GeoServer")
     store_name: str = Field(..., description="Name of the PostGIS datastore")
     database: str = Field(..., description="PostgreSQL database name")
-    host: str = Field(..., description="Database host")
+    host: str = Field(..., min_length=1, description="Database host")
     port: int = Field(5432, ge=1, le=65535, description="Database port (1-65535)")
-    username: str = Field(..., description="Database username")
-    password: str = Field(..., description="Database password")
+    username: str = Field(..., min_length=1, description="Database username")
+    password: str = Field(..., min_length=1, description="Database password")
     db_schema: str = Field("public", description="Database schema")
     description: Optional[str] = Field(None, description="Optional description for the datastore")
     enabled: bool = Field(True, description="Whether the datastore is enabled")
 
     @validator('workspace')
     def validate_workspace(cls, v):
-        if not re.match(r'^[a-zA-Z0-9_-]+$', v):
+        if not IDENTIFIER_RE.fullmatch(v):
             raise ValueError(
                 'workspace must contain only letters, numbers, underscores, and hyphens'
             )
@@ -49,7 +49,7 @@ class PostGISRequest(BaseModel):
 
     @validator('store_name')
     def validate_store_name(cls, v):
-        if not re.match(r'^[a-zA-Z0-9_-]+$', v):
+        if not IDENTIFIER_RE.fullmatch(v):
             raise ValueError(
                 'store_name must contain only letters, numbers, underscores, and hyphens'
             )
@@ -57,7 +57,7 @@ class PostGISRequest(BaseModel):
 
     @validator('database')
     def validate_database(cls, v):
-        if not re.match(r'^[a-zA-Z0-9_-]+$', v):
+        if not IDENTIFIER_RE.fullmatch(v):
             raise ValueError(
                 'database must contain only letters, numbers, underscores, and hyphens'
             )
@@ -76,7 +76,7 @@ class CreateLayerRequest(BaseModel):
 
     @validator('workspace')
     def validate_workspace(cls, v):
-        if not re.match(r'^[a-zA-Z0-9_-]+$', v):
+        if not IDENTIFIER_RE.fullmatch(v):
             raise ValueError(
                 'workspace must contain only letters, numbers, underscores, and hyphens'
             )
@@ -84,7 +84,7 @@ class CreateLayerRequest(BaseModel):
 
     @validator('store_name')
     def validate_store_name(cls, v):
-        if not re.match(r'^[a-zA-Z0-9_-]+$', v):
+        if not IDENTIFIER_RE.fullmatch(v):
             raise ValueError(
                 'store_name must contain only letters, numbers, underscores, and hyphens'
             )
@@ -92,7 +92,7 @@ class CreateLayerRequest(BaseModel):
 
     @validator('table_name')
     def validate_table_name(cls, v):
-        if not re.match(r'^[a-zA-Z0-9_-]+$', v):
+        if not IDENTIFIER_RE.fullmatch(v):
             raise ValueError(
                 'table_name must contain only letters, numbers, underscores, and hyphens'
             )
@@ -105,7 +105,7 @@ class CreateWorkspaceRequest(BaseModel):
 
     @validator('workspace_name')
     def validate_workspace_name(cls, v):
-        if not re.match(r'^[a-zA-Z0-9_-]+$', v):
+        if not IDENTIFIER_RE.fullmatch(v):
             raise ValueError(
                 'workspace_name must contain only letters, numbers, underscores, and hyphens'
             )
@@ -132,7 +132,7 @@ class PublishUploadLogRequest(BaseModel):
     def validate_workspace(cls, value: str) -> str:
         if not value or not value.strip():
             raise ValueError('workspace must be provided')
-        if not re.match(r'^[a-zA-Z0-9_-]+$', value):
+        if not IDENTIFIER_RE.fullmatch(value):
             raise ValueError(
                 'workspace must contain only letters, numbers, underscores, and hyphens'
             )
@@ -1,60 +1,82 @@
+import asyncio
+import io
+import logging
 import os
-import shutil
-import tempfile
-from typing import List, Dict
+import time
+from xml.etree import ElementTree
+from typing import Any, List, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
+from geoserver.async_dao import CHUNK_SIZE, AsyncGeoServerDAO
 from geoserver.dao import GeoServerDAO
 from geoserver.model import CreateLayerRequest, PostGISRequest, PublishUploadLogRequest, PublishUploadLogResponse
 from upload_log.dao.dao import UploadLogDAO
 from upload_log.models.model import DataType, UploadLogOut
-from utils.config import DATASET_MAPPING
+from utils.errors import InvalidRequestError, UpstreamError
+from utils.http import decode_json
+from utils.config import DATASET_MAPPING, bbox_refresh_interval, geoserver_cache_ttl, geoserver_catalog_cache_ttl
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS_CACHE_SIZE = 512
+# Least time between capabilities reloads triggered by a request for an unknown layer
+_BBOX_RELOAD_MIN_INTERVAL = 60
+# How long a layer without a bbox (unknown, just deleted, ...) is remembered as such
+_BBOX_MISS_TTL = 30
+_BBOX_FALLBACK_SIZE = 1024
 
 
 class GeoServerService:
-    def __init__(self, dao: GeoServerDAO):
+    def __init__(self, dao: GeoServerDAO, async_dao: Optional[AsyncGeoServerDAO] = None):
         self.dao = dao
-
+        self.async_dao = async_dao or AsyncGeoServerDAO(
+            base_url=dao.base_url, username=dao.auth[0], password=dao.auth[1]
+        )
+        # Layer name -> bbox from the last WMS GetCapabilities; replaced wholesale
+        # by refresh_bbox_cache() (see refresh_bbox_cache_loop in geoserver/api.py)
+        self._bbox_cache: Dict[str, List[List[float]]] = {}
+        # Layer name -> (expires_at, bbox or None) for layers looked up one by one
+        # because capabilities didn't list them; misses expire sooner than hits
+        self._bbox_fallback: Dict[str, Tuple[float, Optional[List[List[float]]]]] = {}
+        # monotonic time of the last capabilities reload attempt
+        self._bbox_refreshed_at = float("-inf")
+        # Workspace (None for all) -> (expires_at, layer name/suffix -> layer name) for
+        # get_tile_urls_for_datasets; cleared whenever the "layers" group is invalidated
+        self._layer_index_cache: Dict[Optional[str], Tuple[float, Dict[str, str]]] = {}
+        # Layer -> (expires_at, {"columns": [...]}) for get_layer_columns; the style
+        # builders look columns up repeatedly and schemas rarely change
+        self._columns_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Layer -> feature type JSON href; outlives the columns TTL so a refresh
+        # needs one request instead of two (layer details, then feature type)
+        self._feature_type_hrefs: Dict[str, str] = {}
 
     async def upload_resource(self, workspace: str, store_name: str, resource_type: str, file):
         """
         Accept uploaded file from client and pass to DAO for GeoServer upload.
         """
         if resource_type != "shapefile":
-            raise ValueError(f"Unsupported resource type: {resource_type}")
+            raise InvalidRequestError(f"Unsupported resource type: {resource_type}")
 
-        # Save uploaded file temporarily
-        suffix = ".zip" if file.filename.endswith(".zip") else ""
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            shutil.copyfileobj(file.file, tmp)
-            tmp_path = tmp.name
+        if not file.filename or not file.filename.lower().endswith(".zip"):
+            raise InvalidRequestError("Shapefile must be provided as a .zip archive.")
 
-        # Upload to GeoServer
-        response = self.dao.upload_shapefile(workspace, store_name, tmp_path)
+        async def file_chunks():
+            while chunk := await file.read(CHUNK_SIZE):
+                yield chunk
 
-        # Clean up local temp file
+        # Stream the upload straight through to GeoServer
         try:
-            file.file.close()
+            return await self.async_dao.upload_shapefile_stream(
+                workspace, store_name, file_chunks(), size=file.size
+            )
         finally:
-            if tmp_path and os.path.exists(tmp_path):
-                os.remove(tmp_path)
-        return response
+            await file.close()
 
     async def upload_postgis(self, request: PostGISRequest):
         """
         Handle PostGIS datastore creation.
+        Required fields are enforced by PostGISRequest when it is parsed.
         """
-        if not request.store_name:
-            raise ValueError("Store name is required for PostGIS uploads.")
-        if not request.database:
-            raise ValueError("Database name is required for PostGIS uploads.")
-        if not request.host:
-            raise ValueError("Host is required for PostGIS uploads.")
-        if not request.username:
-            raise ValueError("Username is required for PostGIS uploads.")
-        if not request.password:
-            raise ValueError("Password is required for PostGIS uploads.")
-            
-        return self.dao.upload_postgis(
+        return await self.async_dao.upload_postgis(
             workspace=request.workspace,
             store_name=request.store_name,
             database=request.database,
@@ -67,13 +89,15 @@ class GeoServerService:
             enabled=request.enabled
         )
 
-    def publish_upload_log(
+    async def publish_upload_log(
         self,
         log_id: int,
         publish_request: PublishUploadLogRequest,
         db: Session,
     ) -> PublishUploadLogResponse:
-        record = UploadLogDAO.get_by_id(log_id, db)
+        # The Session is synchronous; its queries run in a worker thread so the
+        # event loop keeps serving other requests
+        record = await asyncio.to_thread(UploadLogDAO.get_by_id, log_id, db)
         if not record:
             raise ValueError(f"Upload log with id {log_id} not found")
 
@@ -85,23 +109,33 @@ class GeoServerService:
         store_name = publish_request.store_name or record.layer_name
         layer_name = publish_request.layer_name or record.layer_name
 
-        response = self.dao.upload_shapefile(workspace, store_name, file_path)
+        if file_path.lower().endswith(".zip"):
+            response = await self.async_dao.upload_shapefile(workspace, store_name, file_path)
+        else:
+            # Loose .shp files are zipped together with their sidecars by the sync DAO
+            response = await asyncio.to_thread(self.dao.upload_shapefile, workspace, store_name, file_path)
         if response.status_code not in (200, 201):
-            raise RuntimeError(
+            raise UpstreamError(
                 f"GeoServer upload failed with status {response.status_code}: {response.text}"
             )
 
-        record.geoserver_layer = layer_name
-        db.add(record)
-        db.commit()
-        db.refresh(record)
+        upload_log = await asyncio.to_thread(self._mark_published, record, layer_name, db)
 
         return PublishUploadLogResponse(
             message=f"Uploaded to GeoServer workspace '{workspace}' store '{store_name}'",
             status_code=response.status_code,
-            upload_log=self._convert_upload_log(record),
+            upload_log=upload_log,
         )
 
+    def _mark_published(self, record, layer_name: str, db: Session) -> UploadLogOut:
+        # The row is already loaded and nothing on it is generated on update, so the
+        # response is built before committing; commit() expires the instance, and
+        # reading it afterwards (or refresh()) would re-SELECT the whole row
+        record.geoserver_layer = layer_name
+        upload_log = self._convert_upload_log(record)
+        db.commit()
+        return upload_log
+
     def _convert_upload_log(self, record) -> UploadLogOut:
         try:
             data_type = DataType(record.data_type)
@@ -125,12 +159,24 @@ class GeoServerService:
     def list_layers(self):
         return self.dao.list_layers()
 
+    async def list_layers_async(self):
+        return await self.async_dao.list_layers()
+
     def get_layer_details(self, layer: str):
         return self.dao.get_layer_details(layer)
 
+    async def get_layer_details_async(self, layer: str):
+        return await self.async_dao.get_layer_details(layer)
+
     def get_tile_layer_url(self, layer: str):
         return self.dao.get_tile_layer_url(layer)
 
+    def get_tile_layer_urls(self, layers: List[str]) -> Dict[str, str]:
+        """
+        Tile URLs for many layers at once, keyed by layer name.
+        """
+        return {layer: self.get_tile_layer_url(layer) for layer in layers}
+
     def get_vectortile_layer_url(self, layer: str):
         return self.dao.get_vectortile_layer_url(layer)
 
@@ -148,40 +194,95 @@ class GeoServerService:
         Get details of a specific style.
         """
         if not style_name:
-            raise ValueError("Style name is required.")
+            raise InvalidRequestError("Style name is required.")
         return self.dao.get_style_details(style_name)
 
-
-    def get_tile_urls_for_datasets(self, datasets: List[str]) -> Dict[str, str]:
+    def get_tile_urls_for_datasets(self, datasets: List[str], workspace: Optional[str] = None) -> Dict[str, str]:
         """
         Resolve dataset names to existing GeoServer layer names and return tile URLs.
-        Strategy: fetch all layers, then for each dataset find a layer whose
-        name is exactly the dataset or ends with ":{dataset}". Return URL map.
+        Strategy: fetch all layers (only the given workspace's when one is passed),
+        then for each dataset find a layer whose name is exactly the dataset or
+        ends with ":{dataset}". Return URL map.
+        The layer index is kept for geoserver_cache_ttl seconds, so repeated
+        lookups with different datasets don't list the catalog again.
         """
-        response = self.dao.list_layers()
+        layer_index = self._cached_layer_index(workspace)
+        if layer_index is None:
+            if workspace:
+                response = self.dao.list_layers_in_workspace(workspace)
+            else:
+                response = self.dao.list_layers()
+            layer_index = self._store_layer_index(response, workspace)
+        return self._resolve_tile_urls(layer_index, datasets)
+
+    async def get_tile_urls_for_datasets_async(self, datasets: List[str], workspace: Optional[str] = None) -> Dict[str, str]:
+        layer_index = self._cached_layer_index(workspace)
+        if layer_index is None:
+            if workspace:
+                response = await self.async_dao.list_layers_in_workspace(workspace)
+            else:
+                response = await self.async_dao.list_layers()
+            layer_index = self._store_layer_index(response, workspace)
+        return self._resolve_tile_urls(layer_index, datasets)
+
+    def clear_layer_index_cache(self):
+        self._layer_index_cache = {}
+
+    def _cached_layer_index(self, workspace: Optional[str]) -> Optional[Dict[str, str]]:
+        entry = self._layer_index_cache.get(workspace)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def _store_layer_index(self, response, workspace: Optional[str] = None) -> Dict[str, str]:
         if response.status_code != 200:
-            raise ValueError(f"Failed to list layers: {response.text}")
-        data = response.json() or {}
+            raise UpstreamError(f"Failed to list layers: {response.text}", response.status_code)
+        data = decode_json(response) or {}
         layers = (data.get("layers") or {}).get("layer") or []
-        # Normalize to list of strings (names)
-        layer_names: List[str] = []
-        for item in layers:
-            if isinstance(item, dict) and "name" in item:
-                layer_names.append(item["name"])  # e.g., "ws:gbif"
-            elif isinstance(item, str):
-                layer_names.append(item)
+        # Normalize to list of strings (names), e.g. "ws:gbif". GeoServer sends
+        # {"name": ...} objects (or bare strings), so take the one-pass path and
+        # only check every item when an entry has no name
+        try:
+            layer_names: List[str] = [
+                item["name"] if type(item) is dict else item for item in layers
+            ]
+        except KeyError:
+            layer_names = [
+                item["name"] if isinstance(item, dict) else item
+                for item in layers
+                if (isinstance(item, dict) and "name" in item) or isinstance(item, str)
+            ]
+        if workspace:
+            # Workspace listings name layers without the "ws:" prefix
+            layer_names = [f"{workspace}:{name}" for name in layer_names]
 
+        # Index every layer under its full name and each ":"-suffix so each dataset
+        # resolves with one dict lookup; setdefault keeps the first layer in list order
+        layer_index: Dict[str, str] = {}
+        for lname in layer_names:
+            layer_index.setdefault(lname, lname)
+            rest = lname
+            while True:
+                _, sep, rest = rest.partition(":")
+                if not sep:
+                    break
+                layer_index.setdefault(rest, lname)
+
+        if geoserver_cache_ttl > 0:
+            self._layer_index_cache[workspace] = (time.monotonic() + geoserver_cache_ttl, layer_index)
+        return layer_index
+
+    def _resolve_tile_urls(self, layer_index: Dict[str, str], datasets: List[str]) -> Dict[str, str]:
+        # Bound once; the loop runs per requested dataset
+        mapping_get = DATASET_MAPPING.get
+        index_get = layer_index.get
+        tile_url = self.get_tile_layer_url
         results: Dict[str, str] = {}
         for ds in datasets:
             # Map frontend dataset name to actual layer/table name if provided
-            target = DATASET_MAPPING.get(ds, ds)
-            match = None
-            for lname in layer_names:
-                if lname == target or lname.endswith(f":{target}"):
-                    match = lname
-                    break
+            match = index_get(mapping_get(ds, ds))
             if match:
-                results[ds] = self.get_tile_layer_url(match)
+                results[ds] = tile_url(match)
             else:
                 results[ds] = ""  # Not found; caller can handle
         return results
@@ -191,21 +292,66 @@ class GeoServerService:
         Resolve a layer to its underlying feature type and return a simplified
         list of attribute definitions (columns).
         """
-        layer_details = self.dao.get_layer_details(layer)
+        columns = self._cached_columns(layer)
+        if columns is None:
+            href = self._feature_type_hrefs.get(layer)
+            ft_response = self.dao.get_url(href) if href else None
+            if ft_response is None or ft_response.status_code != 200:
+                # Unknown or stale href: resolve it from the layer again
+                href = self._feature_type_href(self.dao.get_layer_details(layer))
+                ft_response = self.dao.get_url(href)
+            self._feature_type_hrefs[layer] = href
+            columns = self._store_columns(layer, self._columns_from_feature_type(ft_response))
+        return columns
+
+    async def get_layer_columns_async(self, layer: str):
+        columns = self._cached_columns(layer)
+        if columns is None:
+            href = self._feature_type_hrefs.get(layer)
+            ft_response = await self.async_dao.get_url(href) if href else None
+            if ft_response is None or ft_response.status_code != 200:
+                href = self._feature_type_href(await self.async_dao.get_layer_details(layer))
+                ft_response = await self.async_dao.get_url(href)
+            self._feature_type_hrefs[layer] = href
+            columns = self._store_columns(layer, self._columns_from_feature_type(ft_response))
+        return columns
+
+    def clear_columns_cache(self):
+        self._columns_cache = {}
+        self._feature_type_hrefs = {}
+
+    def _cached_columns(self, layer: str) -> Optional[Dict[str, Any]]:
+        entry = self._columns_cache.get(layer)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def _store_columns(self, layer: str, columns: Dict[str, Any]) -> Dict[str, Any]:
+        if geoserver_catalog_cache_ttl > 0:
+            if len(self._columns_cache) >= _COLUMNS_CACHE_SIZE:
+                now = time.monotonic()
+                self._columns_cache = {k: v for k, v in self._columns_cache.items() if v[0] >= now}
+                if len(self._columns_cache) >= _COLUMNS_CACHE_SIZE:
+                    self._columns_cache = {}
+            self._columns_cache[layer] = (time.monotonic() + geoserver_catalog_cache_ttl, columns)
+        return columns
+
+    @staticmethod
+    def _feature_type_href(layer_details) -> str:
         if layer_details.status_code != 200:
-            raise ValueError(f"Failed to get layer details: {layer_details.text}")
-        layer_json = layer_details.json() or {}
+            raise UpstreamError(f"Failed to get layer details: {layer_details.text}", layer_details.status_code)
+        layer_json = decode_json(layer_details) or {}
         resource = (layer_json.get("layer") or {}).get("resource") or {}
         href = resource.get("href")
         if not href:
-            raise ValueError("Layer resource href not found")
-        if not href.endswith(".json"):
-            href = href + ".json"
+            raise UpstreamError("Layer resource href not found")
+        return GeoServerService._json_href(href)
 
-        ft_response = self.dao.get_url(href)
+    @staticmethod
+    def _columns_from_feature_type(ft_response):
         if ft_response.status_code != 200:
-            raise ValueError(f"Failed to get feature type details: {ft_response.text}")
-        ft_json = ft_response.json() or {}
+            raise UpstreamError(f"Failed to get feature type details: {ft_response.text}", ft_response.status_code)
+        ft_json = decode_json(ft_response) or {}
         attributes = ((ft_json.get("featureType") or {}).get("attributes") or {}).get("attribute") or []
 
         columns = []
@@ -220,6 +366,149 @@ class GeoServerService:
                 })
         return {"columns": columns}
 
+    def get_layer_bbox(self, layer: str) -> Optional[List[List[float]]]:
+        """
+        Bounding box of a layer as [[minx, miny], [maxx, maxy]], or None if not available.
+        Uses the layer resource first and falls back to its feature type.
+        """
+        layer_details = self.dao.get_layer_details(layer)
+        if layer_details.status_code != 200:
+            return None
+        resource = ((decode_json(layer_details) or {}).get("layer") or {}).get("resource") or {}
+        bbox = self._bbox_from(resource)
+        if bbox or not resource.get("href"):
+            return bbox
+
+        ft_response = self.dao.get_url(self._json_href(resource["href"]))
+        if ft_response.status_code != 200:
+            return None
+        return self._bbox_from((decode_json(ft_response) or {}).get("featureType") or {})
+
+    async def get_layer_bbox_async(self, layer: str) -> Optional[List[List[float]]]:
+        layer_details = await self.async_dao.get_layer_details(layer)
+        if layer_details.status_code != 200:
+            return None
+        resource = ((decode_json(layer_details) or {}).get("layer") or {}).get("resource") or {}
+        bbox = self._bbox_from(resource)
+        if bbox or not resource.get("href"):
+            return bbox
+
+        ft_response = await self.async_dao.get_url(self._json_href(resource["href"]))
+        if ft_response.status_code != 200:
+            return None
+        return self._bbox_from((decode_json(ft_response) or {}).get("featureType") or {})
+
+    async def refresh_bbox_cache(self):
+        """
+        Reload the bbox cache from one WMS GetCapabilities request.
+        The old cache is kept if GeoServer can't be reached.
+        """
+        self._bbox_refreshed_at = time.monotonic()
+        try:
+            response = await self.async_dao.get_wms_capabilities()
+            if response.status_code == 200:
+                self._bbox_cache = self._bboxes_from_capabilities(response.content)
+                self._bbox_fallback = {}
+            else:
+                logger.warning(f"WMS capabilities request returned {response.status_code}")
+        except Exception as e:
+            logger.warning(f"Error fetching WMS capabilities for bboxes: {str(e)}")
+
+    def clear_bbox_cache(self):
+        self._bbox_cache = {}
+        self._bbox_fallback = {}
+        # Let the next request reload capabilities instead of looking every layer up
+        self._bbox_refreshed_at = float("-inf")
+
+    async def get_bboxes_for_layers(self, layers: List[str]) -> Dict[str, Optional[List[List[float]]]]:
+        """
+        Bounding boxes for many layers. Served from the capabilities-based bbox cache,
+        which the background loop keeps fresh. A missing layer triggers a reload on
+        the request path only if the last one is at least _BBOX_RELOAD_MIN_INTERVAL
+        old; layers still missing are looked up one by one and the results (misses
+        included) are cached, so unknown names don't cost a lookup per request.
+        """
+        now = time.monotonic()
+        fallback = self._bbox_fallback
+        missing = [
+            name for name in layers
+            if name not in self._bbox_cache and not (name in fallback and fallback[name][0] > now)
+        ]
+        if missing and now - self._bbox_refreshed_at >= _BBOX_RELOAD_MIN_INTERVAL:
+            await self.refresh_bbox_cache()
+            fallback = self._bbox_fallback
+
+        cache = self._bbox_cache
+        now = time.monotonic()
+        bboxes: Dict[str, Optional[List[List[float]]]] = {}
+        lookups = []
+        for name in layers:
+            if name in cache:
+                bboxes[name] = cache[name]
+            elif name in fallback and fallback[name][0] > now:
+                bboxes[name] = fallback[name][1]
+            else:
+                lookups.append(name)
+
+        if lookups:
+            results = await asyncio.gather(
+                *(self.get_layer_bbox_async(name) for name in lookups),
+                return_exceptions=True,
+            )
+            now = time.monotonic()
+            if len(self._bbox_fallback) >= _BBOX_FALLBACK_SIZE:
+                self._bbox_fallback = {k: v for k, v in self._bbox_fallback.items() if v[0] > now}
+            for name, result in zip(lookups, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Error fetching bbox for layer {name}: {str(result)}")
+                    result = None
+                bboxes[name] = result
+                ttl = bbox_refresh_interval if result is not None else _BBOX_MISS_TTL
+                self._bbox_fallback[name] = (now + ttl, result)
+        return bboxes
+
+    @staticmethod
+    def _bboxes_from_capabilities(content: bytes) -> Dict[str, List[List[float]]]:
+        """
+        Map layer name -> [[minx, miny], [maxx, maxy]] from a WMS 1.1.1 capabilities document.
+        """
+        bboxes: Dict[str, List[List[float]]] = {}
+        for _, elem in ElementTree.iterparse(io.BytesIO(content)):
+            if elem.tag != "Layer":
+                continue
+            name = elem.findtext("Name")
+            bbox = elem.find("LatLonBoundingBox")
+            if name and bbox is not None:
+                try:
+                    bboxes[name] = [
+                        [float(bbox.get("minx")), float(bbox.get("miny"))],
+                        [float(bbox.get("maxx")), float(bbox.get("maxy"))],
+                    ]
+                except (TypeError, ValueError):
+                    pass
+            # Nested layers are done with; keep memory flat on large documents
+            for child in elem.findall("Layer"):
+                elem.remove(child)
+        return bboxes
+
+    @staticmethod
+    def _json_href(href: str) -> str:
+        return href if href.endswith(".json") else href + ".json"
+
+    @staticmethod
+    def _bbox_from(resource: Dict) -> Optional[List[List[float]]]:
+        # GeoServer typically has latLonBoundingBox or nativeBoundingBox
+        bbox_data = resource.get("latLonBoundingBox") or resource.get("nativeBoundingBox")
+        if not bbox_data:
+            return None
+        minx = bbox_data.get("minx")
+        miny = bbox_data.get("miny")
+        maxx = bbox_data.get("maxx")
+        maxy = bbox_data.get("maxy")
+        if any(v is None for v in (minx, miny, maxx, maxy)):
+            return None
+        return [[float(minx), float(miny)], [float(maxx), float(maxy)]]
+
     def get_layer_data(self, layer: str, max_features: int = 100, bbox: str = None, filter_query: str = None, properties: str = None):
         """
         Fetch data for a layer via WFS with optional bbox/filter and max features.
@@ -232,3 +521,14 @@ class GeoServerService:
             property_names=properties,
         )
 
+    async def stream_layer_data(self, layer: str, max_features: int = 100, bbox: str = None, filter_query: str = None, properties: str = None):
+        """
+        Open the WFS GetFeature response for streaming; see AsyncGeoServerDAO.stream_features.
+        """
+        return await self.async_dao.stream_features(
+            layer,
+            bbox=bbox,
+            filter_query=filter_query,
+            max_features=max_features,
+            property_names=properties,
+        )
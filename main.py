@@ -1,6 +1,21 @@
+import asyncio
+import logging
+import orjson
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
 from geoserver.api import router as geoserver_router  # Import router directly
+from geoserver.api import create_geo_service, refresh_layers_snapshot_loop, request_layers_refresh
+from geoserver.api import refresh_bbox_cache_loop
+from database.database import async_engine, engine
+from utils.cache import geoserver_cache
+from utils.tasks import task_store
+from utils.etag import ETagMiddleware
+from utils.errors import InvalidRequestError, UnhandledErrorMiddleware, UpstreamError
+from utils.errors import invalid_request_handler, upstream_error_handler, upstream_json_error_handler
 from geoserver.admin.api import router as geoserver_admin_router  # Import admin router
+from geoserver.admin.api import create_geo_admin_service
 from upload_log.api.api import router as upload_log_router
 
 # Import the new spatial queries API
@@ -17,8 +32,90 @@ from register_dataset.api.api import router as register_dataset_router
 
 # Allow CORS (if needed)
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from utils.config import gzip_minimum_size
 origins = ["*"]
+
+logger = logging.getLogger(__name__)
+
+
+def _ping_sync_db():
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def _ping_async_db():
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def warm_up_connections(app: FastAPI):
+    """
+    Open one DB connection in each pool and one GeoServer keep-alive connection
+    before serving, so the first requests don't pay the connection setup.
+    Failures are only logged; the pools connect lazily anyway.
+    """
+    results = await asyncio.gather(
+        asyncio.to_thread(_ping_sync_db),
+        _ping_async_db(),
+        app.state.geo_service.async_dao.get_version(),
+        return_exceptions=True,
+    )
+    for name, result in zip(("database", "async database", "GeoServer"), results):
+        if isinstance(result, Exception):
+            logger.warning(f"Warming up {name} connection failed: {result}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One GeoServer service (and HTTP connection pool) per app instance
+    app.state.geo_service = create_geo_service()
+    await app.state.geo_service.async_dao.open()
+    app.state.geo_admin_service = create_geo_admin_service()
+    await app.state.geo_admin_service.async_dao.open()
+    await warm_up_connections(app)
+
+    # Keep a pre-built /layers payload warm; layer mutations trigger a rebuild
+    app.state.layers_snapshot = None
+    app.state.layers_refresh_event = asyncio.Event()
+    geoserver_cache.add_invalidation_listener("layers", lambda: request_layers_refresh(app))
+    layers_refresh_task = asyncio.create_task(refresh_layers_snapshot_loop(app))
+
+    # Layer bboxes are reloaded in the background; layer mutations drop them
+    # along with the cached layer index and layer columns
+    geoserver_cache.add_invalidation_listener("layers", app.state.geo_service.clear_bbox_cache)
+    geoserver_cache.add_invalidation_listener("layers", app.state.geo_service.clear_layer_index_cache)
+    geoserver_cache.add_invalidation_listener("layers", app.state.geo_service.clear_columns_cache)
+    for group in ("layers", "styles"):
+        geoserver_cache.add_invalidation_listener(group, app.state.geo_service.dao.clear_catalog_cache)
+    bbox_refresh_task = asyncio.create_task(refresh_bbox_cache_loop(app))
+    # Run those listeners for invalidations made by other workers too (Redis only)
+    invalidation_task = asyncio.create_task(geoserver_cache.listen_for_invalidations())
+
+    if not task_store.shared:
+        logger.warning(
+            "WEB_CONCURRENCY > 1 without REDIS_URL: admin deletes run synchronously "
+            "because background task state would not be visible across workers"
+        )
+    try:
+        yield
+    finally:
+        for task in (layers_refresh_task, bbox_refresh_task, invalidation_task):
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        app.state.geo_service.dao.close()
+        await app.state.geo_service.async_dao.aclose()
+        app.state.geo_admin_service.dao.close()
+        await app.state.geo_admin_service.async_dao.aclose()
+        await geoserver_cache.aclose()
+        await task_store.aclose()
+        await async_engine.dispose()
+
+
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     openapi_tags=[
         {
             "name": "spatial-search",
@@ -30,6 +127,9 @@ app = FastAPI(
         }
     ]
 )
+# Innermost: unhandled route errors become JSON 500s here, inside CORSMiddleware,
+# so the error responses still carry the CORS headers
+app.add_middleware(UnhandledErrorMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -37,6 +137,18 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Weak ETags + 304s for unchanged JSON GET responses
+app.add_middleware(ETagMiddleware)
+# Outermost: compress large JSON/GeoJSON bodies (layer listings, WFS streams) for
+# clients that accept gzip; the ETag above is computed on the uncompressed body
+app.add_middleware(GZipMiddleware, minimum_size=gzip_minimum_size)
+
+
+# App-wide error mapping: rejected request values are 400s, GeoServer failures
+# are 502s; anything else unhandled is a 500 from UnhandledErrorMiddleware above
+app.add_exception_handler(InvalidRequestError, invalid_request_handler)
+app.add_exception_handler(UpstreamError, upstream_error_handler)
+app.add_exception_handler(orjson.JSONDecodeError, upstream_json_error_handler)
 
 # Include routers
 app.include_router(geoserver_router, tags=["geoserver"])  # Add the GeoServer API router
@@ -1,11 +1,34 @@
 from fastapi import HTTPException
+from sqlalchemy import select
 from metadata.models.schema import Metadata
 from typing import List, Optional
+from sqlalchemy.engine import Row
 from metadata.models.model import MetadataFilterInput
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Metadata columns needed to build the layer listings (everything except dataset_id)
+LAYER_LISTING_COLUMNS = (
+    Metadata.id,
+    Metadata.geoserver_name,
+    Metadata.name_of_dataset,
+    Metadata.theme,
+    Metadata.keywords,
+    Metadata.purpose_of_creating_data,
+    Metadata.access_constraints,
+    Metadata.use_constraints,
+    Metadata.data_type,
+    Metadata.contact_person,
+    Metadata.organization,
+    Metadata.mailing_address,
+    Metadata.city_locality_country,
+    Metadata.country,
+    Metadata.contact_email,
+    Metadata.created_on,
+    Metadata.updated_on,
+)
+
 
 class MetadataDAO:
 
@@ -48,6 +71,25 @@ class MetadataDAO:
             logger.error(f"Error in batch retrieving metadata: {str(e)}")
             db.rollback()
             raise HTTPException(status_code=400, detail="Error batch retrieving metadata")
+
+    @staticmethod
+    async def get_by_geoserver_names_slim_async(geoserver_names: List[str], db) -> List[Row]:
+        """
+        Async batch fetch of the LAYER_LISTING_COLUMNS for an AsyncSession.
+        Returns plain rows (attribute access by column name) instead of ORM objects,
+        so nothing is added to the session identity map.
+        """
+        try:
+            if not geoserver_names:
+                return []
+            logger.info(f"Batch fetching listing metadata for {len(geoserver_names)} geoserver names")
+            query = select(*LAYER_LISTING_COLUMNS).where(Metadata.geoserver_name.in_(geoserver_names))
+            result = await db.execute(query)
+            return list(result.all())
+        except Exception as e:
+            logger.error(f"Error in batch retrieving metadata: {str(e)}")
+            await db.rollback()
+            raise HTTPException(status_code=400, detail="Error batch retrieving metadata")
         
     @staticmethod
     def get_filtered(filters: Optional[MetadataFilterInput], db) -> List[Metadata]:
@@ -2,6 +2,7 @@ from fastapi import HTTPException
 from metadata.dao.dao import MetadataDAO
 from metadata.models.model import MetadataFilterInput, MetadataType
 from typing import List, Optional
+from sqlalchemy.engine import Row
 from metadata.models.schema import Metadata
 import logging
 import uuid
@@ -67,3 +68,17 @@ class MetadataService:
             # Return empty list instead of raising exception for batch operations
             return []
 
+    @staticmethod
+    async def get_by_geoserver_names_slim_async(geoserver_names: List[str], db) -> List[Row]:
+        """
+        Batch fetch only the metadata columns used by the layer listings.
+        Returns a list of rows (empty list if none found, no exception).
+        """
+        try:
+            if not geoserver_names:
+                return []
+            return await MetadataDAO.get_by_geoserver_names_slim_async(geoserver_names, db)
+        except Exception as e:
+            logger.error(f"Error in batch fetching metadata: {str(e)}")
+            # Return empty list instead of raising exception for batch operations
+            return []
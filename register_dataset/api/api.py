@@ -15,47 +15,31 @@ from register_dataset.model.model import (
     StyleConfigForColumn,
 )
 from register_dataset.service.service import RegisterDatasetService
-from geoserver.dao import GeoServerDAO
+from geoserver.api import get_geo_service
 from geoserver.service import GeoServerService
+from geoserver.admin.api import get_geo_admin_service
 from geoserver.admin.service import GeoServerAdminService
-from geoserver.admin.dao import GeoServerAdminDAO
 from styles.service.style_service import StyleService
-from utils.config import (
-    geoserver_host,
-    geoserver_port,
-    geoserver_username,
-    geoserver_password,
-)
+from utils.cache import invalidate_rest_cache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["register-dataset"])
 
-# Initialize GeoServer services
-geo_dao = GeoServerDAO(
-    base_url=f"http://{geoserver_host}:{geoserver_port}/geoserver/rest",
-    username=geoserver_username,
-    password=geoserver_password,
-)
-geo_service = GeoServerService(geo_dao)
-
-geo_admin_dao = GeoServerAdminDAO(
-    base_url=f"http://{geoserver_host}:{geoserver_port}/geoserver/rest",
-    username=geoserver_username,
-    password=geoserver_password,
-)
-geo_admin_service = GeoServerAdminService(geo_admin_dao)
-
 
-def get_register_service(db: Session = Depends(get_db)) -> RegisterDatasetService:
-    """Dependency to get RegisterDatasetService instance."""
-    style_service = StyleService(db, geo_dao, geo_service)
+def get_register_service(
+    db: Session = Depends(get_db),
+    geo_service: GeoServerService = Depends(get_geo_service),
+    geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service),
+) -> RegisterDatasetService:
+    """Dependency to get RegisterDatasetService instance (on the app-wide GeoServer services)."""
+    style_service = StyleService(db, geo_service.dao, geo_service)
     return RegisterDatasetService(
         db=db,
         geo_service=geo_service,
         geo_admin_service=geo_admin_service,
         style_service=style_service,
-        geo_dao=geo_dao,
+        geo_dao=geo_service.dao,
     )
 
 
@@ -182,6 +166,7 @@ async def register_dataset(
 
         # Call service
         result = await service.register_dataset(request, file)
+        await invalidate_rest_cache("datastores", "layers", "styles")
         return result
 
     except HTTPException:
@@ -303,6 +288,7 @@ async def register_shapefile(
 
         # Call service
         result = await service.register_shapefile(request, file)
+        await invalidate_rest_cache("datastores", "layers", "styles")
         return result
 
     except HTTPException:
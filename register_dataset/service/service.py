@@ -135,6 +135,7 @@ class RegisterDatasetService:
                     file=upload_file,
                     db=self.db,
                     geo_service=self.geo_service,
+                    geo_admin_service=self.geo_admin_service,
                     workspace=request.workspace,
                     store_name=request.store_name,
                     dataset_id=dataset_id,
@@ -911,7 +912,7 @@ class RegisterDatasetService:
         geoserver_layer_name = f"metastring:{actual_feature_type_name}"
         await asyncio.sleep(2)
         
-        verification_passed, feature_count = verify_layer_features(geoserver_layer_name)
+        verification_passed, feature_count = verify_layer_features(self.geo_dao, geoserver_layer_name)
         if verification_passed:
             logger.info(f"✓ Layer verification passed: '{geoserver_layer_name}' has {feature_count or 0} features")
         elif feature_count == 0:
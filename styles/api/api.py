@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional, Any
 import logging
+import string
+from functools import lru_cache
 from urllib.parse import quote
 import uuid
 from database.database import get_db
-from geoserver.dao import GeoServerDAO
+from geoserver.api import get_geo_service
 from geoserver.service import GeoServerService
-from utils.config import (geoserver_host, geoserver_port, geoserver_username, geoserver_password)
+from utils.cache import invalidate_rest_cache
 from metadata.models.schema import Metadata
 from ..service.style_service import StyleService
 from ..models.model import (StyleMetadataOut, StyleGenerateRequest, StyleGenerateResponse, AuditLogOut)
@@ -17,18 +20,12 @@ logger = logging.getLogger(__name__)
 # Note: prefix is added in main.py when including the router
 router = APIRouter(tags=["styles"])
 
-# Initialize GeoServer DAO and Service
-geoserver_dao = GeoServerDAO(
-    base_url=f"http://{geoserver_host}:{geoserver_port}/geoserver/rest",
-    username=geoserver_username,
-    password=geoserver_password
-)
-geoserver_service = GeoServerService(geoserver_dao)
-
-
-def get_style_service(db: Session = Depends(get_db)) -> StyleService:
-    """Dependency to get StyleService instance."""
-    return StyleService(db, geoserver_dao, geoserver_service)
+def get_style_service(
+    db: Session = Depends(get_db),
+    geo_service: GeoServerService = Depends(get_geo_service),
+) -> StyleService:
+    """Dependency to get StyleService instance (on the app-wide GeoServerService)."""
+    return StyleService(db, geo_service.dao, geo_service)
 
 
 # ==================== Style Generation ====================
@@ -58,6 +55,8 @@ async def generate_style(
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
     
+    if result.published_to_geoserver or result.attached_to_layer:
+        await invalidate_rest_cache("styles", "layers")
     return result
 
 
@@ -184,22 +183,17 @@ async def get_styles_by_layer(
             layer_name = layer_id_or_name
         
         # Extract workspace and table name from layer name (e.g., "metastring:gbif" -> workspace="metastring", table="gbif")
-        table_name = layer_name
-        extracted_workspace = None
-        
-        if ":" in layer_name:
-            parts = layer_name.split(":", 1)  # Split only on first colon
-            extracted_workspace = parts[0]
-            table_name = parts[1]
+        extracted_workspace, sep, table_name = layer_name.partition(":")  # Split only on first colon
+        if not sep:
+            extracted_workspace, table_name = None, layer_name
         
         # Use workspace from query parameter if provided, otherwise use extracted workspace from layer_name
         filter_workspace = workspace if workspace else extracted_workspace
         
-        # Get styles filtered by workspace (if specified) and active status
-        styles, _ = service.dao.list_styles(workspace=filter_workspace, is_active=True, skip=0, limit=1000)
-        
-        # Filter by table name
-        layer_styles = [s for s in styles if s.layer_table_name == table_name]
+        # Get active styles for this table, filtered in SQL by workspace (if specified)
+        layer_styles, _ = service.dao.list_styles(
+            workspace=filter_workspace, is_active=True, skip=0, limit=1000, layer_table_name=table_name
+        )
         
         if not layer_styles:
             return {
@@ -228,13 +222,13 @@ async def get_styles_by_layer(
         
         # Build response
         style_list = []
+        # Look up all color_by column types in one query
+        col_types = service.dao.get_column_data_types(
+            {(s.layer_table_name, s.color_by) for s in layer_styles},
+            schema
+        )
         for style in layer_styles:
-            # Get column data type
-            col_type = service.dao.get_column_data_type(
-                style.layer_table_name, 
-                style.color_by, 
-                schema
-            ) or "unknown"
+            col_type = col_types.get((style.layer_table_name, style.color_by)) or "unknown"
             
             # Generate human-readable title from column name
             style_title = _format_column_name(style.color_by)
@@ -247,12 +241,14 @@ async def get_styles_by_layer(
                 "colorBy": style.color_by
             })
         
-        return {
+        # Payload is plain str/int values, so hand it straight to orjson
+        # instead of walking it again with jsonable_encoder
+        return ORJSONResponse({
             "layerName": layer_name,
             "titleColumn": title_column,
             "summaryColumn": summary_columns[:10],  # Limit to 10 columns
             "styles": style_list
-        }
+        })
         
     except HTTPException:
         raise
@@ -401,9 +397,8 @@ def _transform_color_expression(
     return expression
 
 
+@lru_cache(maxsize=4096)
 def _format_column_name(column_name: str) -> str:
-    # Replace underscores with spaces
-    title = column_name.replace("_", " ")
-    # Capitalize first letter of each word
-    title = " ".join(word.capitalize() for word in title.split())
-    return title
+    # Replace underscores with spaces and capitalize first letter of each word
+    # (capwords rather than str.title() so "2nd_value" stays "2nd Value")
+    return string.capwords(column_name.replace("_", " "))
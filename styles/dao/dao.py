@@ -3,8 +3,8 @@ DAO (Data Access Object) layer for style-related database operations.
 Handles queries to PostGIS for column info, classification data, and style metadata.
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import text, func
-from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import text, func, tuple_, table, column, select
+from typing import List, Dict, Any, Optional, Tuple, Iterable
 from datetime import datetime, timedelta, timezone
 import logging
 
@@ -14,6 +14,7 @@ from styles.models.model import (
     ColumnInfo,
     ClassificationMethod,
 )
+from utils.http import decode_json
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +85,30 @@ class StyleDAO:
         }).fetchone()
         return result[0] if result else None
 
+    def get_column_data_types(
+        self, columns: Iterable[Tuple[str, str]], schema: str = "public"
+    ) -> Dict[Tuple[str, str], str]:
+        """Get data types for many (table_name, column_name) pairs in one query."""
+        if not columns:
+            return {}
+        info_columns = table(
+            "columns",
+            column("table_name"),
+            column("column_name"),
+            column("data_type"),
+            column("table_schema"),
+            schema="information_schema",
+        )
+        query = select(
+            info_columns.c.table_name,
+            info_columns.c.column_name,
+            info_columns.c.data_type,
+        ).where(
+            info_columns.c.table_schema == schema,
+            tuple_(info_columns.c.table_name, info_columns.c.column_name).in_(list(columns)),
+        )
+        return {(row[0], row[1]): row[2] for row in self.db.execute(query)}
+
     def column_exists(self, table_name: str, column_name: str, schema: str = "public") -> bool:
         """Check if a column exists in a table."""
         query = text("""
@@ -400,13 +425,16 @@ class StyleDAO:
         workspace: Optional[str] = None,
         is_active: Optional[bool] = True,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        layer_table_name: Optional[str] = None
     ) -> Tuple[List[StyleMetadata], int]:
         """List style metadata with optional filtering."""
         query = self.db.query(StyleMetadata)
         
         if workspace:
             query = query.filter(StyleMetadata.workspace == workspace)
+        if layer_table_name:
+            query = query.filter(StyleMetadata.layer_table_name == layer_table_name)
         if is_active is not None:
             query = query.filter(StyleMetadata.is_active == is_active)
         
@@ -644,7 +672,7 @@ class StyleDAO:
             if response.status_code != 200:
                 raise ValueError(f"WFS query failed: {response.text}")
             
-            data = response.json()
+            data = decode_json(response) or {}
             features = data.get("features", [])
             
             if not features:
@@ -699,7 +727,7 @@ class StyleDAO:
             if response.status_code != 200:
                 raise ValueError(f"WFS query failed: {response.text}")
             
-            data = response.json()
+            data = decode_json(response) or {}
             features = data.get("features", [])
             
             distinct_values = set()
@@ -742,7 +770,7 @@ class StyleDAO:
             if response.status_code != 200:
                 raise ValueError(f"WFS query failed: {response.text}")
             
-            data = response.json()
+            data = decode_json(response) or {}
             features = data.get("features", [])
             
             values = []
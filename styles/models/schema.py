@@ -12,6 +12,8 @@ from sqlalchemy import (
     ForeignKey,
     Enum as SQLEnum,
     UniqueConstraint,
+    Index,
+    text,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -48,6 +50,10 @@ class StyleMetadata(Base):
     __tablename__ = "style_metadata"
     __table_args__ = (
         UniqueConstraint('layer_table_name', 'color_by', 'workspace', name='uq_style_layer_color_workspace'),
+        # Serves active-style lookups by workspace and layer_table_name. create_all()
+        # only adds it to new tables; existing databases need the CREATE INDEX
+        # CONCURRENTLY statement from the README (Database Schema > Styles Table)
+        Index('ix_style_metadata_active_workspace_table', 'workspace', 'layer_table_name', postgresql_where=text('is_active')),
         {"schema": SCHEMA}
     )
 
@@ -0,0 +1,94 @@
+import orjson
+import pytest
+import requests
+
+from geoserver.admin.dao import GeoServerAdminDAO
+
+BASE_URL = "http://localhost:8080/geoserver/rest"
+
+DATASTORE = {
+    "dataStore": {
+        "name": "pg",
+        "type": "PostGIS",
+        "connectionParameters": {
+            "entry": [
+                {"@key": "dbtype", "$": "postgis"},
+                {"@key": "schema", "$": "public"},
+                {"@key": "database", "$": "gis"},
+            ]
+        },
+    }
+}
+
+# GET featuretypes.json: the published feature types
+CONFIGURED = {
+    "featureTypes": {
+        "featureType": [
+            {
+                "name": "roads",
+                "href": f"{BASE_URL}/workspaces/topp/datastores/pg/featuretypes/roads.json",
+            }
+        ]
+    }
+}
+
+# GET featuretypes.json?list=all: every table GeoServer can see
+LIST_ALL = {"list": {"string": ["rivers", "roads"]}}
+
+
+def _response(payload) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = orjson.dumps(payload)
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+def _dao(configured, list_all) -> GeoServerAdminDAO:
+    dao = GeoServerAdminDAO(BASE_URL, "admin", "geoserver")
+
+    def get(url, params=None, **kwargs):
+        if url.endswith("/datastores/pg.json"):
+            return _response(DATASTORE)
+        if url.endswith("/featuretypes.json"):
+            return _response(list_all if params == {"list": "all"} else configured)
+        raise AssertionError(f"unexpected GET {url}")
+
+    dao.session.get = get
+    return dao
+
+
+def test_configured_feature_types_shape():
+    assert GeoServerAdminDAO._configured_feature_types(_response(CONFIGURED)) == CONFIGURED["featureTypes"]["featureType"]
+    assert GeoServerAdminDAO._configured_feature_types(_response({"featureTypes": ""})) == []
+
+
+def test_listed_names_shape():
+    assert GeoServerAdminDAO._listed_names(_response(LIST_ALL)) == ["rivers", "roads"]
+    assert GeoServerAdminDAO._listed_names(_response({"list": {"string": "roads"}})) == ["roads"]
+    assert GeoServerAdminDAO._listed_names(_response({"list": ""})) == []
+
+
+def test_schema_tables_keep_published_tables():
+    response = _dao(CONFIGURED, LIST_ALL).list_postgis_schema_tables("topp", "pg", "public")
+
+    assert response.status_code == 200
+    assert orjson.loads(response.content) == {
+        "featureTypes": {
+            "featureType": CONFIGURED["featureTypes"]["featureType"] + [{"name": "rivers"}]
+        }
+    }
+
+
+def test_schema_tables_with_nothing_published():
+    response = _dao({"featureTypes": ""}, LIST_ALL).list_postgis_schema_tables("topp", "pg", "public")
+
+    assert orjson.loads(response.content) == {
+        "featureTypes": {"featureType": [{"name": "rivers"}, {"name": "roads"}]}
+    }
+
+
+@pytest.mark.parametrize("schema", ["public\n", "public;drop", "schéma", ""])
+def test_invalid_schema_names_are_rejected(schema):
+    with pytest.raises(ValueError):
+        _dao(CONFIGURED, LIST_ALL).list_postgis_schema_tables("topp", "pg", schema)
@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+
+from geoserver.admin.dao import GeoServerAdminDAO
+from geoserver.admin.service import GeoServerAdminService
+from utils.errors import InvalidRequestError
+
+BASE_URL = "http://localhost:8080/geoserver/rest"
+
+
+@pytest.mark.parametrize(
+    "method, args",
+    [
+        ("list_datastore_tables_async", ("topp", "")),
+        ("get_table_details_async", ("topp", "pg", "")),
+        ("get_style_details_async", ("",)),
+    ],
+)
+def test_async_variants_require_names(method, args):
+    # Rejected before any request is sent to GeoServer
+    service = GeoServerAdminService(GeoServerAdminDAO(BASE_URL, "admin", "geoserver"))
+
+    with pytest.raises(InvalidRequestError):
+        asyncio.run(getattr(service, method)(*args))
@@ -0,0 +1,120 @@
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+import httpx
+import orjson
+import pytest
+
+pytest.importorskip("greenlet")  # geoserver.api pulls in the async SQLAlchemy engine
+
+import geoserver.api as api_module
+from geoserver.api import _relay_body, refresh_layers_snapshot_loop, request_layers_refresh
+from utils.cache import RestCache
+
+
+class _Stream(httpx.AsyncByteStream):
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_relay_body_closes_upstream_when_fully_read():
+    async def run():
+        stream = _Stream([b'{"features":', b"[]}"])
+        body = [chunk async for chunk in _relay_body(httpx.Response(200, stream=stream))]
+        assert b"".join(body) == b'{"features":[]}'
+        assert stream.closed
+
+    asyncio.run(run())
+
+
+def test_relay_body_closes_upstream_when_client_goes_away():
+    async def run():
+        stream = _Stream([b"a", b"b", b"c"])
+        body = _relay_body(httpx.Response(200, stream=stream))
+        assert await body.__anext__() == b"a"
+        await body.aclose()  # what happens when streaming stops midway
+        assert stream.closed
+
+    asyncio.run(run())
+
+
+def _snapshot_app(monkeypatch, build):
+    """App state as set up by the lifespan, with the payload builder replaced."""
+    @contextlib.asynccontextmanager
+    async def session():
+        yield None
+
+    monkeypatch.setattr(api_module, "AsyncSessionLocal", session)
+    monkeypatch.setattr(api_module, "_build_layers_payload", build)
+    return SimpleNamespace(state=SimpleNamespace(
+        geo_service=None, layers_snapshot=None, layers_refresh_event=asyncio.Event(),
+    ))
+
+
+async def _wait_for_snapshot(app):
+    while app.state.layers_snapshot is None:
+        await asyncio.sleep(0)
+    return orjson.loads(app.state.layers_snapshot)
+
+
+def test_layers_invalidation_drops_and_rebuilds_the_snapshot(monkeypatch):
+    builds = []
+
+    async def build(geo_service, db):
+        builds.append(None)
+        return {"build": len(builds)}
+
+    async def run():
+        app = _snapshot_app(monkeypatch, build)
+        cache = RestCache()
+        cache.add_invalidation_listener("layers", lambda: request_layers_refresh(app))
+        loop = asyncio.create_task(refresh_layers_snapshot_loop(app, interval=3600))
+        try:
+            assert await asyncio.wait_for(_wait_for_snapshot(app), 1) == {"build": 1}
+
+            await cache.invalidate("layers")
+            assert app.state.layers_snapshot is None  # requests build live meanwhile
+            assert await asyncio.wait_for(_wait_for_snapshot(app), 1) == {"build": 2}
+        finally:
+            loop.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await loop
+
+    asyncio.run(run())
+
+
+def test_snapshot_built_during_an_invalidation_is_discarded(monkeypatch):
+    builds = []
+    release = asyncio.Event()
+
+    async def build(geo_service, db):
+        builds.append(None)
+        if len(builds) == 1:
+            await release.wait()
+        return {"build": len(builds)}
+
+    async def run():
+        app = _snapshot_app(monkeypatch, build)
+        loop = asyncio.create_task(refresh_layers_snapshot_loop(app, interval=3600))
+        try:
+            while not builds:
+                await asyncio.sleep(0)
+            request_layers_refresh(app)  # layers changed while the first build ran
+            release.set()
+            # The stale first payload is never published
+            assert await asyncio.wait_for(_wait_for_snapshot(app), 1) == {"build": 2}
+        finally:
+            loop.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await loop
+
+    asyncio.run(run())
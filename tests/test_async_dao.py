@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+
+from geoserver.async_dao import AsyncGeoServerDAO
+from utils.http import ASYNC_SLOW_TIMEOUT
+
+BASE_URL = "http://localhost:8080/geoserver/rest"
+
+
+def _dao(requests_seen) -> AsyncGeoServerDAO:
+    def handler(request: httpx.Request) -> httpx.Response:
+        request.read()
+        requests_seen.append(request)
+        return httpx.Response(201)
+
+    dao = AsyncGeoServerDAO(BASE_URL, "admin", "geoserver")
+    dao._client = httpx.AsyncClient(
+        base_url=BASE_URL, transport=httpx.MockTransport(handler), timeout=dao.timeout
+    )
+    return dao
+
+
+def test_uploads_use_the_slow_read_timeout():
+    async def run():
+        seen = []
+        dao = _dao(seen)
+        await dao.upload_shapefile_stream("topp", "roads", _chunks([b"PK"]))
+        await dao.upload_postgis("topp", "pg", "gis", "db", 5432, "u", "p")
+        await dao.aclose()
+        return seen
+
+    for request in asyncio.run(run()):
+        assert request.extensions["timeout"] == ASYNC_SLOW_TIMEOUT.as_dict()
+
+
+async def _chunks(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def test_zip_upload_sends_content_length(tmp_path):
+    archive = tmp_path / "roads.zip"
+    archive.write_bytes(b"PK" * 1000)
+
+    async def run():
+        seen = []
+        dao = _dao(seen)
+        await dao.upload_shapefile("topp", "roads", str(archive))
+        await dao.aclose()
+        return seen
+
+    (request,) = asyncio.run(run())
+    assert request.headers["Content-Length"] == "2000"
+    assert "Transfer-Encoding" not in request.headers
+    assert request.content == archive.read_bytes()
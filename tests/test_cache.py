@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+from fastapi import Response
+
+from utils.cache import RestCache, rest_cache
+
+
+class _FakePubSub:
+    def __init__(self, broker):
+        self.broker = broker
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.broker.subscribers.setdefault(channel, []).append(self.queue)
+        await self.queue.put({"type": "subscribe", "data": 1})
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self):
+        pass
+
+
+class _FakeRedis:
+    """Just enough of redis.asyncio for invalidation: no keys, pub/sub in memory."""
+
+    def __init__(self):
+        self.subscribers = {}
+
+    async def scan_iter(self, match):
+        return
+        yield
+
+    async def publish(self, channel, message):
+        for queue in self.subscribers.get(channel, []):
+            await queue.put({"type": "message", "data": message})
+
+    def pubsub(self):
+        return _FakePubSub(self)
+
+
+def _worker(broker, calls, name):
+    cache = RestCache("redis://fake")
+    cache._redis = broker
+    cache.add_invalidation_listener("layers", lambda: calls.append(name))
+    return cache
+
+
+def test_invalidation_runs_listeners_in_every_worker_once():
+    async def run():
+        broker, calls = _FakeRedis(), []
+        first, second = _worker(broker, calls, "first"), _worker(broker, calls, "second")
+        tasks = [asyncio.create_task(cache.listen_for_invalidations()) for cache in (first, second)]
+        await asyncio.sleep(0)
+
+        await first.invalidate("layers", "datastores")
+        await asyncio.sleep(0.01)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert sorted(calls) == ["first", "second"]
+
+    asyncio.run(run())
+
+
+def test_listener_returns_without_redis():
+    asyncio.run(asyncio.wait_for(RestCache().listen_for_invalidations(), timeout=1))
+
+
+def test_concurrent_misses_share_one_call():
+    calls = []
+
+    @rest_cache("test-shared")
+    async def handler(name: str):
+        calls.append(name)
+        await asyncio.sleep(0.01)
+        return {"name": name}
+
+    async def run():
+        return await asyncio.gather(*(handler(name="roads") for _ in range(3)))
+
+    responses = asyncio.run(run())
+
+    assert calls == ["roads"]
+    assert [response.body for response in responses] == [b'{"name":"roads"}'] * 3
+
+
+def test_waiters_run_their_own_call_when_the_first_one_fails():
+    calls = []
+
+    @rest_cache("test-failing")
+    async def handler(name: str):
+        calls.append(name)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise RuntimeError("GeoServer unavailable")
+        return {"name": name}
+
+    async def run():
+        first = asyncio.create_task(handler(name="roads"))
+        await asyncio.sleep(0)  # the first call is in flight
+        waiter = asyncio.create_task(handler(name="roads"))
+        with pytest.raises(RuntimeError):
+            await first
+        return await waiter
+
+    response = asyncio.run(run())
+
+    # The waiter did not get the failure (or an empty shared result) but retried
+    assert calls == ["roads", "roads"]
+    assert isinstance(response, Response)
+    assert response.body == b'{"name":"roads"}'
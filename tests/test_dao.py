@@ -0,0 +1,89 @@
+import io
+import struct
+import zipfile
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from geoserver.dao import GeoServerDAO, _StoredZip
+
+BASE_URL = "http://localhost:8080/geoserver/rest"
+
+CONTENTS = {
+    "roads.shp": b"\x00\x00\x27\x0a" * 500_000,
+    "roads.shx": b"shx",
+    "roads.dbf": b"",
+    "roads.prj": b"GEOGCS[...]",
+}
+
+
+def _files(tmp_path):
+    files = []
+    for name, content in CONTENTS.items():
+        path = tmp_path / name
+        path.write_bytes(content)
+        files.append((str(path), name))
+    return files
+
+
+def _local_header_flags(archive: bytes, zinfo: zipfile.ZipInfo) -> int:
+    signature, _, flags = struct.unpack_from("<4sHH", archive, zinfo.header_offset)
+    assert signature == zipfile.stringFileHeader
+    return flags
+
+
+def test_stored_zip_is_valid_and_has_no_data_descriptors(tmp_path):
+    stored = _StoredZip(_files(tmp_path))
+    archive = b"".join(stored)
+
+    assert len(archive) == len(stored)
+    with zipfile.ZipFile(io.BytesIO(archive)) as zipf:
+        assert zipf.testzip() is None
+        assert [zinfo.filename for zinfo in zipf.infolist()] == list(CONTENTS)
+        for zinfo in zipf.infolist():
+            assert zinfo.compress_type == zipfile.ZIP_STORED
+            assert not zinfo.flag_bits & 0x08
+            assert not _local_header_flags(archive, zinfo) & 0x08
+            assert zipf.read(zinfo) == CONTENTS[zinfo.filename]
+
+
+def test_stored_zip_fails_when_a_file_changes(tmp_path):
+    files = _files(tmp_path)
+    stored = _StoredZip(files)
+    (tmp_path / "roads.shx").write_bytes(b"SHX")
+
+    with pytest.raises(ValueError):
+        b"".join(stored)
+
+
+class _RecordingAdapter(BaseAdapter):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        body = request.body if isinstance(request.body, bytes) else b"".join(request.body)
+        self.requests.append((request, body))
+        response = requests.Response()
+        response.status_code = 201
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("upload", ["roads.shp", "roads.zip"])
+def test_upload_shapefile_sends_content_length(tmp_path, upload):
+    _files(tmp_path)
+    (tmp_path / "roads.zip").write_bytes(b"PK" * 1000)
+    dao = GeoServerDAO(BASE_URL, "admin", "geoserver")
+    adapter = _RecordingAdapter()
+    dao.session.mount("http://", adapter)
+
+    dao.upload_shapefile("topp", "roads", str(tmp_path / upload))
+
+    (request, body), = adapter.requests
+    assert request.headers["Content-Length"] == str(len(body))
+    assert "Transfer-Encoding" not in request.headers
@@ -0,0 +1,57 @@
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.testclient import TestClient
+
+from utils.errors import InvalidRequestError, UnhandledErrorMiddleware, UpstreamError
+from utils.errors import invalid_request_handler, upstream_error_handler, upstream_json_error_handler
+
+
+def _app() -> FastAPI:
+    # Same ordering as main.py: the error middleware sits inside CORSMiddleware
+    app = FastAPI()
+    app.add_middleware(UnhandledErrorMiddleware)
+    app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+    app.add_exception_handler(InvalidRequestError, invalid_request_handler)
+    app.add_exception_handler(UpstreamError, upstream_error_handler)
+    app.add_exception_handler(orjson.JSONDecodeError, upstream_json_error_handler)
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    @app.get("/raise/{kind}")
+    async def raise_error(kind: str):
+        if kind == "invalid":
+            raise InvalidRequestError("Style name is required.")
+        if kind == "upstream":
+            raise UpstreamError("Failed to list layers: oops", 500)
+        if kind == "missing":
+            raise UpstreamError("Failed to get layer details: no such layer", 404)
+        if kind == "json":
+            orjson.loads(b"<html>")
+        raise ValueError("plain")
+
+    return app
+
+
+def test_unhandled_error_is_json_500_with_cors_header():
+    client = TestClient(_app(), raise_server_exceptions=False)
+    response = client.get("/boom", headers={"Origin": "http://example.org"})
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "boom"}
+    assert response.headers["access-control-allow-origin"] == "*"
+
+
+@pytest.mark.parametrize(
+    "kind, status_code",
+    [("invalid", 400), ("upstream", 502), ("missing", 404), ("json", 502), ("plain", 500)],
+)
+def test_error_mapping(kind, status_code):
+    client = TestClient(_app(), raise_server_exceptions=False)
+    response = client.get(f"/raise/{kind}")
+
+    assert response.status_code == status_code
+    assert "detail" in response.json()
@@ -0,0 +1,54 @@
+import pytest
+import requests
+from requests import exceptions
+from requests.adapters import HTTPAdapter
+
+from utils.http import CircuitBreakerHTTPAdapter
+
+
+def _adapter(monkeypatch, statuses):
+    """
+    CircuitBreakerHTTPAdapter whose underlying sends answer with `statuses` in turn.
+    """
+    statuses = iter(statuses)
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = next(statuses)
+        return response
+
+    monkeypatch.setattr(HTTPAdapter, "send", send)
+    return CircuitBreakerHTTPAdapter(failure_threshold=2, cooldown=60)
+
+
+def _request():
+    return requests.Request("GET", "http://geoserver/rest/layers.json").prepare()
+
+
+def test_server_errors_caused_by_the_request_do_not_open_the_circuit(monkeypatch):
+    adapter = _adapter(monkeypatch, [500] * 5 + [200])
+    for _ in range(5):
+        assert adapter.send(_request()).status_code == 500
+    assert adapter.send(_request()).status_code == 200
+
+
+def test_unavailable_responses_open_the_circuit(monkeypatch):
+    adapter = _adapter(monkeypatch, [503, 503, 200])
+    adapter.send(_request())
+    adapter.send(_request())
+    with pytest.raises(exceptions.ConnectionError):
+        adapter.send(_request())
+
+
+def test_only_one_trial_after_cooldown(monkeypatch):
+    adapter = _adapter(monkeypatch, [503, 503, 200])
+    adapter.send(_request())
+    adapter.send(_request())
+    adapter._open_until = 1.0  # cooldown over
+    adapter._half_open_in_flight = True  # another thread is running the trial
+    with pytest.raises(exceptions.ConnectionError):
+        adapter.send(_request())
+
+    adapter._half_open_in_flight = False
+    assert adapter.send(_request()).status_code == 200
+    assert adapter._open_until == 0.0
@@ -0,0 +1,17 @@
+import pytest
+from pydantic import ValidationError
+
+from geoserver.admin.model import UpdateRequest
+from geoserver.model import CreateLayerRequest
+
+
+@pytest.mark.parametrize("name", ["roads\n", "roads;drop", "", "ro ads"])
+def test_identifiers_must_match_in_full(name):
+    with pytest.raises(ValidationError):
+        UpdateRequest(new_name=name)
+    with pytest.raises(ValidationError):
+        CreateLayerRequest(workspace=name, store_name="store", table_name="roads")
+
+
+def test_identifier_accepts_letters_digits_underscores_and_hyphens():
+    assert UpdateRequest(new_name="roads_2024-v1").new_name == "roads_2024-v1"
@@ -0,0 +1,120 @@
+import asyncio
+
+import httpx
+import pytest
+
+pytest.importorskip("greenlet")  # geoserver.service pulls in the async SQLAlchemy engine
+
+import geoserver.service as service_module
+from geoserver.dao import GeoServerDAO
+from geoserver.service import GeoServerService
+
+BASE_URL = "http://localhost:8080/geoserver/rest"
+
+CAPABILITIES = b"""<?xml version="1.0"?>
+<WMT_MS_Capabilities version="1.1.1"><Capability><Layer>
+  <Layer><Name>topp:roads</Name><LatLonBoundingBox minx="1" miny="2" maxx="3" maxy="4"/></Layer>
+</Layer></Capability></WMT_MS_Capabilities>"""
+
+
+class _FakeAsyncDAO:
+    """Counts the GeoServer calls the service makes; every layer lookup is a 404."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_wms_capabilities(self):
+        self.calls.append("capabilities")
+        return httpx.Response(200, content=CAPABILITIES)
+
+    async def get_layer_details(self, layer):
+        self.calls.append(f"layer:{layer}")
+        return httpx.Response(404, text="No such layer")
+
+    async def list_layers(self):
+        self.calls.append("layers")
+        return httpx.Response(200, json={"layers": {"layer": [{"name": "topp:roads"}]}})
+
+    async def list_layers_in_workspace(self, workspace):
+        self.calls.append(f"layers:{workspace}")
+        return httpx.Response(200, json={"layers": {"layer": [{"name": "rivers"}]}})
+
+
+def _service():
+    async_dao = _FakeAsyncDAO()
+    return GeoServerService(GeoServerDAO(BASE_URL, "admin", "geoserver"), async_dao), async_dao
+
+
+def test_unknown_layers_reload_capabilities_at_most_once_per_interval():
+    service, async_dao = _service()
+
+    async def run():
+        first = await service.get_bboxes_for_layers(["topp:roads", "topp:gone"])
+        second = await service.get_bboxes_for_layers(["topp:roads", "topp:gone"])
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == second == {"topp:roads": [[1.0, 2.0], [3.0, 4.0]], "topp:gone": None}
+    # One reload for the unknown layer, one lookup; the miss is then served from the fallback
+    assert async_dao.calls == ["capabilities", "layer:topp:gone"]
+
+
+def test_expired_misses_are_looked_up_again_without_a_reload(monkeypatch):
+    monkeypatch.setattr(service_module, "_BBOX_MISS_TTL", -1)
+    service, async_dao = _service()
+    asyncio.run(service.get_bboxes_for_layers(["topp:gone"]))
+    asyncio.run(service.get_bboxes_for_layers(["topp:gone"]))
+
+    # Still within _BBOX_RELOAD_MIN_INTERVAL of the first reload
+    assert async_dao.calls == ["capabilities", "layer:topp:gone", "layer:topp:gone"]
+
+
+def test_clearing_the_bbox_cache_allows_an_immediate_reload():
+    service, async_dao = _service()
+    asyncio.run(service.get_bboxes_for_layers(["topp:roads"]))
+    assert async_dao.calls == ["capabilities"]
+
+    service.clear_bbox_cache()
+    asyncio.run(service.get_bboxes_for_layers(["topp:roads"]))
+
+    assert async_dao.calls == ["capabilities", "capabilities"]
+
+
+def test_layer_index_is_listed_once_per_workspace_until_cleared(monkeypatch):
+    monkeypatch.setattr(service_module, "geoserver_cache_ttl", 60)
+    service, async_dao = _service()
+
+    async def run():
+        first = await service.get_tile_urls_for_datasets_async(["roads"])
+        second = await service.get_tile_urls_for_datasets_async(["roads", "lakes"])
+        in_workspace = await service.get_tile_urls_for_datasets_async(["rivers"], workspace="hydro")
+        service.clear_layer_index_cache()
+        await service.get_tile_urls_for_datasets_async(["roads"])
+        return first, second, in_workspace
+
+    first, second, in_workspace = asyncio.run(run())
+
+    assert first["roads"] == second["roads"] == service.get_tile_layer_url("topp:roads")
+    assert second["lakes"] == ""
+    assert in_workspace == {"rivers": service.get_tile_layer_url("hydro:rivers")}
+    assert async_dao.calls == ["layers", "layers:hydro", "layers"]
+
+
+def test_suffix_index_keeps_the_first_layer_in_listing_order():
+    service, _ = _service()
+    response = httpx.Response(200, json={"layers": {"layer": [
+        {"name": "topp:roads"}, {"name": "tiger:roads"}, {"name": "a:b:rivers"},
+        "tiger:kew_with_geom", {"title": "no name"},
+    ]}})
+
+    index = service._store_layer_index(response)
+
+    assert index["roads"] == "topp:roads"
+    assert index["tiger:roads"] == "tiger:roads"
+    assert index["b:rivers"] == index["rivers"] == "a:b:rivers"
+    assert service._resolve_tile_urls(index, ["roads", "kew", "lakes"]) == {
+        "roads": service.get_tile_layer_url("topp:roads"),
+        "kew": service.get_tile_layer_url("tiger:kew_with_geom"),  # via DATASET_MAPPING
+        "lakes": "",
+    }
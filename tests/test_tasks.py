@@ -0,0 +1,32 @@
+import asyncio
+
+from utils.cache import RestCache
+from utils.tasks import TaskStore
+
+
+def test_overflow_evicts_only_finished_tasks():
+    async def run():
+        store = TaskStore(RestCache(), max_entries=3)
+        running = await store.create("Delete running")
+        await store.update(running, status="running")
+        pending = await store.create("Delete pending")
+        done = await store.create("Delete done")
+        await store.update(done, status="succeeded")
+
+        newest = await store.create("Delete newest")
+
+        assert await store.get(done) is None
+        for task_id in (running, pending, newest):
+            assert await store.get(task_id) is not None
+
+        # Nothing finished left to evict: unfinished tasks are kept over the limit
+        extra = await store.create("Delete extra")
+        for task_id in (running, pending, newest, extra):
+            assert await store.get(task_id) is not None
+
+    asyncio.run(run())
+
+
+def test_in_process_store_is_shared_by_a_single_worker_only():
+    assert TaskStore(RestCache(), workers=1).shared
+    assert not TaskStore(RestCache(), workers=4).shared
@@ -28,12 +28,13 @@ from upload_log.service.service import (
     verify_layer_features,
     persist_upload,
 )
-from geoserver.dao import GeoServerDAO
+from geoserver.api import get_geo_service
 from geoserver.service import GeoServerService
-from geoserver.admin.dao import GeoServerAdminDAO
+from geoserver.admin.api import get_geo_admin_service
 from geoserver.admin.service import GeoServerAdminService
 from upload_log.dao.dao import UploadLogDAO
-from utils.config import geoserver_host, geoserver_port, geoserver_username, geoserver_password, geoserver_data_dir
+from utils.cache import invalidate_rest_cache
+from utils.config import geoserver_data_dir
 
 router = APIRouter()
 LOGGER = logging.getLogger(__name__)
@@ -41,20 +42,6 @@ LOGGER = logging.getLogger(__name__)
 UPLOADS_DIR = Path(__file__).resolve().parents[2] / "uploads"
 GEOSERVER_WORKSPACE = "metastring"
 
-geo_dao = GeoServerDAO(
-    base_url=f"http://{geoserver_host}:{geoserver_port}/geoserver/rest",
-    username=geoserver_username,
-    password=geoserver_password,
-)
-geo_service = GeoServerService(geo_dao)
-
-geo_admin_dao = GeoServerAdminDAO(
-    base_url=f"http://{geoserver_host}:{geoserver_port}/geoserver/rest",
-    username=geoserver_username,
-    password=geoserver_password,
-)
-geo_admin_service = GeoServerAdminService(geo_admin_dao)
-
 
 @router.post("/upload", response_model=UploadLogOut, status_code=status.HTTP_200_OK, summary="Upload Shapefile and other spatial data files and log the upload  in the database and publish to GeoServer (Used for frontend api calls)", description="Upload a spatial data file (e.g., shapefile) to the system. This endpoint accepts spatial data uploads, extracts metadata automatically, stores the file, logs the upload in the database, and optionally publishes shapefiles to GeoServer.")
 async def upload_dataset(
@@ -64,6 +51,8 @@ async def upload_dataset(
     geoserver_layer: Optional[str] = Form(None),
     tags: Optional[List[str]] = Form(None),
     db: Session = Depends(get_db),
+    geo_service: GeoServerService = Depends(get_geo_service),
+    geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service),
 ) -> UploadLogOut:
     """Accept spatial data uploads, extract metadata, and log the upload."""
     stored_path = await persist_upload(file, UPLOADS_DIR)
@@ -120,11 +109,17 @@ async def upload_dataset(
     )
 
     created_log = UploadLogService.create(upload_log, db)
-    await _publish_to_geoserver(created_log, db)
+    await _publish_to_geoserver(created_log, db, geo_service, geo_admin_service)
+    await invalidate_rest_cache("datastores", "layers")
     return created_log
 
 
-async def _publish_to_geoserver(upload_log: UploadLogOut, db: Session) -> None:
+async def _publish_to_geoserver(
+    upload_log: UploadLogOut,
+    db: Session,
+    geo_service: GeoServerService,
+    geo_admin_service: GeoServerAdminService,
+) -> None:
     
     LOGGER.debug("_publish_to_geoserver called for file_format: %s", upload_log.file_format)
     
@@ -174,7 +169,7 @@ async def _publish_to_geoserver(upload_log: UploadLogOut, db: Session) -> None:
     # Upload shapefile to GeoServer
     file_path_str = str(file_path.resolve())
     try:
-        response = geo_dao.upload_shapefile(
+        response = geo_service.dao.upload_shapefile(
             workspace=GEOSERVER_WORKSPACE,
             store_name=store_name,
             file_path=file_path_str,
@@ -576,7 +571,7 @@ async def _publish_to_geoserver(upload_log: UploadLogOut, db: Session) -> None:
     import asyncio
     await asyncio.sleep(2)
     
-    verification_passed, feature_count = verify_layer_features(geoserver_layer_name)
+    verification_passed, feature_count = verify_layer_features(geo_service.dao, geoserver_layer_name)
     if verification_passed:
         LOGGER.info("✓ Layer verification passed: '%s' has %s features", geoserver_layer_name, feature_count or 0)
     elif feature_count == 0:
@@ -669,6 +664,8 @@ async def create_table_and_insert1(
     tags: Optional[List[str]] = Form(None),
     workspace: str = Form(default="metastring"),
     db: Session = Depends(get_db),
+    geo_service: GeoServerService = Depends(get_geo_service),
+    geo_admin_service: GeoServerAdminService = Depends(get_geo_admin_service),
 ):
     if not file.filename or not (file.filename.endswith(".xlsx") or file.filename.endswith(".csv")):
         raise HTTPException(status_code=400, detail="Only XLSX and CSV files are allowed")
@@ -729,11 +726,13 @@ async def create_table_and_insert1(
                 file=upload_file,
                 db=db,
                 geo_service=geo_service,
+                geo_admin_service=geo_admin_service,
                 workspace=workspace,
                 store_name=store_name,
                 dataset_id=dataset_id,  # Use the generated dataset_id
                 upload_log_id=created_log.id if created_log else None
             )
+            await invalidate_rest_cache("datastores", "layers")
             
             # Update geoserver_layer after successful upload (only if logging was enabled)
             if created_log and created_log.id:
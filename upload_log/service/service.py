@@ -24,24 +24,14 @@ from upload_log.service.metadata import derive_file_metadata
 from geoserver.model import PostGISRequest, CreateLayerRequest
 from geoserver.service import GeoServerService
 from geoserver.admin.service import GeoServerAdminService
-from geoserver.admin.dao import GeoServerAdminDAO
 from geoserver.dao import GeoServerDAO
 from utils.config import (
     host, port, username, password, database,
-    geoserver_host, geoserver_port, geoserver_username, geoserver_password,
     sudo_password, geoserver_data_dir
 )
 
 logger = logging.getLogger(__name__)
 
-# Initialize GeoServer services for helper functions
-_geo_dao = GeoServerDAO(
-    base_url=f"http://{geoserver_host}:{geoserver_port}/geoserver/rest",
-    username=geoserver_username,
-    password=geoserver_password,
-)
-
-
 def run_sudo_command(command: list, timeout: int = 10) -> subprocess.CompletedProcess:
     """Run a sudo command with password authentication."""
     if command[0] == 'sudo':
@@ -332,10 +322,10 @@ def fix_subdirectory_files(datastore_path: str, expected_feature_type_name: str)
     return False
 
 
-def verify_layer_features(geoserver_layer_name: str) -> Tuple[bool, Optional[int]]:
+def verify_layer_features(geo_dao: GeoServerDAO, geoserver_layer_name: str) -> Tuple[bool, Optional[int]]:
     """Verify layer exists and has features. Returns (success, feature_count)."""
     try:
-        wfs_response = _geo_dao.query_features(layer=geoserver_layer_name, max_features=1)
+        wfs_response = geo_dao.query_features(layer=geoserver_layer_name, max_features=1)
         if wfs_response.status_code != 200:
             return False, None
         
@@ -507,6 +497,7 @@ class UploadLogService:
         file,  # Can be UploadFile or file-like object
         db: Session,
         geo_service: Optional[GeoServerService] = None,
+        geo_admin_service: Optional[GeoServerAdminService] = None,
         workspace: str = "metastring",
         store_name: Optional[str] = None,
         dataset_id: Optional[UUID] = None,
@@ -697,9 +688,9 @@ class UploadLogService:
                 logger.info(f"Updated {rows_updated} rows with geometry data")
                 geometry_mapping_message = f"Geometry column populated from world_geojson using state column ({rows_updated} rows updated)."
 
-            # Step 5: Upload to GeoServer if geo_service is provided
+            # Step 5: Upload to GeoServer if the GeoServer services are provided
             geoserver_message = ""
-            if geo_service:
+            if geo_service and geo_admin_service:
                 try:
                     # Use provided store_name or default to table_name
                     final_store_name = store_name or f"{table_name}_store"
@@ -730,16 +721,8 @@ class UploadLogService:
                             layer_name=table_name
                         )
                         
-                        # Initialize admin service for layer creation
-                        admin_dao = GeoServerAdminDAO(
-                            base_url=f"http://{geoserver_host}:{geoserver_port}/geoserver/rest",
-                            username=geoserver_username,
-                            password=geoserver_password
-                        )
-                        admin_service = GeoServerAdminService(admin_dao)
-                        
                         logger.info(f"Creating layer '{table_name}' from table '{table_name}' in store '{final_store_name}'")
-                        layer_response = await admin_service.create_layer_from_table(layer_request)
+                        layer_response = await geo_admin_service.create_layer_from_table(layer_request)
                         
                         logger.info(f"Layer creation response status: {layer_response.status_code}, response: {layer_response.text[:500] if layer_response.text else 'No response text'}")
                         
@@ -749,7 +732,7 @@ class UploadLogService:
                             await asyncio.sleep(1)  # Give GeoServer a moment to process
                             
                             try:
-                                verify_response = admin_dao.get_table_details(
+                                verify_response = geo_admin_service.dao.get_table_details(
                                     workspace=workspace,
                                     datastore=final_store_name,
                                     table_name=table_name
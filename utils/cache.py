@@ -0,0 +1,241 @@
+import asyncio
+import contextlib
+import functools
+import hashlib
+import json
+import logging
+import time
+import uuid
+import orjson
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from utils.config import redis_url, geoserver_cache_ttl
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "gs"
+KEY_VERSION = "v1"
+INVALIDATION_CHANNEL = f"{KEY_PREFIX}:invalidations"
+
+
+class RestCache:
+    """
+    Short-lived cache for GeoServer REST read responses.
+
+    Values are stored as already-serialized JSON bytes so a hit is returned
+    without decoding or re-encoding. Redis is used when REDIS_URL is set (and
+    the redis package is installed); otherwise entries live in process memory.
+    Cache failures are logged and treated as misses.
+
+    Invalidation listeners drop caches that live in each worker (layer index,
+    bboxes, columns, ...). With Redis, invalidations are also published on
+    INVALIDATION_CHANNEL so the other workers run their listeners too (see
+    listen_for_invalidations). Without Redis those caches are per-worker and
+    only bounded by their TTLs.
+    """
+
+    def __init__(self, url: Optional[str] = None, max_entries: int = 1024):
+        self.url = url
+        self.max_entries = max_entries
+        self._redis = None
+        self._memory: Dict[str, Tuple[float, bytes]] = {}
+        self._listeners: Dict[str, List[Callable[[], None]]] = {}
+        # Tags our own invalidation messages, which the listeners already ran for
+        self._origin = uuid.uuid4().hex
+
+    @property
+    def redis(self):
+        if self._redis is None and self.url:
+            try:
+                from redis import asyncio as redis_asyncio
+            except ImportError:
+                logger.warning("REDIS_URL is set but the redis package is not installed; using in-process cache")
+                self.url = None
+                return None
+            self._redis = redis_asyncio.from_url(self.url)
+        return self._redis
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if self.redis is not None:
+            try:
+                return await self.redis.get(key)
+            except Exception as e:
+                logger.warning(f"Cache get failed for {key}: {e}")
+                return None
+
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._memory.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        if self.redis is not None:
+            try:
+                await self.redis.set(key, value, ex=ttl)
+            except Exception as e:
+                logger.warning(f"Cache set failed for {key}: {e}")
+            return
+
+        if len(self._memory) >= self.max_entries:
+            now = time.monotonic()
+            self._memory = {k: v for k, v in self._memory.items() if v[0] >= now}
+            if len(self._memory) >= self.max_entries:
+                self._memory.clear()
+        self._memory[key] = (time.monotonic() + ttl, value)
+
+    def add_invalidation_listener(self, group: str, callback: Callable[[], None]):
+        """
+        Call `callback` whenever the given group is invalidated.
+        """
+        self._listeners.setdefault(group, []).append(callback)
+
+    async def invalidate(self, *groups: str):
+        """
+        Drop every cached entry belonging to the given groups.
+        """
+        self._notify_listeners(groups)
+
+        patterns = [f"{KEY_PREFIX}:{group}:" for group in groups]
+        if self.redis is not None:
+            try:
+                for pattern in patterns:
+                    keys = [key async for key in self.redis.scan_iter(match=f"{pattern}*")]
+                    if keys:
+                        await self.redis.delete(*keys)
+            except Exception as e:
+                logger.warning(f"Cache invalidation failed for {groups}: {e}")
+            # After the shared entries are gone, so other workers reload fresh data
+            try:
+                message = orjson.dumps({"origin": self._origin, "groups": list(groups)})
+                await self.redis.publish(INVALIDATION_CHANNEL, message)
+            except Exception as e:
+                logger.warning(f"Publishing cache invalidation failed for {groups}: {e}")
+            return
+
+        for key in [k for k in self._memory if k.startswith(tuple(patterns))]:
+            self._memory.pop(key, None)
+
+    def _notify_listeners(self, groups):
+        for group in groups:
+            for callback in self._listeners.get(group, []):
+                callback()
+
+    async def listen_for_invalidations(self, retry_delay: float = 5.0):
+        """
+        Run the invalidation listeners for groups invalidated by other workers.
+        Meant to run as a background task for the lifetime of the app; returns
+        at once when Redis is not configured.
+        """
+        while self.redis is not None:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    payload = orjson.loads(message["data"])
+                    if payload.get("origin") != self._origin:
+                        self._notify_listeners(payload.get("groups") or [])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscription failed: {e}")
+            finally:
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+            await asyncio.sleep(retry_delay)
+
+    async def aclose(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+geoserver_cache = RestCache(redis_url)
+
+
+def _default_key(kwargs: Dict[str, Any]) -> str:
+    # Only plain request parameters take part in the key (skips db sessions etc.)
+    params = {
+        k: v for k, v in kwargs.items()
+        if v is None or isinstance(v, (str, int, float, bool, list, tuple))
+    }
+    raw = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _dumps(result: Any) -> bytes:
+    # Plain dicts/lists (the layer listings) go straight to orjson; only results it
+    # can't serialize (pydantic models, non-str keys, ...) take the jsonable_encoder walk
+    try:
+        return orjson.dumps(result)
+    except TypeError:
+        return orjson.dumps(jsonable_encoder(result))
+
+
+# Cache keys currently being computed -> future resolving to the shared
+# (body, status_code, media_type), or None when the computation failed
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def rest_cache(group: str, ttl: Optional[int] = None, key_fn: Optional[Callable[..., str]] = None):
+    """
+    Cache the JSON result of an async GeoServer read handler.
+
+    Keys look like ``gs:<group>:v1:<handler>:<args>``; mutating handlers call
+    ``invalidate_rest_cache(<group>, ...)`` to drop a whole group at once.
+    Concurrent misses on the same key are coalesced: one call does the work and
+    the others get a copy of its response.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            suffix = key_fn(**kwargs) if key_fn else _default_key(kwargs)
+            key = f"{KEY_PREFIX}:{group}:{KEY_VERSION}:{func.__name__}:{suffix}"
+
+            cached = await geoserver_cache.get(key)
+            if cached is not None:
+                return Response(content=cached, media_type="application/json")
+
+            pending = _inflight.get(key)
+            if pending is not None:
+                shared = await asyncio.shield(pending)
+                if shared is not None:
+                    content, status_code, media_type = shared
+                    return Response(content=content, status_code=status_code, media_type=media_type)
+                # The call we waited for failed; run our own below
+
+            future = None
+            if key not in _inflight:
+                future = asyncio.get_running_loop().create_future()
+                _inflight[key] = future
+            shared = None
+            try:
+                result = await func(*args, **kwargs)
+                if isinstance(result, Response):
+                    # Pass-through GeoServer body; cache it as-is
+                    if result.status_code == 200:
+                        await geoserver_cache.set(key, result.body, ttl or geoserver_cache_ttl)
+                    shared = (result.body, result.status_code, result.media_type)
+                    return result
+                body = _dumps(result)
+                await geoserver_cache.set(key, body, ttl or geoserver_cache_ttl)
+                shared = (body, 200, "application/json")
+                return Response(content=body, media_type="application/json")
+            finally:
+                if future is not None:
+                    _inflight.pop(key, None)
+                    future.set_result(shared)
+
+        return wrapper
+
+    return decorator
+
+
+async def invalidate_rest_cache(*groups: str):
+    await geoserver_cache.invalidate(*groups)
@@ -13,6 +13,7 @@ password = os.getenv("DB_PASSWORD", "2002")
 database = os.getenv("DB_NAME", "CML_test")
 db_schema = os.getenv("DB_SCHEMA", "cml1")
 database_url = f"postgresql://{username}:{password}@{host}:{port}/{database}"
+async_database_url = f"postgresql+asyncpg://{username}:{password}@{host}:{port}/{database}"
 
 
 ############## GeoServer Configuration ###############
@@ -22,6 +23,26 @@ geoserver_port = os.getenv("GEOSERVER_PORT", "8080")
 geoserver_username = os.getenv("GEOSERVER_USERNAME", "admin")
 geoserver_password = os.getenv("GEOSERVER_PASSWORD", "geoserver")
 geoserver_data_dir = os.getenv("GEOSERVER_DATA_DIR", "/usr/share/geoserver/geoserver-2.26.1/data_dir/data")
+# Most requests the async GeoServer client sends at once; GeoServer's throughput
+# peaks at around twice its core count and only latency grows beyond that
+geoserver_max_inflight = int(os.getenv("GEOSERVER_MAX_INFLIGHT", str(2 * (os.cpu_count() or 1))))
+
+############## Cache Configuration ###############
+# Redis is optional; without REDIS_URL GeoServer reads are cached in-process
+redis_url = os.getenv("REDIS_URL")
+# Worker processes serving the app (uvicorn and gunicorn read the same variable);
+# background task state is only visible across workers through Redis
+web_concurrency = int(os.getenv("WEB_CONCURRENCY", "1"))
+geoserver_cache_ttl = int(os.getenv("GEOSERVER_CACHE_TTL", "30"))
+# Catalog reads behind the admin API (workspaces, datastores, styles, ...) change
+# rarely and are invalidated by the API's own mutations, so they live longer
+geoserver_catalog_cache_ttl = int(os.getenv("GEOSERVER_CATALOG_CACHE_TTL", "120"))
+# How often the /layers snapshot is rebuilt in the background (seconds)
+layers_snapshot_interval = int(os.getenv("LAYERS_SNAPSHOT_INTERVAL", "15"))
+# How often layer bounding boxes are reloaded from WMS GetCapabilities (seconds)
+bbox_refresh_interval = int(os.getenv("BBOX_REFRESH_INTERVAL", "300"))
+# Responses smaller than this (bytes) are sent uncompressed
+gzip_minimum_size = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
 
 ############## Sudo Configuration ###############
 sudo_password = os.getenv("SUDO_PASSWORD", "meta")
@@ -0,0 +1,78 @@
+import logging
+from typing import Optional
+import orjson
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidRequestError(ValueError):
+    """
+    A request value rejected by the service or DAO layer; answered with a 400
+    by invalid_request_handler.
+    """
+
+
+class UpstreamError(RuntimeError):
+    """
+    GeoServer failed or answered with something unusable; answered with a 502
+    by upstream_error_handler, or a 404 when GeoServer reported it missing.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+async def invalid_request_handler(request: Request, exc: InvalidRequestError):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+async def upstream_error_handler(request: Request, exc: UpstreamError):
+    status_code = 404 if exc.status_code == 404 else 502
+    return JSONResponse(status_code=status_code, content={"detail": str(exc)})
+
+
+async def upstream_json_error_handler(request: Request, exc: orjson.JSONDecodeError):
+    # Only GeoServer response bodies are decoded with orjson on a request path
+    # (utils.http.decode_json); client JSON is parsed by FastAPI itself
+    return JSONResponse(status_code=502, content={"detail": f"Invalid JSON from GeoServer: {exc}"})
+
+
+class UnhandledErrorMiddleware:
+    """
+    Turn exceptions that escape a route into a JSON 500.
+
+    Starlette hands ``Exception`` handlers to ServerErrorMiddleware, which sits
+    outside every user middleware, so their responses never get CORS headers
+    and browsers only report a CORS failure. Added inside CORSMiddleware, this
+    middleware answers from within the stack instead. If the response has
+    already started the error is re-raised, as there is nothing left to send.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            if response_started:
+                raise
+            logger.error(f"Unhandled error in {scope['method']} {scope['path']}: {exc}", exc_info=exc)
+            response = JSONResponse(status_code=500, content={"detail": str(exc)})
+            await response(scope, receive, send)
@@ -0,0 +1,81 @@
+import hashlib
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class ETagMiddleware:
+    """
+    Conditional GET support for JSON responses.
+
+    Successful JSON GET responses get a weak ETag (hash of the body) and
+    Cache-Control: no-cache, so clients may keep them but must revalidate each
+    time; a read right after a write never sees stale data. When the client's
+    If-None-Match already holds that ETag the body is dropped and a 304 is sent
+    instead. Other responses, and streamed ones (no Content-Length), are passed
+    through without buffering.
+    """
+
+    def __init__(self, app: ASGIApp, cache_control: str = "no-cache"):
+        self.app = app
+        self.cache_control = cache_control
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start_message: Message = {}
+        body_parts = []
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    message["status"] != 200
+                    or not content_type.startswith("application/json")
+                    or "content-length" not in headers
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(body_parts)
+            etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["ETag"] = etag
+            headers["Cache-Control"] = self.cache_control
+
+            if if_none_match and _etag_matches(if_none_match, etag):
+                # Keep the other headers (CORS etc.) but drop the entity ones
+                del headers["content-length"]
+                del headers["content-type"]
+                await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: ignore the W/ prefix on either side
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
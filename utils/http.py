@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Optional, Tuple, Union
+import httpx
+import orjson
+from requests.adapters import HTTPAdapter
+from requests import exceptions
+
+logger = logging.getLogger(__name__)
+
+Timeout = Union[float, Tuple[float, float]]
+
+# (connect, read) seconds for GeoServer REST calls made with `requests`
+DEFAULT_TIMEOUT: Timeout = (5, 60)
+# Uploads and SQL views make GeoServer do real work before it answers
+SLOW_TIMEOUT: Timeout = (5, 120)
+# The same read allowance for the httpx clients, passed per request
+ASYNC_SLOW_TIMEOUT = httpx.Timeout(10, read=SLOW_TIMEOUT[1])
+
+
+def decode_json(response) -> Any:
+    """
+    Parse a GeoServer JSON response body (requests or httpx) with orjson,
+    which is several times faster than the stdlib decoder behind .json() on
+    large catalog listings and WFS feature collections. Empty bodies decode
+    to None. Invalid JSON raises orjson.JSONDecodeError, answered with a 502
+    by utils.errors.upstream_json_error_handler.
+    """
+    content = response.content
+    return orjson.loads(content) if content else None
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that applies a default timeout to every request sent through it.
+
+    `requests` has no session-wide timeout and waits forever by default, so a
+    stuck GeoServer call would hold its worker thread indefinitely. Calls that
+    pass their own ``timeout=`` keep it.
+    """
+
+    def __init__(self, *args, timeout: Optional[Timeout] = DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.timeout
+        return super().send(request, timeout=timeout, **kwargs)
+
+
+class CircuitBreakerHTTPAdapter(TimeoutHTTPAdapter):
+    """
+    TimeoutHTTPAdapter that stops calling a server which keeps failing.
+
+    After `failure_threshold` consecutive failures (connection errors, timeouts
+    or 502/503/504 responses left over once urllib3's retries are used up)
+    requests fail immediately with ConnectionError for `cooldown` seconds,
+    instead of piling more load (and more timeouts) onto an overloaded
+    GeoServer. Other 5xx responses, such as a 500 for a bad SLD, are caused by
+    the request and don't count. Once the cooldown has passed a single trial
+    request is let through while the others keep failing fast; if it succeeds
+    the circuit closes, otherwise it stays open for another cooldown.
+    """
+
+    FAILURE_STATUSES = frozenset({502, 503, 504})
+
+    def __init__(self, *args, failure_threshold: int = 5, cooldown: float = 10, **kwargs):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        # 0 while closed; otherwise when the open circuit may be tried again
+        self._open_until = 0.0
+        self._half_open_in_flight = False
+        self._lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, *args, **kwargs):
+        trial = self._admit(request)
+        failed = False
+        try:
+            response = super().send(request, *args, **kwargs)
+            failed = response.status_code in self.FAILURE_STATUSES
+            return response
+        except (exceptions.ConnectionError, exceptions.Timeout):
+            failed = True
+            raise
+        finally:
+            self._record(failed, trial)
+
+    def _admit(self, request) -> bool:
+        """
+        Raise while the circuit is open; return True for the half-open trial.
+        """
+        with self._lock:
+            if not self._open_until:
+                return False
+            if time.monotonic() >= self._open_until and not self._half_open_in_flight:
+                self._half_open_in_flight = True
+                return True
+        raise exceptions.ConnectionError(
+            f"Skipping {request.method} {request.url}: server unavailable, retrying after cooldown",
+            request=request,
+        )
+
+    def _record(self, failed: bool, trial: bool):
+        with self._lock:
+            if trial:
+                self._half_open_in_flight = False
+            if not failed:
+                self._failures = 0
+                self._open_until = 0.0
+                return
+            self._failures += 1
+            if trial or self._failures >= self.failure_threshold:
+                self._open_until = time.monotonic() + self.cooldown
+                self._failures = 0
+                logger.warning(
+                    f"GeoServer unavailable; pausing requests for {self.cooldown}s"
+                )
+
+
+class BoundedAsyncTransport(httpx.AsyncHTTPTransport):
+    """
+    httpx transport that lets at most `max_inflight` requests wait on the
+    server at once; further requests queue here without a deadline.
+
+    The connection pool limit alone would also cap concurrency, but requests
+    waiting for a pooled connection fail with PoolTimeout once the client
+    timeout passes, so bursts would turn into errors instead of queueing.
+    """
+
+    def __init__(self, max_inflight: int, **kwargs):
+        self._inflight = asyncio.Semaphore(max_inflight)
+        super().__init__(**kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async with self._inflight:
+            return await super().handle_async_request(request)
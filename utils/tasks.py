@@ -0,0 +1,94 @@
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+import orjson
+from utils.cache import RestCache
+from utils.config import redis_url, web_concurrency
+
+TASK_TTL = 3600  # Keep finished task state around for an hour
+FINISHED_STATUSES = frozenset({"succeeded", "failed"})
+
+
+class TaskStore:
+    """
+    State of fire-and-forget background tasks, keyed by task id.
+
+    Stored in Redis when configured (through the REST cache backend, under its
+    own key prefix) so every worker sees the same state. Otherwise it lives in
+    process memory and only the worker that created a task can report on it,
+    so `shared` is False when several workers run without Redis.
+    """
+
+    def __init__(self, backend: RestCache, ttl: int = TASK_TTL, workers: int = web_concurrency, max_entries: int = 1024):
+        self.backend = backend
+        self.ttl = ttl
+        self.workers = workers
+        self.max_entries = max_entries
+        self._memory: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+    @property
+    def shared(self) -> bool:
+        """
+        Whether a task started by this worker can be polled through any worker.
+        """
+        return self.backend.redis is not None or self.workers <= 1
+
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"task:{task_id}"
+
+    async def create(self, description: str) -> str:
+        task_id = uuid.uuid4().hex
+        await self._save({"task_id": task_id, "description": description, "status": "pending"})
+        return task_id
+
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        if self.backend.redis is not None:
+            raw = await self.backend.get(self._key(task_id))
+            return orjson.loads(raw) if raw else None
+
+        entry = self._memory.get(task_id)
+        if entry is None:
+            return None
+        expires_at, state = entry
+        if expires_at < time.monotonic():
+            self._memory.pop(task_id, None)
+            return None
+        return dict(state)
+
+    async def update(self, task_id: str, **fields):
+        state = await self.get(task_id) or {"task_id": task_id}
+        state.update(fields)
+        await self._save(state)
+
+    async def _save(self, state: Dict[str, Any]):
+        task_id = state["task_id"]
+        if self.backend.redis is not None:
+            await self.backend.set(self._key(task_id), orjson.dumps(state), self.ttl)
+            return
+
+        if task_id not in self._memory and len(self._memory) >= self.max_entries:
+            self._evict()
+        self._memory[task_id] = (time.monotonic() + self.ttl, state)
+
+    def _evict(self):
+        """
+        Make room for one more task: drop expired entries, then the oldest
+        finished ones. Pending and running tasks are never evicted.
+        """
+        now = time.monotonic()
+        self._memory = {k: v for k, v in self._memory.items() if v[0] >= now}
+        excess = len(self._memory) - self.max_entries + 1
+        if excess > 0:
+            finished = [
+                task_id for task_id, (_, state) in self._memory.items()
+                if state.get("status") in FINISHED_STATUSES
+            ]
+            for task_id in finished[:excess]:
+                del self._memory[task_id]
+
+    async def aclose(self):
+        await self.backend.aclose()
+
+
+task_store = TaskStore(RestCache(redis_url))
@@ -0,0 +1,5 @@
+import re
+
+# Letters, digits, underscores and hyphens (workspace/store/table names). Check
+# with fullmatch(): with match() and "$", a trailing newline would also pass
+IDENTIFIER_RE = re.compile(r"[a-zA-Z0-9_-]+")